@@ -19,17 +19,27 @@ from typing import (
     AsyncIterable,
     Awaitable,
     Callable,
+    Dict,
     Iterable,
+    List,
+    Literal,
+    Mapping,
     Optional,
+    Sequence,
     Tuple,
     TypeVar,
     Union,
+    cast,
     overload,
 )
 
 from expression import Option, curry_flipped, pipe
 from expression.system.disposable import AsyncDisposable
 
+from .aggregation import Aggregator
+from .backpressure import BackpressureMetrics, BufferOverflowError
+from .columnar import ColumnBatch
+from .multicast import AsyncConnectableObservable
 from .observables import AsyncAnonymousObservable, AsyncIterableObservable
 from .observers import (
     AsyncAnonymousObserver,
@@ -37,7 +47,14 @@ from .observers import (
     AsyncIteratorObserver,
     AsyncNotificationObserver,
 )
-from .subject import AsyncSingleSubject, AsyncSubject
+from .sketch import KLL, BloomFilter, CountMinSketch, HyperLogLog
+from .subject import (
+    AsyncBehaviorSubject,
+    AsyncReplaySubject,
+    AsyncSingleSubject,
+    AsyncSubject,
+    AsyncTopicSubject,
+)
 from .subscription import run
 from .types import AsyncObservable, AsyncObserver, CloseAsync, SendAsync, ThrowAsync
 
@@ -169,6 +186,38 @@ class AsyncRx(AsyncObservable[_TSource]):
     def as_async_observable(self) -> AsyncObservable[_TSource]:
         return AsyncAnonymousObservable(self.subscribe_async)
 
+    def audit(self, seconds: float) -> AsyncRx[_TSource]:
+        """Audit observable stream.
+
+        Emits the latest value from the source when an audit period
+        started by a source value ends.
+
+        Args:
+            seconds (float): Duration of the audit period.
+
+        Returns:
+            The audited stream.
+        """
+        from .timeshift import audit
+
+        return AsyncRx(pipe(self, audit(seconds)))
+
+    def cache(
+        self, buffer_size: Optional[int] = None, window: Optional[float] = None
+    ) -> AsyncRx[_TSource]:
+        """Subscribe to the source once and replay it to all observers.
+
+        Args:
+            buffer_size: Maximum number of values to replay.
+            window: Maximum age in seconds of the values to replay.
+
+        Returns:
+            The cached stream.
+        """
+        from .multicast import cache
+
+        return AsyncRx(pipe(self, cache(buffer_size, window)))
+
     def choose(
         self, chooser: Callable[[_TSource], Option[_TSource]]
     ) -> AsyncObservable[_TSource]:
@@ -221,6 +270,28 @@ class AsyncRx(AsyncObservable[_TSource]):
 
         return AsyncRx(concat_seq([self, other]))
 
+    def conflate(
+        self,
+        key_selector: Callable[[_TSource], Any],
+        metrics: Optional[BackpressureMetrics] = None,
+    ) -> AsyncRx[_TSource]:
+        """Conflate values by key.
+
+        While the observer is busy, newer values overwrite older pending
+        values with the same key.
+
+        Args:
+            key_selector: A function that returns the key of a value.
+            metrics: Optional metrics where overwritten values are
+                counted as dropped.
+
+        Returns:
+            The conflated stream.
+        """
+        from .backpressure import conflate
+
+        return AsyncRx(pipe(self, conflate(key_selector, metrics)))
+
     def debounce(self, seconds: float) -> AsyncRx[_TSource]:
         """Debounce observable stream.
 
@@ -243,10 +314,14 @@ class AsyncRx(AsyncObservable[_TSource]):
 
         return AsyncRx(pipe(self, delay(seconds)))
 
-    def distinct_until_changed(self) -> AsyncObservable[_TSource]:
+    def distinct_until_changed(
+        self,
+        key_selector: Optional[Callable[[_TSource], Any]] = None,
+        comparer: Optional[Callable[[Any, Any], bool]] = None,
+    ) -> AsyncRx[_TSource]:
         from .filtering import distinct_until_changed
 
-        return AsyncRx(distinct_until_changed(self))
+        return AsyncRx(pipe(self, distinct_until_changed(key_selector, comparer)))
 
     def filter(self, predicate: Callable[[_TSource], bool]) -> AsyncRx[_TSource]:
         """Filter stream.
@@ -341,6 +416,60 @@ class AsyncRx(AsyncObservable[_TSource]):
             AsyncRx.create,
         )
 
+    def on_backpressure_buffer(
+        self, size: int, metrics: Optional[BackpressureMetrics] = None
+    ) -> AsyncRx[_TSource]:
+        """Buffer up to `size` values while the observer is busy and
+        fail with `BufferOverflowError` if the buffer overflows."""
+        from .backpressure import on_backpressure_buffer
+
+        return AsyncRx(pipe(self, on_backpressure_buffer(size, metrics)))
+
+    def on_backpressure_drop(
+        self, size: int = 1, metrics: Optional[BackpressureMetrics] = None
+    ) -> AsyncRx[_TSource]:
+        """Keep up to `size` values pending while the observer is busy
+        and drop any values arriving when the buffer is full."""
+        from .backpressure import on_backpressure_drop
+
+        return AsyncRx(pipe(self, on_backpressure_drop(size, metrics)))
+
+    def on_backpressure_latest(
+        self, metrics: Optional[BackpressureMetrics] = None
+    ) -> AsyncRx[_TSource]:
+        """Keep only the latest value pending while the observer is
+        busy."""
+        from .backpressure import on_backpressure_latest
+
+        return AsyncRx(pipe(self, on_backpressure_latest(metrics)))
+
+    def sample(self, seconds: float) -> AsyncRx[_TSource]:
+        """Sample observable stream.
+
+        Emits the most recent value from the source at the end of each
+        sampling period. Periods without new values are skipped.
+
+        Args:
+            seconds (float): Length of the sampling period.
+
+        Returns:
+            The sampled stream.
+        """
+        from .timeshift import sample
+
+        return AsyncRx(pipe(self, sample(seconds)))
+
+    def share(self) -> AsyncRx[_TSource]:
+        """Share a single subscription to the source between all
+        observers.
+
+        Returns:
+            The shared stream.
+        """
+        from .multicast import share
+
+        return AsyncRx(pipe(self, share()))
+
     def skip(self, count: int) -> AsyncObservable[_TSource]:
         """Skip items from start of the stream.
 
@@ -453,6 +582,38 @@ class AsyncRx(AsyncObservable[_TSource]):
 
         return AsyncRx(pipe(self, take_until(other)))
 
+    def throttle_first(self, seconds: float) -> AsyncRx[_TSource]:
+        """Throttle first.
+
+        Emits a value from the source and then ignores values for the
+        given duration.
+
+        Args:
+            seconds (float): Duration of the throttle period.
+
+        Returns:
+            The throttled stream.
+        """
+        from .timeshift import throttle_first
+
+        return AsyncRx(pipe(self, throttle_first(seconds)))
+
+    def throttle_latest(self, seconds: float) -> AsyncRx[_TSource]:
+        """Throttle latest.
+
+        Emits a value from the source immediately and then the latest
+        value at the end of each throttle period.
+
+        Args:
+            seconds (float): Duration of the throttle period.
+
+        Returns:
+            The throttled stream.
+        """
+        from .timeshift import throttle_latest
+
+        return AsyncRx(pipe(self, throttle_latest(seconds)))
+
     def to_async_iterable(self) -> AsyncIterable[_TSource]:
         from .leave import to_async_iterable
 
@@ -474,6 +635,31 @@ def as_chained(source: AsyncObservable[_TSource]) -> AsyncRx[_TSource]:
     return AsyncRx(source)
 
 
+def audit(
+    seconds: float,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Audit source stream.
+
+    When the source produces a value and no audit period is running, a
+    new period is started. The latest value is emitted when the period
+    ends.
+
+    Example:
+        >>> ys = pipe(xs, audit(0.5))
+
+    Args:
+        seconds: Duration of the audit period.
+
+    Returns:
+        A partially applied audit function that takes the source
+        observable to audit.
+    """
+
+    from .timeshift import audit
+
+    return audit(seconds)
+
+
 def choose(
     chooser: Callable[[_TSource], Option[_TResult]]
 ) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TResult]]:
@@ -527,6 +713,88 @@ def combine_latest(
     return pipe(source, combine_latest(other))
 
 
+def combine_latest_seq(
+    sources: Iterable[AsyncObservable[Any]],
+) -> AsyncObservable[Tuple[Any, ...]]:
+    """Combine latest values of many sources.
+
+    Returns an observable sequence of tuples holding the latest value
+    of each source. Values are emitted once every source has produced
+    a value, and then for every value produced by any source.
+
+    Example:
+        >>> ys = combine_latest_seq([temperature, humidity, pressure])
+
+    Args:
+        sources: The observables to combine.
+
+    Returns:
+        The combined observable.
+    """
+    from .combine import combine_latest_seq
+
+    return combine_latest_seq(sources)
+
+
+def conflate(
+    key_selector: Callable[[_TSource], Any],
+    metrics: Optional[BackpressureMetrics] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Conflate values by key.
+
+    Detaches the source from the observer. While the observer is busy,
+    newer values overwrite older pending values with the same key, so
+    the observer only receives the latest value of each key.
+
+    Example:
+        >>> ys = pipe(quotes, conflate(lambda quote: quote.symbol))
+
+    Args:
+        key_selector: A function that returns the key of a value.
+        metrics: Optional metrics where overwritten values are counted
+            as dropped.
+
+    Returns:
+        A partially applied conflate function that takes the source
+        observable to conflate.
+    """
+
+    from .backpressure import conflate
+
+    return conflate(key_selector, metrics)
+
+
+def count_distinct_approx(
+    precision: int = 14,
+    emit_every: Optional[float] = None,
+    key_selector: Optional[Callable[[_TSource], Any]] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[float]]:
+    """Count distinct values approximately.
+
+    Counts the distinct values, or keys, of the source with a
+    `HyperLogLog` sketch in a fixed amount of memory. The estimate is
+    emitted every `emit_every` seconds if given, and when the source
+    completes. NumPy arrays are added as batches of values.
+
+    Example:
+        >>> ys = pipe(visitor_ids, rx.count_distinct_approx(emit_every=60.0))
+
+    Args:
+        precision: Number of index bits of the sketch. The relative
+            error is about 1.04 / sqrt(2^precision).
+        emit_every: Optional interval in seconds between estimates.
+        key_selector: Optional function that returns the key to count
+            for each value.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of estimates.
+    """
+    from .sketch import count_distinct_approx
+
+    return count_distinct_approx(precision, emit_every, key_selector)
+
+
 def debounce(
     seconds: float,
 ) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
@@ -551,6 +819,33 @@ def debounce(
     return debounce(seconds)
 
 
+def cache(
+    buffer_size: Optional[int] = None, window: Optional[float] = None
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Cache the source.
+
+    Subscribes to the source when the first observer subscribes, and
+    replays the values to all observers from memory, so the source runs
+    only once.
+
+    Example:
+        >>> ys = pipe(rx.of_async(query()), cache())
+
+    Args:
+        buffer_size: Maximum number of values to replay. Defaults to
+            all values.
+        window: Maximum age in seconds of the values to replay.
+            Defaults to no limit.
+
+    Returns:
+        A partially applied cache function that takes the source
+        observable to cache.
+    """
+    from .multicast import cache
+
+    return cache(buffer_size, window)
+
+
 def catch(
     handler: Callable[[Exception], AsyncObservable[_TSource]]
 ) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
@@ -601,12 +896,89 @@ def delay(
     return delay(seconds)
 
 
+def distinct(
+    key_selector: Optional[Callable[[_TSource], Any]] = None,
+    max_keys: Optional[int] = None,
+    ttl: Optional[float] = None,
+    bloom: bool = False,
+    error_rate: float = 0.001,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Distinct.
+
+    Drops the elements whose key has been seen before. The keys seen
+    are remembered in memory bounded by `max_keys`, forgetting the
+    least recently seen keys first, and by `ttl` seconds after a key
+    was first seen. With `bloom`, keys are remembered in two rotating
+    Bloom filters of `max_keys` keys each, at the cost of wrongly
+    dropping unseen keys with probability about `error_rate`.
+
+    Example:
+        >>> ys = pipe(messages, rx.distinct(lambda m: m.id, max_keys=100_000))
+
+    Args:
+        key_selector: Optional function that returns the key of each
+            element. Defaults to the element itself.
+        max_keys: Optional maximum number of keys to remember.
+            Required with `bloom`.
+        ttl: Optional number of seconds to remember each key.
+        bloom: Use Bloom filters instead of an exact set of keys.
+        error_rate: False positive rate of the Bloom filters.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to deduplicate.
+    """
+    from .filtering import distinct
+
+    return distinct(key_selector, max_keys, ttl, bloom, error_rate)
+
+
+@overload
 def distinct_until_changed(
-    source: AsyncObservable[_TSource],
+    __source: AsyncObservable[_TSource],
 ) -> AsyncObservable[_TSource]:
+    ...
+
+
+@overload
+def distinct_until_changed(
+    key_selector: Optional[Callable[[_TSource], Any]] = None,
+    comparer: Optional[Callable[[Any, Any], bool]] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    ...
+
+
+def distinct_until_changed(
+    key_selector: Any = None,
+    comparer: Optional[Callable[[Any, Any], bool]] = None,
+) -> Any:
+    """Distinct until changed.
+
+    Return an observable sequence only containing the distinct
+    contiguous elements from the source sequence. Can be applied to a
+    source directly, or called with an optional `key_selector` and
+    `comparer` to return an operator.
+
+    Example:
+        >>> ys = pipe(xs, rx.distinct_until_changed)
+        >>> ys = pipe(xs, rx.distinct_until_changed(lambda x: x.id))
+
+    Args:
+        key_selector: Optional function that returns the key to compare
+            for each element. Defaults to the element itself. If an
+            observable is given instead, it is used as the source.
+        comparer: Optional function that returns true if two keys are
+            equal. Defaults to `==`.
+
+    Returns:
+        A partially applied function that takes the source observable,
+        or the resulting observable if applied to a source.
+    """
     from .filtering import distinct_until_changed
 
-    return distinct_until_changed(source)
+    if isinstance(key_selector, AsyncObservable):
+        return cast(AsyncObservable[Any], distinct_until_changed()(key_selector))
+    return distinct_until_changed(key_selector, comparer)
 
 
 def empty() -> "AsyncObservable[Any]":
@@ -637,6 +1009,40 @@ def filter(
     return _filter(predicate)
 
 
+def filter_batch(
+    predicate: Callable[[Any], Any],
+    size: int = 1024,
+    seconds: Optional[float] = None,
+    dtype: Any = "float64",
+    output: Literal["elements", "arrays"] = "elements",
+) -> Callable[[AsyncObservable[Any]], AsyncObservable[Any]]:
+    """Filter batches.
+
+    Collects the values of the source into a preallocated NumPy array
+    and applies the vectorized predicate once per batch, keeping the
+    values where the resulting boolean mask is true. Requires NumPy.
+
+    Example:
+        >>> ys = pipe(xs, filter_batch(lambda a: a > 0.0, size=4096))
+
+    Args:
+        predicate: A vectorized function that maps an array of values
+            to a boolean mask.
+        size: Maximum number of values per batch.
+        seconds: Optional maximum time to wait for a batch to fill.
+        dtype: NumPy dtype of the values.
+        output: Either `"elements"` to emit the kept values one by one,
+            or `"arrays"` to emit an array per batch.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to filter.
+    """
+    from .batch import filter_batch
+
+    return filter_batch(predicate, size, seconds, dtype, output)
+
+
 def filteri(
     predicate: Callable[[_TSource, int], bool]
 ) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
@@ -777,6 +1183,41 @@ def map(
     return _map(fn)
 
 
+def map_batch(
+    mapper: Callable[[Any], Any],
+    size: int = 1024,
+    seconds: Optional[float] = None,
+    dtype: Any = "float64",
+    output: Literal["elements", "arrays"] = "elements",
+) -> Callable[[AsyncObservable[Any]], AsyncObservable[Any]]:
+    """Map batches.
+
+    Collects the values of the source into a preallocated NumPy array
+    and applies the vectorized mapper once per batch. A batch is mapped
+    when it holds `size` values, when `seconds` have passed since its
+    first value, or when the source completes. Requires NumPy.
+
+    Example:
+        >>> ys = pipe(xs, map_batch(lambda a: a * 2.0, size=4096))
+
+    Args:
+        mapper: A vectorized function that maps an array of values to
+            an array of results.
+        size: Maximum number of values per batch.
+        seconds: Optional maximum time to wait for a batch to fill.
+        dtype: NumPy dtype of the values.
+        output: Either `"elements"` to emit the results one by one, or
+            `"arrays"` to emit the result array of each batch.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to map.
+    """
+    from .batch import map_batch
+
+    return map_batch(mapper, size, seconds, dtype, output)
+
+
 def map_async(
     mapper: Callable[[_TSource], Awaitable[_TResult]]
 ) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TResult]]:
@@ -851,6 +1292,32 @@ def merge_seq(
     )
 
 
+def merge_sorted(
+    sources: Iterable[AsyncObservable[_TSource]],
+    key: Optional[Callable[[_TSource], Any]] = None,
+) -> AsyncObservable[_TSource]:
+    """Merge sorted sources.
+
+    Merges observable sequences that are each ordered by `key` into a
+    single sequence that is ordered by `key`. A value is emitted once
+    every running source has a value queued.
+
+    Example:
+        >>> ys = merge_sorted([shard1, shard2], key=lambda ev: ev.timestamp)
+
+    Args:
+        sources: The ordered observables to merge.
+        key: A function that returns the sort key of a value. Defaults
+            to the value itself.
+
+    Returns:
+        The merged observable.
+    """
+    from .combine import merge_sorted
+
+    return merge_sorted(sources, key)
+
+
 def never() -> "AsyncObservable[Any]":
     from .create import never
 
@@ -863,6 +1330,302 @@ def of_async(workflow: Awaitable[_TSource]) -> AsyncObservable[_TSource]:
     return of_async(workflow)
 
 
+def on_backpressure_buffer(
+    size: int,
+    metrics: Optional[BackpressureMetrics] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Buffer values on back-pressure.
+
+    Detaches the source from the observer. Up to `size` values are kept
+    pending while the observer is busy. If the buffer overflows, the
+    observer receives a `BufferOverflowError`.
+
+    Example:
+        >>> metrics = rx.BackpressureMetrics()
+        >>> ys = pipe(xs, rx.on_backpressure_buffer(1024, metrics))
+
+    Args:
+        size: Maximum number of pending values.
+        metrics: Optional metrics where received, delivered and
+            pending values are counted.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to detach.
+    """
+    from .backpressure import on_backpressure_buffer
+
+    return on_backpressure_buffer(size, metrics)
+
+
+def on_backpressure_drop(
+    size: int = 1,
+    metrics: Optional[BackpressureMetrics] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Drop values on back-pressure.
+
+    Detaches the source from the observer. Up to `size` values are kept
+    pending while the observer is busy. Values arriving when the buffer
+    is full are dropped.
+
+    Args:
+        size: Maximum number of pending values.
+        metrics: Optional metrics where dropped values are counted.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to detach.
+    """
+    from .backpressure import on_backpressure_drop
+
+    return on_backpressure_drop(size, metrics)
+
+
+def on_backpressure_latest(
+    metrics: Optional[BackpressureMetrics] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Keep latest value on back-pressure.
+
+    Detaches the source from the observer. While the observer is busy,
+    only the latest value is kept pending.
+
+    Args:
+        metrics: Optional metrics where overwritten values are counted
+            as dropped.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to detach.
+    """
+    from .backpressure import on_backpressure_latest
+
+    return on_backpressure_latest(metrics)
+
+
+def partition(
+    predicate: Callable[[_TSource], bool]
+) -> Callable[
+    [AsyncObservable[_TSource]],
+    Tuple[AsyncObservable[_TSource], AsyncObservable[_TSource]],
+]:
+    """Partition by predicate.
+
+    Splits the source into an observable of the values that satisfy
+    the predicate and an observable of the values that do not, using a
+    single subscription to the source. The source is subscribed when
+    both outputs have been subscribed.
+
+    Example:
+        >>> evens, odds = pipe(xs, partition(lambda x: x % 2 == 0))
+
+    Args:
+        predicate: A function to test each value.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns the matching and non-matching observables.
+    """
+    from .filtering import partition
+
+    return partition(predicate)
+
+
+def partition_by(
+    key: Callable[[_TSource], int], n: int
+) -> Callable[[AsyncObservable[_TSource]], Tuple[AsyncObservable[_TSource], ...]]:
+    """Partition by index.
+
+    Splits the source into `n` outputs using a single subscription to
+    the source. Each value is routed to the output at the index
+    returned by the `key` function. The source is subscribed when all
+    outputs have been subscribed.
+
+    Example:
+        >>> low, mid, high = pipe(xs, partition_by(lambda x: x // 10, 3))
+
+    Args:
+        key: A function that returns the output index for a value.
+        n: The number of outputs.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns a tuple of `n` output observables.
+    """
+    from .filtering import partition_by
+
+    return partition_by(key, n)
+
+
+def publish() -> Callable[
+    [AsyncObservable[_TSource]], AsyncConnectableObservable[_TSource]
+]:
+    """Publish the source.
+
+    Returns a connectable observable that shares a single subscription
+    to the source between all observers. The source is subscribed when
+    `connect()` is called.
+
+    Example:
+        >>> ys = pipe(xs, publish())
+        >>> await ys.subscribe_async(obv)
+        >>> connection = await ys.connect()
+
+    Returns:
+        A partially applied publish function that takes the source
+        observable to publish.
+    """
+    from .multicast import publish
+
+    return publish()
+
+
+def quantiles(
+    qs: Sequence[float] = (0.5, 0.95, 0.99),
+    window: Optional[float] = None,
+    emit_every: Optional[float] = None,
+    k: int = 200,
+) -> Callable[[AsyncObservable[Any]], AsyncObservable[Tuple[float, ...]]]:
+    """Streaming quantiles.
+
+    Estimates quantiles of a numeric source with a mergeable `KLL`
+    sketch in bounded memory, and emits a tuple with the estimate of
+    each quantile of `qs`. Estimates are emitted at the end of each
+    tumbling `window`, every `emit_every` seconds, and when the source
+    completes. NumPy arrays are added as batches.
+
+    Example:
+        >>> ys = pipe(latencies, rx.quantiles((0.5, 0.99), window=60.0))
+
+    Args:
+        qs: The quantiles to estimate, between 0 and 1.
+        window: Optional duration in seconds of tumbling windows.
+        emit_every: Optional interval in seconds between estimates.
+        k: Accuracy parameter of the sketch. The rank error is about
+            1.7 / k.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of quantile estimates.
+    """
+    from .sketch import quantiles
+
+    return quantiles(qs, window, emit_every, k)
+
+
+def ref_count() -> Callable[
+    [AsyncConnectableObservable[_TSource]], AsyncObservable[_TSource]
+]:
+    """Reference count the connection.
+
+    Connects the connectable observable when the first observer
+    subscribes, and disconnects it when the last observer disposes its
+    subscription.
+
+    Returns:
+        A partially applied function that takes the connectable
+        observable to reference count.
+    """
+    from .multicast import ref_count
+
+    return ref_count()
+
+
+def replay(
+    buffer_size: Optional[int] = None, window: Optional[float] = None
+) -> Callable[[AsyncObservable[_TSource]], AsyncConnectableObservable[_TSource]]:
+    """Replay the source.
+
+    Returns a connectable observable that shares a single subscription
+    to the source, and replays buffered values to late observers.
+
+    Example:
+        >>> ys = pipe(xs, replay(buffer_size=100))
+        >>> connection = await ys.connect()
+
+    Args:
+        buffer_size: Maximum number of values to replay. Defaults to
+            all values.
+        window: Maximum age in seconds of the values to replay.
+            Defaults to no limit.
+
+    Returns:
+        A partially applied replay function that takes the source
+        observable to replay.
+    """
+    from .multicast import replay
+
+    return replay(buffer_size, window)
+
+
+def reorder(
+    timestamp_selector: Callable[[_TSource], float],
+    max_lateness: float,
+    on_late: Literal["drop", "emit", "error"] = "drop",
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Reorder by event time.
+
+    Emits the values of a slightly out of order source ordered by
+    their event time. A value is emitted once the watermark, i.e the
+    largest timestamp seen minus `max_lateness`, has passed it.
+
+    Example:
+        >>> ys = pipe(xs, reorder(lambda ev: ev.timestamp, 5.0))
+
+    Args:
+        timestamp_selector: A function that returns the event time of
+            a value.
+        max_lateness: How far behind the largest timestamp seen a
+            value may arrive and still be emitted in order.
+        on_late: What to do with values behind the watermark. Either
+            `"drop"` them, `"emit"` them out of order, or fail with an
+            `"error"`.
+
+    Returns:
+        A partially applied reorder function that takes the source
+        observable to reorder.
+    """
+    from .timeshift import reorder
+
+    return reorder(timestamp_selector, max_lateness, on_late)
+
+
+def resample(
+    interval: float,
+    fields: Sequence[str] = ("open", "high", "low", "close"),
+    timestamp_selector: Optional[Callable[[_TSource], float]] = None,
+    value_selector: Optional[Callable[[_TSource], float]] = None,
+) -> Callable[
+    [AsyncObservable[_TSource]], AsyncObservable[Tuple[float, Tuple[float, ...]]]
+]:
+    """Resample into bars.
+
+    Buckets the numeric values of the source into fixed intervals and
+    emits a `(start, bar)` tuple for each non-empty bucket, where `bar`
+    holds the requested fields in order. The supported fields are
+    "open", "high", "low", "close", "last", "count" and "sum". Buckets
+    close on the loop clock, or on event time if a `timestamp_selector`
+    is given.
+
+    Example:
+        >>> ys = pipe(ticks, rx.resample(60.0, ("open", "high", "low", "close")))
+
+    Args:
+        interval: The duration of each bucket.
+        fields: The fields of each bar.
+        timestamp_selector: Optional function that returns the event
+            time of a value.
+        value_selector: Optional function that returns the numeric
+            value of a value. Defaults to the value itself.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to resample.
+    """
+    from .aggregation import resample
+
+    return resample(interval, fields, timestamp_selector, value_selector)
+
+
 def retry(
     retry_count: int,
 ) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
@@ -871,6 +1634,63 @@ def retry(
     return retry(retry_count)
 
 
+def rolling(
+    window: int,
+    stats: Sequence[str] = ("mean", "std", "min", "max"),
+    min_periods: int = 1,
+    ddof: int = 1,
+) -> Callable[[AsyncObservable[float]], AsyncObservable[Tuple[float, ...]]]:
+    """Rolling statistics.
+
+    Emits a tuple of statistics over the latest `window` values of a
+    numeric source, for every value of the source. The supported
+    statistics are "count", "sum", "mean", "var", "std", "min" and
+    "max". Each value costs O(1) however large the window is.
+
+    Example:
+        >>> ys = pipe(xs, rolling(100, ("mean", "std")))
+
+    Args:
+        window: Number of values in the window.
+        stats: The statistics to compute, in the order to emit them.
+        min_periods: Minimum number of values in the window before
+            statistics are emitted.
+        ddof: Delta degrees of freedom for the variance.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of tuples of statistics.
+    """
+    from .aggregation import rolling
+
+    return rolling(window, stats, min_periods, ddof)
+
+
+def sample(
+    seconds: float,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Sample source stream.
+
+    Emits the most recent value from the source stream at the end of
+    each sampling period. Periods where the source did not produce a
+    new value are skipped.
+
+    Example:
+        >>> ys = pipe(xs, sample(0.1))
+
+    Args:
+        seconds: Length of the sampling period.
+
+    Returns:
+        A partially applied sample function that takes the source
+        observable to sample.
+    """
+
+    from .timeshift import sample
+
+    return sample(seconds)
+
+
 def scan(
     accumulator: Callable[[_TResult, _TSource], _TResult],
     initial: _TResult,
@@ -910,6 +1730,56 @@ def scan_async(
     return _scan_async(accumulator, initial)
 
 
+def session_window(
+    key_selector: Callable[[_TSource], Any],
+    gap: float,
+    aggregator: Optional[Aggregator[_TSource, Any, _TResult]] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[Tuple[Any, _TResult]]]:
+    """Aggregate sessions.
+
+    Groups the values of the source by key into sessions that close
+    after `gap` seconds without values for the key. The key and the
+    aggregate of each session are emitted when the session closes.
+    All sessions share a single loop timer.
+
+    Example:
+        >>> ys = pipe(clicks, session_window(lambda c: c.user_id, 1800.0))
+
+    Args:
+        key_selector: A function that returns the session key of a
+            value.
+        gap: Seconds of inactivity after which a session closes.
+        aggregator: The aggregation to compute for each session.
+            Defaults to counting the values.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of (key, aggregate) tuples.
+    """
+    from .aggregation import session_window
+
+    return session_window(key_selector, gap, aggregator)
+
+
+def share() -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Share the source.
+
+    Shares a single subscription to the source between all observers.
+    The source is subscribed when the first observer subscribes, and
+    disposed when the last observer disposes its subscription.
+
+    Example:
+        >>> ys = pipe(xs, share())
+
+    Returns:
+        A partially applied share function that takes the source
+        observable to share.
+    """
+    from .multicast import share
+
+    return share()
+
+
 def subscribe_async(
     obv: AsyncObserver[_TSource],
 ) -> Callable[[AsyncObservable[_TSource]], Awaitable[AsyncDisposable]]:
@@ -1111,6 +1981,54 @@ def take_until(
     return take_until(other)
 
 
+def throttle_first(
+    seconds: float,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Throttle first.
+
+    Emits a value from the source stream, then ignores subsequent
+    values for the given duration.
+
+    Example:
+        >>> ys = pipe(xs, throttle_first(0.5))
+
+    Args:
+        seconds: Duration of the throttle period.
+
+    Returns:
+        A partially applied throttle function that takes the source
+        observable to throttle.
+    """
+
+    from .timeshift import throttle_first
+
+    return throttle_first(seconds)
+
+
+def throttle_latest(
+    seconds: float,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Throttle latest.
+
+    Emits a value from the source stream immediately, and then the
+    latest value received at the end of each throttle period.
+
+    Example:
+        >>> ys = pipe(xs, throttle_latest(0.5))
+
+    Args:
+        seconds: Duration of the throttle period.
+
+    Returns:
+        A partially applied throttle function that takes the source
+        observable to throttle.
+    """
+
+    from .timeshift import throttle_latest
+
+    return throttle_latest(seconds)
+
+
 def timer(due_time: float) -> AsyncObservable[int]:
     """Returns an observable sequence that triggers the value 0
     after the given duetime in milliseconds.
@@ -1126,6 +2044,122 @@ def to_async_iterable(source: AsyncObservable[_TSource]) -> AsyncIterable[_TSour
     return to_async_iterable(source)
 
 
+def to_columns(
+    schema: Optional[Sequence[str]] = None,
+) -> Callable[
+    [AsyncObservable[Sequence[Mapping[str, Any]]]], AsyncObservable[ColumnBatch]
+]:
+    """Convert batches of rows to column batches.
+
+    Converts each batch of row dictionaries of the source, e.g. pages
+    fetched from a database, to a `ColumnBatch` with one NumPy array
+    per column. Use the operators of `aioreactive.columnar` to process
+    the batches a whole column at a time.
+
+    Example:
+        >>> ys = pipe(pages, rx.to_columns(["id", "price"]))
+
+    Args:
+        schema: Optional names of the columns. Defaults to the keys of
+            the first row of each batch.
+
+    Returns:
+        A partially applied function that takes the source observable
+        of row batches.
+    """
+    from .columnar import to_columns
+
+    return to_columns(schema)
+
+
+def to_rows() -> Callable[
+    [AsyncObservable[ColumnBatch]], AsyncObservable[List[Dict[str, Any]]]
+]:
+    """Convert column batches to batches of rows.
+
+    Example:
+        >>> ys = pipe(batches, rx.to_rows())
+
+    Returns:
+        A partially applied function that takes the source observable
+        of column batches.
+    """
+    from .columnar import to_rows
+
+    return to_rows()
+
+
+def top_k(
+    k: int,
+    key_selector: Optional[Callable[[_TSource], Any]] = None,
+    window: Optional[float] = None,
+    emit_every: Optional[float] = None,
+    width: int = 2048,
+    depth: int = 4,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[List[Tuple[Any, int]]]]:
+    """Top-k most frequent keys.
+
+    Estimates key frequencies with a `CountMinSketch` and keeps the
+    `k` most frequent keys in a heap, so memory stays constant however
+    many distinct keys there are. Emits a list of `(key, count)`
+    tuples, most frequent first, at the end of each tumbling `window`,
+    every `emit_every` seconds, and when the source completes.
+
+    Example:
+        >>> hot = pipe(requests, rx.top_k(10, lambda r: r.path, window=60.0))
+
+    Args:
+        k: Number of keys to keep.
+        key_selector: Optional function that returns the key of each
+            value. Defaults to the value itself.
+        window: Optional duration in seconds of tumbling windows.
+        emit_every: Optional interval in seconds between updates.
+        width: Number of counters per row of the sketch.
+        depth: Number of rows of the sketch.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of top-k lists.
+    """
+    from .sketch import top_k
+
+    return top_k(k, key_selector, window, emit_every, width, depth)
+
+
+def window_aggregate(
+    size: float,
+    slide: Optional[float],
+    aggregator: Aggregator[_TSource, Any, _TResult],
+    timestamp_selector: Optional[Callable[[_TSource], float]] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TResult]]:
+    """Aggregate windows.
+
+    Emits the aggregate of each tumbling or sliding window of the
+    source, updated incrementally in amortised O(1) per value.
+    Windows are count-based, or based on event time if a
+    `timestamp_selector` is given.
+
+    Example:
+        >>> ys = pipe(xs, window_aggregate(10, 1, Aggregator.mean()))
+
+    Args:
+        size: Number of values, or duration, of each window.
+        slide: Number of values, or duration, between the start of
+            consecutive windows. Defaults to `size`, i.e tumbling
+            windows.
+        aggregator: The aggregation to compute for each window.
+        timestamp_selector: Optional function that returns the event
+            time of a value, for time-based windows.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to aggregate.
+    """
+    from .aggregation import window_aggregate
+
+    return window_aggregate(size, slide, aggregator, timestamp_selector)
+
+
 @curry_flipped(1)
 def with_latest_from(
     source: AsyncObservable[_TSource],
@@ -1139,27 +2173,77 @@ def with_latest_from(
     )
 
 
+def zip(
+    *sources: AsyncObservable[Any],
+    capacity: Optional[int] = None,
+    on_overflow: Literal["error", "drop_oldest", "wait"] = "error",
+) -> AsyncObservable[Tuple[Any, ...]]:
+    """Zip many sources.
+
+    Returns an observable sequence of tuples pairing the n-th value of
+    every source. Values are queued per source until every source has
+    produced a value for the tuple.
+
+    Example:
+        >>> ys = zip(requests, responses, capacity=100)
+
+    Args:
+        sources: The observables to zip.
+        capacity: Maximum number of queued values per source. Defaults
+            to unbounded.
+        on_overflow: What to do when a queue is full. Either `"error"`
+            to fail with a `BufferOverflowError`, `"drop_oldest"` to
+            drop the oldest queued value, or `"wait"` to back-pressure
+            the source until there is room in the queue.
+
+    Returns:
+        The zipped observable.
+    """
+    from .combine import zip
+
+    return zip(*sources, capacity=capacity, on_overflow=on_overflow)
+
+
 __all__ = [
+    "Aggregator",
     "AsyncAnonymousObservable",
     "AsyncAnonymousObserver",
     "AsyncAwaitableObserver",
+    "AsyncBehaviorSubject",
+    "AsyncConnectableObservable",
     "AsyncIteratorObserver",
     "AsyncIterableObservable",
     "AsyncNotificationObserver",
     "AsyncObservable",
     "AsyncObserver",
+    "AsyncReplaySubject",
     "AsyncSingleSubject",
     "AsyncSubject",
+    "AsyncTopicSubject",
     "AsyncDisposable",
+    "BackpressureMetrics",
+    "BloomFilter",
+    "BufferOverflowError",
+    "ColumnBatch",
+    "CountMinSketch",
+    "HyperLogLog",
+    "KLL",
+    "audit",
+    "cache",
     "catch",
     "choose",
     "choose_async",
     "combine_latest",
+    "combine_latest_seq",
     "concat",
     "concat_seq",
+    "conflate",
+    "count_distinct_approx",
     "delay",
+    "distinct",
     "empty",
     "filter",
+    "filter_batch",
     "filteri",
     "filter_async",
     "from_async",
@@ -1170,22 +2254,46 @@ __all__ = [
     "flat_map_latest_async",
     "map",
     "map_async",
+    "map_batch",
     "merge",
     "merge_inner",
     "merge_seq",
+    "merge_sorted",
     "never",
+    "on_backpressure_buffer",
+    "on_backpressure_drop",
+    "on_backpressure_latest",
+    "partition",
+    "partition_by",
+    "publish",
+    "quantiles",
+    "ref_count",
+    "reorder",
+    "replay",
+    "resample",
     "retry",
+    "rolling",
     "run",
+    "sample",
     "scan",
     "scan_async",
+    "session_window",
+    "share",
     "single",
     "skip",
     "skip_last",
     "starfilter",
     "starmap",
     "switch_latest",
+    "throttle_first",
+    "throttle_latest",
     "to_async_iterable",
+    "to_columns",
+    "to_rows",
     "take",
     "take_last",
+    "top_k",
+    "window_aggregate",
+    "zip",
     "pipe",
 ]
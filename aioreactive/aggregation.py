@@ -0,0 +1,727 @@
+"""Window aggregation operators.
+
+Aggregations are described by an `Aggregator`, i.e a monoid where each
+value is lifted into an accumulator, accumulators are combined with an
+associative operation that has an identity, and the final accumulator
+is lowered into the result. This lets windows be aggregated
+incrementally instead of recomputing the aggregate over all the values
+of the window.
+"""
+import asyncio
+import builtins
+import logging
+import math
+from array import array
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from expression.core import aiotools
+
+from .observables import AsyncAnonymousObservable
+from .observers import AsyncAnonymousObserver, auto_detach_observer
+from .types import AsyncDisposable, AsyncObservable, AsyncObserver
+
+_TSource = TypeVar("_TSource")
+_TAcc = TypeVar("_TAcc")
+_TResult = TypeVar("_TResult")
+_TKey = TypeVar("_TKey", bound=Hashable)
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Aggregator(Generic[_TSource, _TAcc, _TResult]):
+    """An aggregation described as a monoid.
+
+    Args:
+        identity: The accumulator of an empty window.
+        lift: A function that turns a value into an accumulator.
+        combine: An associative function that combines two
+            accumulators, the older one first.
+        lower: A function that turns an accumulator into the result.
+    """
+
+    identity: _TAcc
+    lift: Callable[[_TSource], _TAcc]
+    combine: Callable[[_TAcc, _TAcc], _TAcc]
+    lower: Callable[[_TAcc], _TResult]
+
+    @staticmethod
+    def count() -> "Aggregator[Any, int, int]":
+        """Count the values."""
+        return Aggregator(0, lambda _: 1, lambda a, b: a + b, lambda acc: acc)
+
+    @staticmethod
+    def sum() -> "Aggregator[float, float, float]":
+        """Sum the values."""
+        return Aggregator(0, lambda x: x, lambda a, b: a + b, lambda acc: acc)
+
+    @staticmethod
+    def min() -> "Aggregator[Any, Any, Any]":
+        """The smallest value, or None for an empty window."""
+
+        def combine(a: Any, b: Any) -> Any:
+            return b if a is None else a if b is None else builtins.min(a, b)
+
+        return Aggregator(None, lambda x: x, combine, lambda acc: acc)
+
+    @staticmethod
+    def max() -> "Aggregator[Any, Any, Any]":
+        """The largest value, or None for an empty window."""
+
+        def combine(a: Any, b: Any) -> Any:
+            return b if a is None else a if b is None else builtins.max(a, b)
+
+        return Aggregator(None, lambda x: x, combine, lambda acc: acc)
+
+    @staticmethod
+    def mean() -> "Aggregator[float, Tuple[float, int], Optional[float]]":
+        """The mean of the values, or None for an empty window."""
+
+        def combine(a: Tuple[float, int], b: Tuple[float, int]) -> Tuple[float, int]:
+            return a[0] + b[0], a[1] + b[1]
+
+        def lower(acc: Tuple[float, int]) -> Optional[float]:
+            total, count = acc
+            return total / count if count else None
+
+        return Aggregator((0.0, 0), lambda x: (x, 1), combine, lower)
+
+
+class _TwoStack(Generic[_TSource, _TAcc, _TResult]):
+    """A FIFO queue of accumulators that can be aggregated in O(1).
+
+    New values are pushed on the back stack, whose aggregate is kept
+    up to date. Values are evicted from the front stack where each
+    entry holds the aggregate of itself and all newer entries of the
+    front stack. When the front stack is empty, the back stack is
+    flipped onto it. Each value is thus flipped once, which makes both
+    push and evict amortised O(1).
+    """
+
+    __slots__ = ("_aggregator", "_front", "_back", "_back_acc")
+
+    def __init__(self, aggregator: Aggregator[_TSource, _TAcc, _TResult]) -> None:
+        self._aggregator = aggregator
+        self._front: List[Tuple[float, _TAcc]] = []  # (timestamp, aggregate)
+        self._back: List[Tuple[float, _TAcc]] = []  # (timestamp, accumulator)
+        self._back_acc = aggregator.identity
+
+    def push(self, value: _TSource, timestamp: float = 0.0) -> None:
+        acc = self._aggregator.lift(value)
+        self._back.append((timestamp, acc))
+        self._back_acc = self._aggregator.combine(self._back_acc, acc)
+
+    def evict(self) -> None:
+        if not self._front:
+            combine, front = self._aggregator.combine, self._front
+            agg = self._aggregator.identity
+            while self._back:
+                timestamp, acc = self._back.pop()
+                agg = combine(acc, agg)
+                front.append((timestamp, agg))
+            self._back_acc = self._aggregator.identity
+        self._front.pop()
+
+    def oldest(self) -> float:
+        """Timestamp of the oldest value."""
+        return self._front[-1][0] if self._front else self._back[0][0]
+
+    def newest(self) -> float:
+        """Timestamp of the newest value."""
+        return self._back[-1][0] if self._back else self._front[0][0]
+
+    def query(self) -> _TResult:
+        aggregator = self._aggregator
+        if self._front:
+            acc = aggregator.combine(self._front[-1][1], self._back_acc)
+        else:
+            acc = self._back_acc
+        return aggregator.lower(acc)
+
+    def __len__(self) -> int:
+        return len(self._front) + len(self._back)
+
+
+def window_aggregate(
+    size: float,
+    slide: Optional[float],
+    aggregator: Aggregator[_TSource, Any, _TResult],
+    timestamp_selector: Optional[Callable[[_TSource], float]] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TResult]]:
+    """Aggregate windows.
+
+    Emits the aggregate of each tumbling or sliding window of the
+    source. The values of the window are kept in a two-stack queue, so
+    adding a value, evicting a value and computing the aggregate are
+    all amortised O(1) regardless of the window size.
+
+    Without a `timestamp_selector`, windows are count-based. A window
+    starts at every `slide`'th value and spans `size` values. Each
+    window is emitted as soon as it is full, and the windows that are
+    still open are emitted on completion.
+
+    With a `timestamp_selector`, windows are based on event time. The
+    windows span `size` time units and start at multiples of `slide`.
+    A window is emitted when a value at or after its end arrives, and
+    the windows that are still open are emitted on completion. Windows
+    without values are skipped. Values must arrive in event-time
+    order, see `reorder` for ordering a source with late values.
+
+    Example:
+        >>> ys = pipe(xs, window_aggregate(10, 1, Aggregator.mean()))
+        >>> ys = pipe(
+        ...     xs, window_aggregate(60.0, 10.0, Aggregator.max(), lambda x: x.ts)
+        ... )
+
+    Args:
+        size: Number of values, or duration, of each window.
+        slide: Number of values, or duration, between the start of
+            consecutive windows. Defaults to `size`, i.e tumbling
+            windows.
+        aggregator: The aggregation to compute for each window.
+        timestamp_selector: Optional function that returns the event
+            time of a value, for time-based windows.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to aggregate.
+    """
+    slide_ = size if slide is None else slide
+    if size <= 0 or slide_ <= 0:
+        raise ValueError("Size and slide must be positive.")
+
+    def _window_aggregate(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncObservable[_TResult]:
+        async def subscribe_async(aobv: AsyncObserver[_TResult]) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            window: _TwoStack[_TSource, Any, _TResult] = _TwoStack(aggregator)
+            index = 0  # Position of the next value, for count-based windows
+            window_end: Optional[float] = None  # End of the oldest open window
+
+            def first_end(timestamp: float) -> float:
+                """End of the first window holding the timestamp."""
+                return ((timestamp - size) // slide_ + 1) * slide_ + size
+
+            async def emit_until(timestamp: float) -> None:
+                """Emit the windows ending at or before the timestamp."""
+                nonlocal window_end
+
+                assert window_end is not None
+                while window_end <= timestamp:
+                    start = window_end - size
+                    while window and window.oldest() < start:
+                        window.evict()
+                    if not window:
+                        # Skip the empty windows
+                        window_end = first_end(timestamp)
+                        break
+
+                    await safe_obv.asend(window.query())
+                    window_end += slide_
+
+            async def asend(value: _TSource) -> None:
+                nonlocal index, window_end
+
+                try:
+                    if timestamp_selector is None:
+                        # Windows start at every slide'th value
+                        if window_end is None:
+                            window_end = size
+                        window.push(value, index)
+                        index += 1
+                        await emit_until(index)
+                    else:
+                        timestamp = timestamp_selector(value)
+                        if window_end is None:
+                            window_end = first_end(timestamp)
+                        await emit_until(timestamp)
+                        window.push(value, timestamp)
+                except Exception as err:
+                    await safe_obv.athrow(err)
+
+            async def aclose() -> None:
+                try:
+                    if window:
+                        # Emit the open windows holding the newest value
+                        await emit_until(window.newest() + size)
+                except Exception as err:
+                    await safe_obv.athrow(err)
+                    return
+
+                await safe_obv.aclose()
+
+            obv = AsyncAnonymousObserver(asend, safe_obv.athrow, aclose)
+            return await auto_detach(source.subscribe_async(obv))
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _window_aggregate
+
+
+class _Session(Generic[_TAcc]):
+    __slots__ = ("acc", "last_seen")
+
+    def __init__(self, acc: _TAcc, last_seen: float) -> None:
+        self.acc = acc
+        self.last_seen = last_seen
+
+
+def session_window(
+    key_selector: Callable[[_TSource], _TKey],
+    gap: float,
+    aggregator: Optional[Aggregator[_TSource, Any, _TResult]] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[Tuple[_TKey, _TResult]]]:
+    """Aggregate sessions.
+
+    Groups the values of the source by key into sessions. A session
+    closes when no values with its key have arrived for `gap` seconds,
+    and then the key and the aggregate of the session are emitted. The
+    sessions that are still open are emitted on completion.
+
+    The sessions are kept in an ordered dict where a session is moved
+    to the end whenever it receives a value, so the first session is
+    always the one to close next. A single loop timer is scheduled for
+    the first session, instead of one timer or task per key. A timer
+    that fires early, because its session has received values since,
+    is simply rescheduled.
+
+    Example:
+        >>> ys = pipe(clicks, session_window(lambda c: c.user_id, 1800.0))
+
+    Args:
+        key_selector: A function that returns the session key of a
+            value.
+        gap: Seconds of inactivity after which a session closes.
+        aggregator: The aggregation to compute for each session.
+            Defaults to counting the values.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of (key, aggregate) tuples.
+    """
+    if gap <= 0:
+        raise ValueError("Gap must be positive.")
+
+    aggregator_ = aggregator or cast(
+        Aggregator[_TSource, Any, _TResult], Aggregator.count()
+    )
+
+    def _session_window(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncObservable[Tuple[_TKey, _TResult]]:
+        async def subscribe_async(
+            aobv: AsyncObserver[Tuple[_TKey, _TResult]]
+        ) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+            sessions: "OrderedDict[_TKey, _Session[Any]]" = OrderedDict()
+            timer: Optional[asyncio.TimerHandle] = None
+            is_stopped = False
+
+            def schedule() -> None:
+                nonlocal timer
+
+                if timer is None and sessions:
+                    session = next(iter(sessions.values()))
+                    timer = loop.call_at(session.last_seen + gap, on_timer)
+
+            async def emit(key: _TKey, session: _Session[Any]) -> None:
+                await safe_obv.asend((key, aggregator_.lower(session.acc)))
+
+            async def flush() -> None:
+                nonlocal timer
+
+                if is_stopped:
+                    return
+
+                timer = None
+                now = loop.time()
+                while sessions:
+                    key, session = next(iter(sessions.items()))
+                    if session.last_seen + gap > now:
+                        break
+                    del sessions[key]
+                    await emit(key, session)
+
+                schedule()
+
+            def on_timer() -> None:
+                aiotools.start(flush())
+
+            def stop() -> None:
+                nonlocal is_stopped
+                is_stopped = True
+                if timer is not None:
+                    timer.cancel()
+
+            async def asend(value: _TSource) -> None:
+                try:
+                    key = key_selector(value)
+                    acc = aggregator_.lift(value)
+                    session = sessions.get(key)
+                    if session is None:
+                        session = sessions[key] = _Session(
+                            aggregator_.identity, loop.time()
+                        )
+                    else:
+                        sessions.move_to_end(key)
+                    session.acc = aggregator_.combine(session.acc, acc)
+                    session.last_seen = loop.time()
+                except Exception as err:
+                    await athrow(err)
+                    return
+
+                schedule()
+
+            async def athrow(error: Exception) -> None:
+                stop()
+                sessions.clear()
+                await safe_obv.athrow(error)
+
+            async def aclose() -> None:
+                stop()
+                while sessions:
+                    await emit(*sessions.popitem(last=False))
+                await safe_obv.aclose()
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            dispose = await auto_detach(source.subscribe_async(obv))
+
+            async def cancel() -> None:
+                stop()
+                sessions.clear()
+                await dispose.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _session_window
+
+
+_RESAMPLE_FIELDS = ("open", "high", "low", "close", "last", "count", "sum")
+
+# Slots of the bucket state array
+_OPEN, _HIGH, _LOW, _CLOSE, _COUNT, _SUM = range(6)
+_RESAMPLE_SLOTS = {
+    "open": _OPEN,
+    "high": _HIGH,
+    "low": _LOW,
+    "close": _CLOSE,
+    "last": _CLOSE,
+    "count": _COUNT,
+    "sum": _SUM,
+}
+
+
+def resample(
+    interval: float,
+    fields: Sequence[str] = ("open", "high", "low", "close"),
+    timestamp_selector: Optional[Callable[[_TSource], float]] = None,
+    value_selector: Optional[Callable[[_TSource], float]] = None,
+) -> Callable[
+    [AsyncObservable[_TSource]], AsyncObservable[Tuple[float, Tuple[float, ...]]]
+]:
+    """Resample into bars.
+
+    Buckets the numeric values of the source into fixed intervals
+    aligned to multiples of `interval`, and emits a `(start, bar)`
+    tuple for each non-empty bucket, where `bar` holds the requested
+    fields in the order of `fields`. The supported fields are "open",
+    "high", "low", "close", "last", "count" and "sum".
+
+    Values are timestamped with the loop clock, and a bucket is
+    emitted when the clock reaches its end. If a `timestamp_selector`
+    is given, buckets use event time instead and a bucket is emitted
+    when a value at or after its end arrives, i.e. the watermark is
+    the latest event time seen. Values older than the open bucket are
+    dropped, so use `reorder` first for out of order sources. The
+    open bucket is emitted when the source completes.
+
+    The state of the open bucket is kept in a single preallocated
+    array, so no per-bucket allocation is made besides the emitted
+    bar.
+
+    Example:
+        >>> ys = pipe(ticks, resample(60.0, ("open", "high", "low", "close")))
+
+    Args:
+        interval: The duration of each bucket.
+        fields: The fields of each bar.
+        timestamp_selector: Optional function that returns the event
+            time of a value.
+        value_selector: Optional function that returns the numeric
+            value of a value. Defaults to the value itself.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to resample.
+    """
+    if interval <= 0:
+        raise ValueError("Interval must be positive.")
+    for field in fields:
+        if field not in _RESAMPLE_FIELDS:
+            raise ValueError(f"Unknown field {field!r}.")
+
+    slots = tuple(_RESAMPLE_SLOTS[field] for field in fields)
+
+    def _resample(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncObservable[Tuple[float, Tuple[float, ...]]]:
+        async def subscribe_async(
+            aobv: AsyncObserver[Tuple[float, Tuple[float, ...]]]
+        ) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+            bucket = array("d", bytes(8 * 6))
+            start = 0.0
+            timer: Optional[asyncio.TimerHandle] = None
+            is_stopped = False
+
+            async def emit(expected: Optional[float] = None) -> None:
+                nonlocal timer
+
+                # A timer may fire for a bucket already emitted by asend
+                if expected is not None and expected != start:
+                    return
+                if timer is not None:
+                    timer.cancel()
+                    timer = None
+                if not bucket[_COUNT]:
+                    return
+
+                bar = tuple(bucket[slot] for slot in slots)
+                bucket[_COUNT] = 0.0
+                await safe_obv.asend((start, bar))
+
+            def on_timer() -> None:
+                nonlocal timer
+
+                timer = None
+                if not is_stopped:
+                    aiotools.start(emit(start))
+
+            def stop() -> None:
+                nonlocal is_stopped
+                is_stopped = True
+                if timer is not None:
+                    timer.cancel()
+
+            async def asend(value: _TSource) -> None:
+                nonlocal start, timer
+
+                try:
+                    ts = (
+                        loop.time()
+                        if timestamp_selector is None
+                        else timestamp_selector(value)
+                    )
+                    x = (
+                        float(cast(float, value))
+                        if value_selector is None
+                        else float(value_selector(value))
+                    )
+                except Exception as err:
+                    await athrow(err)
+                    return
+
+                if bucket[_COUNT]:
+                    if ts < start:
+                        log.debug("resample: dropping late value at %s", ts)
+                        return
+                    if ts >= start + interval:
+                        await emit()
+
+                if not bucket[_COUNT]:
+                    start = (ts // interval) * interval
+                    bucket[_OPEN] = bucket[_HIGH] = bucket[_LOW] = x
+                    bucket[_SUM] = 0.0
+                    if timestamp_selector is None:
+                        timer = loop.call_at(start + interval, on_timer)
+                elif x > bucket[_HIGH]:
+                    bucket[_HIGH] = x
+                elif x < bucket[_LOW]:
+                    bucket[_LOW] = x
+
+                bucket[_CLOSE] = x
+                bucket[_COUNT] += 1.0
+                bucket[_SUM] += x
+
+            async def athrow(error: Exception) -> None:
+                stop()
+                await safe_obv.athrow(error)
+
+            async def aclose() -> None:
+                if is_stopped:
+                    return
+                await emit()
+                stop()
+                await safe_obv.aclose()
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            dispose = await auto_detach(source.subscribe_async(obv))
+
+            async def cancel() -> None:
+                stop()
+                await dispose.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _resample
+
+
+_ROLLING_STATS = ("count", "sum", "mean", "var", "std", "min", "max")
+
+
+def rolling(
+    window: int,
+    stats: Sequence[str] = ("mean", "std", "min", "max"),
+    min_periods: int = 1,
+    ddof: int = 1,
+) -> Callable[[AsyncObservable[float]], AsyncObservable[Tuple[float, ...]]]:
+    """Rolling statistics.
+
+    Emits statistics over the latest `window` values of a numeric
+    source, for every value of the source. Each emitted tuple holds the
+    requested statistics in the order of `stats`. The supported
+    statistics are "count", "sum", "mean", "var", "std", "min" and
+    "max". The variance and standard deviation use `ddof` delta
+    degrees of freedom, and are NaN for too few values.
+
+    The values of the window are kept in a fixed-size ring buffer. The
+    mean and variance are updated with Welford's algorithm as values
+    enter and leave the window, and min and max are tracked with
+    monotonic deques of ring buffer positions. Each value thus costs
+    O(1) however large the window is.
+
+    Example:
+        >>> ys = pipe(xs, rolling(100, ("mean", "std")))
+
+    Args:
+        window: Number of values in the window.
+        stats: The statistics to compute.
+        min_periods: Minimum number of values in the window before
+            statistics are emitted.
+        ddof: Delta degrees of freedom for the variance.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of tuples of statistics.
+    """
+    if window < 1:
+        raise ValueError("Window must be positive.")
+    for stat in stats:
+        if stat not in _ROLLING_STATS:
+            raise ValueError(f"Unknown statistic {stat!r}.")
+
+    stats_ = tuple(stats)
+    track_min = "min" in stats_
+    track_max = "max" in stats_
+
+    def _rolling(
+        source: AsyncObservable[float],
+    ) -> AsyncObservable[Tuple[float, ...]]:
+        async def subscribe_async(
+            aobv: AsyncObserver[Tuple[float, ...]]
+        ) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            ring = array("d", bytes(8 * window))
+            mins: Deque[int] = deque()  # Positions of increasing values
+            maxs: Deque[int] = deque()  # Positions of decreasing values
+            position = 0  # Total number of values seen
+            count = 0
+            mean = 0.0
+            m2 = 0.0  # Sum of squared differences from the mean
+
+            def stat(name: str) -> float:
+                if name == "count":
+                    return float(count)
+                if name == "sum":
+                    return mean * count
+                if name == "mean":
+                    return mean
+                if name == "min":
+                    return ring[mins[0] % window]
+                if name == "max":
+                    return ring[maxs[0] % window]
+
+                var = m2 / (count - ddof) if count > ddof else math.nan
+                return var if name == "var" else math.sqrt(builtins.max(var, 0.0))
+
+            async def asend(value: float) -> None:
+                nonlocal position, count, mean, m2
+
+                try:
+                    x = float(value)
+                except Exception as err:
+                    await safe_obv.athrow(err)
+                    return
+
+                slot = position % window
+                if count == window:
+                    # Remove the oldest value from the running statistics
+                    old = ring[slot]
+                    count -= 1
+                    if count:
+                        delta = old - mean
+                        mean -= delta / count
+                        m2 -= delta * (old - mean)
+                    else:
+                        mean = m2 = 0.0
+
+                ring[slot] = x
+                count += 1
+                delta = x - mean
+                mean += delta / count
+                m2 += delta * (x - mean)
+
+                oldest = position - window
+                if track_min:
+                    while mins and ring[mins[-1] % window] >= x:
+                        mins.pop()
+                    mins.append(position)
+                    if mins[0] <= oldest:
+                        mins.popleft()
+                if track_max:
+                    while maxs and ring[maxs[-1] % window] <= x:
+                        maxs.pop()
+                    maxs.append(position)
+                    if maxs[0] <= oldest:
+                        maxs.popleft()
+                position += 1
+
+                if count >= min_periods:
+                    await safe_obv.asend(tuple(stat(name) for name in stats_))
+
+            obv = AsyncAnonymousObserver(asend, safe_obv.athrow, safe_obv.aclose)
+            return await auto_detach(source.subscribe_async(obv))
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _rolling
+
+
+__all__ = [
+    "Aggregator",
+    "resample",
+    "rolling",
+    "session_window",
+    "window_aggregate",
+]
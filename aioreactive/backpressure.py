@@ -0,0 +1,413 @@
+"""Operators that detach a fast producer from a slow consumer.
+
+Aioreactive normally applies implicit synchronous back-pressure, i.e
+the producer awaits the consumer. The operators in this module instead
+let the producer continue immediately while a single consumer task
+drains a buffer into the downstream observer. What happens to values
+arriving while the consumer is busy is decided by the buffer.
+"""
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Generic, Hashable, Optional, Protocol, TypeVar, cast
+
+from expression.system import AsyncDisposable
+
+from .observables import AsyncAnonymousObservable
+from .observers import AsyncAnonymousObserver
+from .types import AsyncObservable, AsyncObserver
+
+_TSource = TypeVar("_TSource")
+_TKey = TypeVar("_TKey", bound=Hashable)
+
+log = logging.getLogger(__name__)
+
+
+class BufferOverflowError(Exception):
+    """Raised when a bounded back-pressure buffer overflows."""
+
+
+@dataclass
+class BackpressureMetrics:
+    """Counters maintained by the back-pressure operators.
+
+    Pass the same instance to an operator to observe how many values
+    were received from the source, delivered to the observer and
+    dropped or overwritten while the observer was busy. The counters
+    are shared by all subscriptions using the instance.
+    """
+
+    received: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    pending: int = 0
+    """Number of values currently waiting in the buffer."""
+
+
+class _Buffer(Protocol[_TSource]):
+    """The buffer between the producer and the consumer task."""
+
+    def put(self, value: _TSource) -> None:
+        ...
+
+    def get(self) -> _TSource:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+class _ConflateBuffer(Generic[_TKey, _TSource]):
+    """Keeps the latest pending value per key in arrival order of the
+    keys."""
+
+    __slots__ = ("_key_selector", "_metrics", "_pending")
+
+    def __init__(
+        self, key_selector: Callable[[_TSource], _TKey], metrics: BackpressureMetrics
+    ) -> None:
+        self._key_selector = key_selector
+        self._metrics = metrics
+        self._pending: "OrderedDict[_TKey, _TSource]" = OrderedDict()
+
+    def put(self, value: _TSource) -> None:
+        key = self._key_selector(value)
+        if key in self._pending:
+            self._metrics.dropped += 1
+
+        # Assigning to an existing key keeps its position in the queue
+        self._pending[key] = value
+
+    def get(self) -> _TSource:
+        _, value = self._pending.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._pending.clear()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+class _LatestBuffer(Generic[_TSource]):
+    """Keeps a single pending value that is overwritten by newer
+    values."""
+
+    __slots__ = ("_metrics", "_value", "_has_value")
+
+    def __init__(self, metrics: BackpressureMetrics) -> None:
+        self._metrics = metrics
+        self._value: _TSource = cast(_TSource, None)
+        self._has_value = False
+
+    def put(self, value: _TSource) -> None:
+        if self._has_value:
+            self._metrics.dropped += 1
+        self._value, self._has_value = value, True
+
+    def get(self) -> _TSource:
+        value, self._value = self._value, cast(_TSource, None)
+        self._has_value = False
+        return value
+
+    def clear(self) -> None:
+        self._value, self._has_value = cast(_TSource, None), False
+
+    def __len__(self) -> int:
+        return 1 if self._has_value else 0
+
+
+class _BoundedBuffer(Generic[_TSource]):
+    """A bounded FIFO buffer that either drops the newest value or
+    raises `BufferOverflowError` when full."""
+
+    __slots__ = ("_metrics", "_size", "_drop", "_queue")
+
+    def __init__(self, size: int, drop: bool, metrics: BackpressureMetrics) -> None:
+        self._metrics = metrics
+        self._size = size
+        self._drop = drop
+        self._queue: Deque[_TSource] = deque()
+
+    def put(self, value: _TSource) -> None:
+        if len(self._queue) >= self._size:
+            if self._drop:
+                self._metrics.dropped += 1
+                return
+            raise BufferOverflowError(f"Buffer of size {self._size} overflowed.")
+        self._queue.append(value)
+
+    def get(self) -> _TSource:
+        return self._queue.popleft()
+
+    def clear(self) -> None:
+        self._queue.clear()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+def _detach(
+    buffer_factory: Callable[[], _Buffer[_TSource]],
+    metrics: BackpressureMetrics,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Detach the source from the observer using a buffer and a single
+    consumer task per subscription.
+
+    Values are delivered by the consumer task in the order they are
+    taken from the buffer. When the consumer is idle, the producer
+    yields once after starting it, so the consumer takes the value
+    before the next one arrives and the buffer policy only applies
+    while a delivery is in progress. Completion is delivered after the buffer
+    has been drained, while errors drop any pending values and are
+    delivered as soon as the value currently being sent has been
+    processed.
+    """
+
+    def _(source: AsyncObservable[_TSource]) -> AsyncObservable[_TSource]:
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            buffer = buffer_factory()
+            subscription = AsyncDisposable.empty()
+            consumer: Optional["asyncio.Future[None]"] = None
+            error: Optional[Exception] = None
+            is_stopped = False  # Source has terminated
+            is_done = False  # Observer has terminated
+
+            def clear() -> None:
+                metrics.pending -= len(buffer)
+                buffer.clear()
+
+            async def terminate(err: Optional[Exception]) -> None:
+                nonlocal is_done
+
+                if is_done:
+                    return
+                is_done = True
+
+                await subscription.dispose_async()
+                if err is None:
+                    await aobv.aclose()
+                else:
+                    await aobv.athrow(err)
+
+            async def drain() -> None:
+                nonlocal consumer
+
+                try:
+                    while buffer and not is_done:
+                        value = buffer.get()
+                        metrics.pending -= 1
+                        try:
+                            await aobv.asend(value)
+                        except Exception as ex:
+                            clear()
+                            await terminate(ex)
+                            return
+                        metrics.delivered += 1
+                    if is_stopped:
+                        await terminate(error)
+                finally:
+                    consumer = None
+
+            async def asend(value: _TSource) -> None:
+                nonlocal consumer
+
+                if is_stopped:
+                    return
+
+                metrics.received += 1
+                pending = len(buffer)
+                try:
+                    buffer.put(value)
+                except Exception as ex:
+                    await athrow(ex)
+                    return
+                metrics.pending += len(buffer) - pending
+
+                if consumer is None:
+                    consumer = asyncio.ensure_future(drain())
+                    # Let the idle consumer take the value
+                    await asyncio.sleep(0)
+
+            async def athrow(err: Exception) -> None:
+                nonlocal error, is_stopped
+
+                if is_stopped:
+                    return
+                is_stopped, error = True, err
+
+                clear()
+                if consumer is None:
+                    await terminate(err)
+
+            async def aclose() -> None:
+                nonlocal is_stopped
+
+                if is_stopped:
+                    return
+                is_stopped = True
+
+                if consumer is None:
+                    await terminate(None)
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            subscription = await source.subscribe_async(obv)
+
+            async def cancel() -> None:
+                nonlocal is_done
+
+                log.debug("detach:cancel()")
+                is_done = True
+                clear()
+                if consumer is not None:
+                    consumer.cancel()
+                await subscription.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _
+
+
+def conflate(
+    key_selector: Callable[[_TSource], _TKey],
+    metrics: Optional[BackpressureMetrics] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Conflate values by key.
+
+    Detaches the source from the observer. While the observer is busy
+    processing a value, newer values overwrite older pending values
+    with the same key. When the observer is ready, it receives the
+    latest value of each pending key, in the order the keys first
+    became pending.
+
+    Memory is bounded by the number of distinct keys instead of the
+    rate of the source.
+
+    Example:
+        >>> ys = pipe(quotes, conflate(lambda quote: quote.symbol))
+
+    Args:
+        key_selector: A function that returns the key of a value.
+        metrics: Optional metrics where overwritten values are counted
+            as dropped.
+
+    Returns:
+        A partially applied conflate function that takes the source
+        observable to conflate.
+    """
+    metrics_ = metrics or BackpressureMetrics()
+
+    def factory() -> _Buffer[_TSource]:
+        return _ConflateBuffer(key_selector, metrics_)
+
+    return _detach(factory, metrics_)
+
+
+def on_backpressure_drop(
+    size: int = 1,
+    metrics: Optional[BackpressureMetrics] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Drop values on back-pressure.
+
+    Detaches the source from the observer. Up to `size` values are kept
+    pending while the observer is busy. Values arriving when the buffer
+    is full are dropped.
+
+    Example:
+        >>> metrics = BackpressureMetrics()
+        >>> ys = pipe(xs, on_backpressure_drop(metrics=metrics))
+
+    Args:
+        size: Maximum number of pending values.
+        metrics: Optional metrics where dropped values are counted.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to detach.
+    """
+    if size < 1:
+        raise ValueError("Size must be positive.")
+
+    metrics_ = metrics or BackpressureMetrics()
+
+    def factory() -> _Buffer[_TSource]:
+        return _BoundedBuffer(size, True, metrics_)
+
+    return _detach(factory, metrics_)
+
+
+def on_backpressure_latest(
+    metrics: Optional[BackpressureMetrics] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Keep latest value on back-pressure.
+
+    Detaches the source from the observer. While the observer is busy,
+    only the latest value is kept pending and delivered when the
+    observer is ready.
+
+    Example:
+        >>> ys = pipe(xs, on_backpressure_latest())
+
+    Args:
+        metrics: Optional metrics where overwritten values are counted
+            as dropped.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to detach.
+    """
+    metrics_ = metrics or BackpressureMetrics()
+
+    def factory() -> _Buffer[_TSource]:
+        return _LatestBuffer(metrics_)
+
+    return _detach(factory, metrics_)
+
+
+def on_backpressure_buffer(
+    size: int,
+    metrics: Optional[BackpressureMetrics] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Buffer values on back-pressure.
+
+    Detaches the source from the observer. Up to `size` values are kept
+    pending while the observer is busy. If the buffer overflows, the
+    source is disposed and the observer receives a
+    `BufferOverflowError`.
+
+    Example:
+        >>> ys = pipe(xs, on_backpressure_buffer(1024))
+
+    Args:
+        size: Maximum number of pending values.
+        metrics: Optional metrics for monitoring the buffer.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to detach.
+    """
+    if size < 1:
+        raise ValueError("Size must be positive.")
+
+    metrics_ = metrics or BackpressureMetrics()
+
+    def factory() -> _Buffer[_TSource]:
+        return _BoundedBuffer(size, False, metrics_)
+
+    return _detach(factory, metrics_)
+
+
+__all__ = [
+    "BackpressureMetrics",
+    "BufferOverflowError",
+    "conflate",
+    "on_backpressure_buffer",
+    "on_backpressure_drop",
+    "on_backpressure_latest",
+]
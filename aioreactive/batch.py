@@ -0,0 +1,222 @@
+"""Vectorized batch operators for numeric streams.
+
+The operators collect the values of the source into a preallocated
+NumPy array and apply a vectorized function once per batch, instead of
+once per value. NumPy is an optional dependency that is only imported
+when an operator is used.
+"""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Literal, Optional
+
+from expression.core import aiotools
+
+from .observables import AsyncAnonymousObservable
+from .observers import AsyncAnonymousObserver, auto_detach_observer
+from .types import AsyncDisposable, AsyncObservable, AsyncObserver
+from .utils import import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+log = logging.getLogger(__name__)
+
+BatchOutput = Literal["elements", "arrays"]
+
+
+def _batch(
+    process: Callable[["np.ndarray[Any, Any]"], "np.ndarray[Any, Any]"],
+    size: int,
+    seconds: Optional[float],
+    dtype: Any,
+    output: BatchOutput,
+) -> Callable[[AsyncObservable[Any]], AsyncObservable[Any]]:
+    """Collect values into batches and process each batch at once.
+
+    A batch is processed when it holds `size` values, when `seconds`
+    have passed since its first value, or when the source completes.
+    """
+    numpy = import_numpy()
+
+    if size < 1:
+        raise ValueError("Size must be positive.")
+    if output not in ("elements", "arrays"):
+        raise ValueError(f"Unknown output {output!r}.")
+
+    def _(source: AsyncObservable[Any]) -> AsyncObservable[Any]:
+        async def subscribe_async(aobv: AsyncObserver[Any]) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+
+            buffer = numpy.empty(size, dtype=dtype)
+            count = 0
+            timer: Optional[asyncio.TimerHandle] = None
+            is_stopped = False
+
+            async def flush() -> None:
+                nonlocal count, timer
+
+                if timer is not None:
+                    timer.cancel()
+                    timer = None
+                if not count:
+                    return
+
+                batch, count = buffer[:count], 0
+                result = process(batch)
+                if output == "arrays":
+                    # The buffer is reused, so never emit a view of it
+                    if numpy.shares_memory(result, buffer):
+                        result = result.copy()
+                    await safe_obv.asend(result)
+                else:
+                    for value in result.tolist():
+                        await safe_obv.asend(value)
+
+            async def guarded(action: Callable[[], Awaitable[None]]) -> bool:
+                try:
+                    await action()
+                except Exception as err:
+                    await stop(err)
+                    return False
+                return True
+
+            def on_timer() -> None:
+                nonlocal timer
+
+                timer = None
+                if not is_stopped:
+                    aiotools.start(guarded(flush))
+
+            async def stop(error: Optional[Exception]) -> None:
+                nonlocal is_stopped, count
+
+                if is_stopped:
+                    return
+                is_stopped = True
+
+                if timer is not None:
+                    timer.cancel()
+                count = 0
+
+                if error is None:
+                    await safe_obv.aclose()
+                else:
+                    await safe_obv.athrow(error)
+
+            async def asend(value: Any) -> None:
+                nonlocal count, timer
+
+                if is_stopped:
+                    return
+
+                try:
+                    buffer[count] = value
+                except Exception as err:
+                    await stop(err)
+                    return
+
+                count += 1
+                if count == size:
+                    await guarded(flush)
+                elif count == 1 and seconds is not None:
+                    timer = loop.call_later(seconds, on_timer)
+
+            async def athrow(error: Exception) -> None:
+                await stop(error)
+
+            async def aclose() -> None:
+                if not is_stopped and await guarded(flush):
+                    await stop(None)
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            dispose = await auto_detach(source.subscribe_async(obv))
+
+            async def cancel() -> None:
+                nonlocal is_stopped
+
+                is_stopped = True
+                if timer is not None:
+                    timer.cancel()
+                await dispose.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _
+
+
+def map_batch(
+    mapper: Callable[["np.ndarray[Any, Any]"], "np.ndarray[Any, Any]"],
+    size: int = 1024,
+    seconds: Optional[float] = None,
+    dtype: Any = "float64",
+    output: BatchOutput = "elements",
+) -> Callable[[AsyncObservable[Any]], AsyncObservable[Any]]:
+    """Map batches.
+
+    Collects the values of the source into a preallocated NumPy array
+    and applies the vectorized mapper once per batch. A batch is mapped
+    when it holds `size` values, when `seconds` have passed since its
+    first value, or when the source completes.
+
+    Example:
+        >>> ys = pipe(xs, map_batch(lambda a: a * 2.0, size=4096))
+
+    Args:
+        mapper: A vectorized function that maps an array of values to
+            an array of results.
+        size: Maximum number of values per batch.
+        seconds: Optional maximum time to wait for a batch to fill.
+        dtype: NumPy dtype of the values.
+        output: Either `"elements"` to emit the results one by one, or
+            `"arrays"` to emit the result array of each batch.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to map.
+    """
+    return _batch(mapper, size, seconds, dtype, output)
+
+
+def filter_batch(
+    predicate: Callable[["np.ndarray[Any, Any]"], "np.ndarray[Any, Any]"],
+    size: int = 1024,
+    seconds: Optional[float] = None,
+    dtype: Any = "float64",
+    output: BatchOutput = "elements",
+) -> Callable[[AsyncObservable[Any]], AsyncObservable[Any]]:
+    """Filter batches.
+
+    Collects the values of the source into a preallocated NumPy array
+    and applies the vectorized predicate once per batch, keeping the
+    values where the resulting boolean mask is true. A batch is
+    filtered when it holds `size` values, when `seconds` have passed
+    since its first value, or when the source completes.
+
+    Example:
+        >>> ys = pipe(xs, filter_batch(lambda a: a > 0.0, size=4096))
+
+    Args:
+        predicate: A vectorized function that maps an array of values
+            to a boolean mask.
+        size: Maximum number of values per batch.
+        seconds: Optional maximum time to wait for a batch to fill.
+        dtype: NumPy dtype of the values.
+        output: Either `"elements"` to emit the kept values one by one,
+            or `"arrays"` to emit an array of the kept values of each
+            batch.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to filter.
+    """
+
+    def process(batch: "np.ndarray[Any, Any]") -> "np.ndarray[Any, Any]":
+        return batch[predicate(batch)]
+
+    return _batch(process, size, seconds, dtype, output)
+
+
+__all__ = ["filter_batch", "map_batch"]
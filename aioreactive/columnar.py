@@ -0,0 +1,318 @@
+"""Columnar record batches.
+
+Records with a fixed schema can flow through a stream as a
+`ColumnBatch`, i.e. a batch of records stored as one NumPy array per
+column, and be processed a whole column at a time instead of one
+record dictionary at a time. NumPy is an optional dependency that is
+only imported when a batch is created.
+
+Example:
+    >>> from aioreactive import columnar as col
+    >>> ys = pipe(
+    ...     pages,  # Lists of row dictionaries, e.g. from fetchmany()
+    ...     rx.to_columns(),
+    ...     col.where(lambda b: b["price"] > 0),
+    ...     col.with_column("total", lambda b: b["price"] * b["quantity"]),
+    ...     col.select("id", "total"),
+    ... )
+"""
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from expression.core import aiotools
+
+from .transform import transform
+from .types import AsyncObservable
+from .utils import import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+def _as_column(numpy: Any, values: Any) -> "np.ndarray[Any, Any]":
+    if isinstance(values, numpy.ndarray):
+        return values
+
+    values = list(values)
+    if values and isinstance(values[0], (list, tuple)):
+        # Keep sequences as elements instead of a second dimension
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+    return numpy.asarray(values)
+
+
+class ColumnBatch:
+    """A batch of records stored by column.
+
+    Each column is a one dimensional NumPy array, and all columns have
+    the same length. Columns of sequences, e.g. lists of tags, are
+    stored as object arrays. Batches are immutable, and operations
+    return new batches that share the columns they do not change.
+    """
+
+    __slots__ = ["_columns", "_length"]
+
+    def __init__(self, columns: Mapping[str, Any]) -> None:
+        numpy = import_numpy()
+
+        self._columns: Dict[str, "np.ndarray[Any, Any]"] = {}
+        self._length = 0
+        for index, (name, values) in enumerate(columns.items()):
+            column = _as_column(numpy, values)
+            if column.ndim != 1:
+                raise ValueError(f"Column {name!r} must be one dimensional.")
+            if index == 0:
+                self._length = len(column)
+            elif len(column) != self._length:
+                raise ValueError(f"Column {name!r} has the wrong length.")
+            self._columns[name] = column
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Mapping[str, Any]], schema: Optional[Sequence[str]] = None
+    ) -> "ColumnBatch":
+        """Create a batch from rows.
+
+        Args:
+            rows: The rows of the batch.
+            schema: Optional names of the columns. Defaults to the keys
+                of the first row.
+
+        Returns:
+            The column batch.
+        """
+        rows = list(rows)
+        names = list(schema) if schema is not None else list(rows[0]) if rows else []
+        return cls({name: [row[name] for row in rows] for name in names})
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Convert the batch to a list of row dictionaries."""
+        names = list(self._columns)
+        columns = [column.tolist() for column in self._columns.values()]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    @property
+    def names(self) -> List[str]:
+        """The names of the columns."""
+        return list(self._columns)
+
+    def select(self, *names: str) -> "ColumnBatch":
+        """Return a batch with only the given columns, in order."""
+        return ColumnBatch({name: self._columns[name] for name in names})
+
+    def where(self, mask: Any) -> "ColumnBatch":
+        """Return a batch with only the rows where the mask is true."""
+        numpy = import_numpy()
+
+        mask = numpy.asarray(mask, dtype=bool)
+        return ColumnBatch(
+            {name: column[mask] for name, column in self._columns.items()}
+        )
+
+    def with_column(self, name: str, values: Any) -> "ColumnBatch":
+        """Return a batch with the column added or replaced."""
+        columns = dict(self._columns)
+        columns[name] = values
+        return ColumnBatch(columns)
+
+    def explode(self, name: str) -> "ColumnBatch":
+        """Explode a column of sequences.
+
+        Returns a batch with one row per element of the sequences in
+        the column, where the values of the other columns are
+        repeated. Rows with an empty sequence are dropped.
+        """
+        numpy = import_numpy()
+
+        column = self._columns[name]
+        lengths = numpy.fromiter(
+            (len(x) for x in column), dtype=numpy.intp, count=len(column)
+        )
+        values: List[Any] = [value for sequence in column for value in sequence]
+
+        columns: Dict[str, Any] = {}
+        for key, other in self._columns.items():
+            columns[key] = values if key == name else numpy.repeat(other, lengths)
+        return ColumnBatch(columns)
+
+    def __getitem__(self, name: str) -> "np.ndarray[Any, Any]":
+        return self._columns[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._columns
+
+    def __len__(self) -> int:
+        """The number of rows in the batch."""
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"ColumnBatch(names={self.names}, rows={len(self)})"
+
+
+def _map_batch(
+    mapper: Callable[[ColumnBatch], ColumnBatch]
+) -> Callable[[AsyncObservable[ColumnBatch]], AsyncObservable[ColumnBatch]]:
+    """Map each batch, and drop the batches that end up empty."""
+
+    def handler(
+        next: Callable[[ColumnBatch], Awaitable[None]], batch: ColumnBatch
+    ) -> Awaitable[None]:
+        result = mapper(batch)
+        if len(result):
+            return next(result)
+        return aiotools.empty()
+
+    return transform(handler)
+
+
+def select(
+    *names: str,
+) -> Callable[[AsyncObservable[ColumnBatch]], AsyncObservable[ColumnBatch]]:
+    """Select columns.
+
+    Example:
+        >>> ys = pipe(xs, select("id", "price"))
+
+    Args:
+        names: The names of the columns to keep, in order.
+
+    Returns:
+        A partially applied function that takes the source observable
+        of column batches.
+    """
+    return _map_batch(lambda batch: batch.select(*names))
+
+
+def where(
+    predicate: Callable[[ColumnBatch], Any]
+) -> Callable[[AsyncObservable[ColumnBatch]], AsyncObservable[ColumnBatch]]:
+    """Filter rows.
+
+    Keeps the rows where the boolean mask returned by the vectorized
+    predicate is true. Batches without any rows left are dropped.
+
+    Example:
+        >>> ys = pipe(xs, where(lambda b: b["price"] > 0))
+
+    Args:
+        predicate: A function that maps a batch to a boolean mask.
+
+    Returns:
+        A partially applied function that takes the source observable
+        of column batches.
+    """
+    return _map_batch(lambda batch: batch.where(predicate(batch)))
+
+
+def with_column(
+    name: str, mapper: Callable[[ColumnBatch], Any]
+) -> Callable[[AsyncObservable[ColumnBatch]], AsyncObservable[ColumnBatch]]:
+    """Add or replace a column.
+
+    Example:
+        >>> ys = pipe(xs, with_column("total", lambda b: b["price"] * b["qty"]))
+
+    Args:
+        name: The name of the column.
+        mapper: A function that maps a batch to the values of the
+            column.
+
+    Returns:
+        A partially applied function that takes the source observable
+        of column batches.
+    """
+    return _map_batch(lambda batch: batch.with_column(name, mapper(batch)))
+
+
+def explode(
+    name: str,
+) -> Callable[[AsyncObservable[ColumnBatch]], AsyncObservable[ColumnBatch]]:
+    """Explode a column of sequences into one row per element.
+
+    Example:
+        >>> ys = pipe(xs, explode("tags"))
+
+    Args:
+        name: The name of the column to explode.
+
+    Returns:
+        A partially applied function that takes the source observable
+        of column batches.
+    """
+    return _map_batch(lambda batch: batch.explode(name))
+
+
+def to_columns(
+    schema: Optional[Sequence[str]] = None,
+) -> Callable[
+    [AsyncObservable[Sequence[Mapping[str, Any]]]], AsyncObservable[ColumnBatch]
+]:
+    """Convert batches of rows to column batches.
+
+    Example:
+        >>> ys = pipe(pages, to_columns(["id", "price"]))
+
+    Args:
+        schema: Optional names of the columns. Defaults to the keys of
+            the first row of each batch.
+
+    Returns:
+        A partially applied function that takes the source observable
+        of row batches.
+    """
+
+    def handler(
+        next: Callable[[ColumnBatch], Awaitable[None]],
+        rows: Sequence[Mapping[str, Any]],
+    ) -> Awaitable[None]:
+        if rows:
+            return next(ColumnBatch.from_rows(rows, schema))
+        return aiotools.empty()
+
+    return transform(handler)
+
+
+def to_rows() -> Callable[
+    [AsyncObservable[ColumnBatch]], AsyncObservable[List[Dict[str, Any]]]
+]:
+    """Convert column batches to batches of rows.
+
+    Example:
+        >>> ys = pipe(batches, to_rows(), rx.flat_map(rx.from_iterable))
+
+    Returns:
+        A partially applied function that takes the source observable
+        of column batches.
+    """
+
+    def handler(
+        next: Callable[[List[Dict[str, Any]]], Awaitable[None]], batch: ColumnBatch
+    ) -> Awaitable[None]:
+        return next(batch.to_rows())
+
+    return transform(handler)
+
+
+__all__ = [
+    "ColumnBatch",
+    "explode",
+    "select",
+    "to_columns",
+    "to_rows",
+    "where",
+    "with_column",
+]
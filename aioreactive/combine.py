@@ -1,7 +1,24 @@
+import asyncio
+import builtins
 import dataclasses
+import heapq
 import logging
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Callable, Generic, Iterable, NoReturn, Tuple, TypeVar, cast
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Generic,
+    Iterable,
+    List,
+    Literal,
+    NoReturn,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 from expression import curry_flipped
 from expression.collections import Block, Map, block, map
@@ -18,6 +35,7 @@ from expression.core import (
 )
 from expression.system import AsyncDisposable
 
+from .backpressure import BufferOverflowError
 from .create import of_seq
 from .msg import (
     CompletedMsg,
@@ -269,6 +287,209 @@ def combine_latest(
     return AsyncAnonymousObservable(subscribe_async)
 
 
+def merge_sorted(
+    sources: Iterable[AsyncObservable[_TSource]],
+    key: Optional[Callable[[_TSource], Any]] = None,
+) -> AsyncObservable[_TSource]:
+    """Merge sorted sources.
+
+    Merges observable sequences that are each ordered by `key` into a
+    single sequence that is ordered by `key`, e.g events replayed from
+    several shards merged by timestamp.
+
+    A k-way merge is used where the head value of each source is kept
+    in a heap. The smallest value is emitted once every source that
+    has not completed has at least one value queued, since until then
+    a smaller value could still arrive. Values with equal keys are
+    emitted in the order of the sources.
+
+    Note that values of sources running ahead of the others are queued
+    until the slower sources catch up.
+
+    Example:
+        >>> ys = merge_sorted([shard1, shard2], key=lambda ev: ev.timestamp)
+
+    Args:
+        sources: The ordered observables to merge.
+        key: A function that returns the sort key of a value. Defaults
+            to the value itself.
+
+    Returns:
+        The merged observable.
+    """
+    sources_ = list(sources)
+
+    def identity(value: _TSource) -> Any:
+        return value
+
+    key_: Callable[[_TSource], Any] = key or identity
+
+    async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+        safe_obv, auto_detach = auto_detach_observer(aobv)
+        count = len(sources_)
+        # Queued values with their keys, computed when the values arrive
+        queues: List[Deque[Tuple[Any, _TSource]]] = [deque() for _ in range(count)]
+        heap: List[Tuple[Any, int]] = []  # Key of the head of each queue
+        completed = [False] * count
+        waiting = count  # Running sources without queued values
+        running = count
+        is_done = False
+
+        async def drain() -> None:
+            nonlocal waiting, is_done
+
+            while not waiting and heap and not is_done:
+                _, index = heapq.heappop(heap)
+                queue = queues[index]
+                _, value = queue.popleft()
+                if queue:
+                    heapq.heappush(heap, (queue[0][0], index))
+                elif not completed[index]:
+                    waiting += 1
+
+                await safe_obv.asend(value)
+
+            if not running and not heap and not is_done:
+                is_done = True
+                await safe_obv.aclose()
+
+        async def stop(error: Exception) -> None:
+            nonlocal is_done
+
+            if not is_done:
+                is_done = True
+                await safe_obv.athrow(error)
+
+        def obv(index: int) -> AsyncObserver[_TSource]:
+            queue = queues[index]
+
+            async def asend(value: _TSource) -> None:
+                nonlocal waiting
+
+                if is_done:
+                    return
+
+                try:
+                    value_key = key_(value)
+                except Exception as err:
+                    await stop(err)
+                    return
+
+                queue.append((value_key, value))
+                if len(queue) == 1:
+                    heapq.heappush(heap, (value_key, index))
+                    waiting -= 1
+                await drain()
+
+            async def athrow(error: Exception) -> None:
+                await stop(error)
+
+            async def aclose() -> None:
+                nonlocal waiting, running
+
+                if completed[index]:
+                    return
+                completed[index] = True
+                running -= 1
+                if not queue:
+                    waiting -= 1
+                await drain()
+
+            return AsyncAnonymousObserver(asend, athrow, aclose)
+
+        if not count:
+            await safe_obv.aclose()
+
+        subscriptions: List[AsyncDisposable] = []
+        for index, source in enumerate(sources_):
+            subscription = await pipe(obv(index), source.subscribe_async, auto_detach)
+            subscriptions.append(subscription)
+
+        return AsyncDisposable.composite(*subscriptions)
+
+    return AsyncAnonymousObservable(subscribe_async)
+
+
+def combine_latest_seq(
+    sources: Iterable[AsyncObservable[Any]],
+) -> AsyncObservable[Tuple[Any, ...]]:
+    """Combine latest values of many sources.
+
+    Merges the given observable sequences into one observable sequence
+    of tuples holding the latest value of each source, in the order of
+    the sources. Values are emitted as soon as every source has
+    produced a value, and then for every value produced by any source.
+
+    All sources are handled by a single agent that keeps the latest
+    values in a preallocated list of slots, and counts the sources that
+    have yet to produce a value. The bookkeeping for each value is thus
+    constant regardless of the number of sources.
+
+    The combined sequence completes when all sources have completed,
+    or when a source completes without ever producing a value.
+
+    Example:
+        >>> ys = combine_latest_seq([temperature, humidity, pressure])
+
+    Args:
+        sources: The observables to combine.
+
+    Returns:
+        The combined observable.
+    """
+    sources_ = list(sources)
+
+    async def subscribe_async(aobv: AsyncObserver[Tuple[Any, ...]]) -> AsyncDisposable:
+        safe_obv, auto_detach = auto_detach_observer(aobv)
+        count = len(sources_)
+
+        async def worker(
+            inbox: MailboxProcessor[Tuple[int, Notification[Any]]]
+        ) -> None:
+            slots: List[Any] = [None] * count
+            has_value = [False] * count
+            waiting = count  # Sources that have not produced a value
+            running = count  # Sources that have not completed
+
+            while running:
+                index, n = await inbox.receive()
+
+                if isinstance(n, OnNext):
+                    if not has_value[index]:
+                        has_value[index] = True
+                        waiting -= 1
+
+                    slots[index] = n.value
+                    if not waiting:
+                        await safe_obv.asend(tuple(slots))
+                elif isinstance(n, OnError):
+                    await safe_obv.athrow(n.exception)
+                    return
+                else:
+                    running -= 1
+                    if not has_value[index]:
+                        break
+
+            await safe_obv.aclose()
+
+        agent = MailboxProcessor.start(worker)
+
+        def obv(index: int) -> AsyncObserver[Any]:
+            async def notification(n: Notification[Any]) -> None:
+                agent.post((index, n))
+
+            return AsyncNotificationObserver(notification)
+
+        subscriptions: List[AsyncDisposable] = []
+        for index, source in enumerate(sources_):
+            subscription = await pipe(obv(index), source.subscribe_async, auto_detach)
+            subscriptions.append(subscription)
+
+        return AsyncDisposable.composite(*subscriptions)
+
+    return AsyncAnonymousObservable(subscribe_async)
+
+
 @curry_flipped(1)
 def with_latest_from(
     source: AsyncObservable[_TSource], other: AsyncObservable[_TOther]
@@ -385,3 +606,146 @@ def zip_seq(
         )
 
     return AsyncAnonymousObservable(subscribe_async)
+
+
+def zip(
+    *sources: AsyncObservable[Any],
+    capacity: Optional[int] = None,
+    on_overflow: Literal["error", "drop_oldest", "wait"] = "error",
+) -> AsyncObservable[Tuple[Any, ...]]:
+    """Zip many sources.
+
+    Merges the given observable sequences into one observable sequence
+    of tuples, pairing the n-th value of every source in the order of
+    the sources. Values are queued per source until every source has
+    produced a value for the tuple.
+
+    The queue of each source may be bounded by `capacity`, so a source
+    running ahead of the others does not grow memory without bounds.
+    When a value arrives at a full queue, the `on_overflow` policy
+    decides what happens:
+
+    - `"error"`: The zipped sequence fails with a `BufferOverflowError`.
+    - `"drop_oldest"`: The oldest queued value of the source is
+      dropped. Note that this changes which values are paired.
+    - `"wait"`: The source is back-pressured, i.e the `asend` of the
+      source is awaited until there is room in the queue.
+
+    The zipped sequence completes as soon as a completed source has no
+    more queued values.
+
+    Example:
+        >>> ys = zip(requests, responses, capacity=100)
+
+    Args:
+        sources: The observables to zip.
+        capacity: Maximum number of queued values per source. Defaults
+            to unbounded.
+        on_overflow: What to do when a queue is full.
+
+    Returns:
+        The zipped observable.
+    """
+    if capacity is not None and capacity < 1:
+        raise ValueError("Capacity must be positive.")
+    if on_overflow not in ("error", "drop_oldest", "wait"):
+        raise ValueError(f"Unknown overflow policy {on_overflow!r}.")
+
+    async def subscribe_async(aobv: AsyncObserver[Tuple[Any, ...]]) -> AsyncDisposable:
+        safe_obv, auto_detach = auto_detach_observer(aobv)
+        count = len(sources)
+        queues: List[Deque[Any]] = [deque() for _ in range(count)]
+        completed = [False] * count
+        ready = 0  # Number of non-empty queues
+        space: Optional["asyncio.Future[None]"] = None
+        is_done = False
+
+        def wake() -> None:
+            if space is not None and not space.done():
+                space.set_result(None)
+
+        async def stop(error: Optional[Exception]) -> None:
+            nonlocal is_done
+
+            if is_done:
+                return
+            is_done = True
+
+            for queue in queues:
+                queue.clear()
+            wake()
+
+            if error is None:
+                await safe_obv.aclose()
+            else:
+                await safe_obv.athrow(error)
+
+        def obv(index: int) -> AsyncObserver[Any]:
+            queue = queues[index]
+
+            async def asend(value: Any) -> None:
+                nonlocal ready, space
+
+                if capacity is not None:
+                    while len(queue) >= capacity and not is_done:
+                        if on_overflow == "error":
+                            error = BufferOverflowError(
+                                f"Zip queue of capacity {capacity} overflowed."
+                            )
+                            await stop(error)
+                        elif on_overflow == "drop_oldest":
+                            queue.popleft()
+                        else:
+                            if space is None or space.done():
+                                space = asyncio.get_event_loop().create_future()
+                            await space
+
+                if is_done:
+                    return
+
+                queue.append(value)
+                if len(queue) == 1:
+                    ready += 1
+                if ready < count:
+                    return
+
+                values = tuple(q.popleft() for q in queues)
+                ready = sum(1 for q in queues if q)
+                wake()
+
+                await safe_obv.asend(values)
+
+                for done, q in builtins.zip(completed, queues):
+                    if done and not q:
+                        await stop(None)
+                        break
+
+            async def athrow(error: Exception) -> None:
+                await stop(error)
+
+            async def aclose() -> None:
+                completed[index] = True
+                if not queue:
+                    await stop(None)
+
+            return AsyncAnonymousObserver(asend, athrow, aclose)
+
+        if not count:
+            await safe_obv.aclose()
+
+        subscriptions: List[AsyncDisposable] = []
+        for index, source in enumerate(sources):
+            subscription = await pipe(obv(index), source.subscribe_async, auto_detach)
+            subscriptions.append(subscription)
+
+        async def cancel() -> None:
+            nonlocal is_done
+
+            is_done = True
+            wake()
+            for subscription in subscriptions:
+                await subscription.dispose_async()
+
+        return AsyncDisposable.create(cancel)
+
+    return AsyncAnonymousObservable(subscribe_async)
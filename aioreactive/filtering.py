@@ -1,27 +1,27 @@
-from typing import Any, Awaitable, Callable, Iterable, List, NoReturn, Optional, TypeVar
+import asyncio
+from collections import OrderedDict, deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 from expression.collections import seq
-from expression.core import (
-    MailboxProcessor,
-    Option,
-    TailCall,
-    TailCallResult,
-    aiotools,
-    compose,
-    match,
-    pipe,
-    tailrec_async,
-)
+from expression.core import Option, aiotools, compose, pipe
 from expression.system.disposable import AsyncDisposable
 
 from .combine import zip_seq
-from .notification import Notification, OnCompleted, OnError, OnNext
 from .observables import AsyncAnonymousObservable
-from .observers import (
-    AsyncAnonymousObserver,
-    AsyncNotificationObserver,
-    auto_detach_observer,
-)
+from .observers import AsyncAnonymousObserver, auto_detach_observer
+from .sketch import BloomFilter
+from .subject import AsyncMultiSubject
 from .transform import map, transform
 from .types import AsyncObservable, AsyncObserver
 
@@ -124,65 +124,182 @@ def filteri(
 
 
 def distinct_until_changed(
-    source: AsyncObservable[_TSource],
-) -> AsyncObservable[_TSource]:
+    key_selector: Optional[Callable[[_TSource], Any]] = None,
+    comparer: Optional[Callable[[Any, Any], bool]] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
     """Distinct until changed.
 
     Return an observable sequence only containing the distinct
-    contiguous elements from the source sequence.
+    contiguous elements from the source sequence, i.e. elements whose
+    key differs from the key of the previous element.
 
     Args:
-        source (AsyncObservable[TSource]): [description]
+        key_selector: Optional function that returns the key to compare
+            for each element. Defaults to the element itself.
+        comparer: Optional function that returns true if two keys are
+            equal. Defaults to `==`.
 
     Returns:
-        Async observable with only contiguous distinct elements.
+        A partially applied function that takes the source observable
+        and returns an observable with only contiguous distinct
+        elements.
     """
 
-    async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
-        safe_obv, auto_detach = auto_detach_observer(aobv)
+    def _distinct_until_changed(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncObservable[_TSource]:
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            # Forwards to the observer directly, like `transform`, so
+            # elements are not posted through a mailbox.
+            has_latest = False
+            latest: Any = None
+            is_stopped = False
 
-        async def worker(inbox: MailboxProcessor[Notification[_TSource]]) -> None:
-            @tailrec_async
-            async def message_loop(
-                latest: Notification[_TSource],
-            ) -> "TailCallResult[NoReturn, [Notification[_TSource]]]":
-                n = await inbox.receive()
+            async def asend(value: _TSource) -> None:
+                nonlocal has_latest, latest, is_stopped
+
+                if is_stopped:
+                    return
+                try:
+                    key = value if key_selector is None else key_selector(value)
+                    if has_latest:
+                        equal = (
+                            key == latest if comparer is None else comparer(latest, key)
+                        )
+                        if equal:
+                            return
+                except Exception as err:
+                    is_stopped = True
+                    await aobv.athrow(err)
+                    return
+
+                has_latest, latest = True, key
+                await aobv.asend(value)
+
+            obv = AsyncAnonymousObserver(asend, aobv.athrow, aobv.aclose)
+            return await source.subscribe_async(obv)
 
-                async def get_latest() -> Notification[_TSource]:
-                    with match(n) as case:
-                        for x in case(OnNext[_TSource]):
-                            if n == latest:
-                                break
-                            try:
-                                await safe_obv.asend(x)
-                            except Exception as ex:
-                                await safe_obv.athrow(ex)
-                            break
-                        for err in case(OnError[_TSource]):
-                            await safe_obv.athrow(err)
-                            break
-                        while case(OnCompleted):
-                            await safe_obv.aclose()
-                            break
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _distinct_until_changed
 
-                    return n
 
-                latest = await get_latest()
-                return TailCall[Notification[_TSource]](latest)
+def distinct(
+    key_selector: Optional[Callable[[_TSource], Hashable]] = None,
+    max_keys: Optional[int] = None,
+    ttl: Optional[float] = None,
+    bloom: bool = False,
+    error_rate: float = 0.001,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Distinct.
+
+    Drops the elements whose key has been seen before, e.g. to
+    deduplicate messages redelivered by an at-least-once source. The
+    keys seen are kept in memory that is bounded by `max_keys`, where
+    the least recently seen keys are forgotten first, and by `ttl`,
+    where keys are forgotten that many seconds after they were first
+    seen. A forgotten key is emitted again when seen again.
+
+    With `bloom`, the keys are kept in two Bloom filters of `max_keys`
+    keys each instead of a set. The filters take a few bits per key,
+    but an unseen key is wrongly dropped with probability about
+    `error_rate`. When the newest filter is full, or older than `ttl`,
+    the oldest filter is discarded, so every key is remembered for at
+    least `max_keys` keys or `ttl` seconds. Keys must then be numbers,
+    strings, bytes or tuples of those, which have a stable hash.
+
+    Example:
+        >>> ys = pipe(messages, distinct(lambda m: m.id, max_keys=100_000))
+
+    Args:
+        key_selector: Optional function that returns the key of each
+            element. Defaults to the element itself.
+        max_keys: Optional maximum number of keys to remember.
+            Required with `bloom`.
+        ttl: Optional number of seconds to remember each key.
+        bloom: Use Bloom filters instead of an exact set of keys.
+        error_rate: False positive rate of the Bloom filters.
+
+    Returns:
+        A partially applied function that takes the source observable
+        to deduplicate.
+    """
+    if max_keys is not None and max_keys < 1:
+        raise ValueError("Max keys must be positive.")
+    if bloom and max_keys is None:
+        raise ValueError("Max keys is required with bloom.")
+
+    def _distinct(source: AsyncObservable[_TSource]) -> AsyncObservable[_TSource]:
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+
+            if bloom:
+                assert max_keys is not None
+                capacity: int = max_keys
+                filters = [BloomFilter(capacity, error_rate) for _ in range(2)]
+                created = loop.time()
+
+                def seen(key: Hashable) -> bool:
+                    nonlocal created
+
+                    now = loop.time()
+                    newest = filters[-1]
+                    if newest.count >= capacity or (
+                        ttl is not None and now - created >= ttl
+                    ):
+                        oldest = filters.pop(0)
+                        oldest.clear()
+                        filters.append(oldest)
+                        newest, created = oldest, now
+
+                    return key in filters[0] or newest.add(key)
+
+            else:
+                keys: "OrderedDict[Hashable, float]" = OrderedDict()
+
+                def seen(key: Hashable) -> bool:
+                    now = loop.time()
+                    if ttl is not None:
+                        # Keys seen again move to the end with max_keys,
+                        # so expired keys may remain behind a live one.
+                        while keys:
+                            first = next(iter(keys.values()))
+                            if first + ttl > now:
+                                break
+                            keys.popitem(last=False)
+
+                    first_seen = keys.get(key)
+                    if first_seen is not None and (
+                        ttl is None or first_seen + ttl > now
+                    ):
+                        if max_keys is not None:
+                            keys.move_to_end(key)
+                        return True
+
+                    keys[key] = now
+                    keys.move_to_end(key)
+                    if max_keys is not None and len(keys) > max_keys:
+                        keys.popitem(last=False)
+                    return False
 
-            await message_loop(
-                OnCompleted
-            )  # Use as sentinel value as it will not match any OnNext value
+            async def asend(value: _TSource) -> None:
+                try:
+                    key = value if key_selector is None else key_selector(value)
+                    if seen(key):
+                        return
+                except Exception as err:
+                    await safe_obv.athrow(err)
+                    return
 
-        agent = MailboxProcessor.start(worker)
+                await safe_obv.asend(value)
 
-        async def notification(n: Notification[_TSource]) -> None:
-            agent.post(n)
+            obv = AsyncAnonymousObserver(asend, safe_obv.athrow, safe_obv.aclose)
+            return await auto_detach(source.subscribe_async(obv))
 
-        obv: AsyncObserver[_TSource] = AsyncNotificationObserver(notification)
-        return await pipe(obv, source.subscribe_async, auto_detach)
+        return AsyncAnonymousObservable(subscribe_async)
 
-    return AsyncAnonymousObservable(subscribe_async)
+    return _distinct
 
 
 def skip(
@@ -228,16 +345,12 @@ def skip_last(
         async def subscribe_async(observer: AsyncObserver[_TSource]) -> AsyncDisposable:
             safe_obv, auto_detach = auto_detach_observer(observer)
 
-            q: List[_TSource] = []
+            q: Deque[_TSource] = deque()
 
             async def asend(value: _TSource) -> None:
-                front = None
                 q.append(value)
                 if len(q) > count:
-                    front = q.pop(0)
-
-                if front is not None:
-                    await safe_obv.asend(front)
+                    await safe_obv.asend(q.popleft())
 
             obv = AsyncAnonymousObserver(asend, safe_obv.athrow, safe_obv.aclose)
             return await pipe(obv, source.subscribe_async, auto_detach)
@@ -294,12 +407,10 @@ def take_last(
     def _take_last(source: AsyncObservable[_TSource]) -> AsyncObservable[_TSource]:
         async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
             safe_obv, auto_detach = auto_detach_observer(aobv)
-            queue: List[_TSource] = []
+            queue: Deque[_TSource] = deque(maxlen=count)
 
             async def asend(value: _TSource) -> None:
                 queue.append(value)
-                if len(queue) > count:
-                    queue.pop(0)
 
             async def aclose() -> None:
                 for item in queue:
@@ -407,3 +518,175 @@ def slice(
         return source
 
     return _slice
+
+
+def partition_by(
+    key: Callable[[_TSource], int], n: int
+) -> Callable[[AsyncObservable[_TSource]], Tuple[AsyncObservable[_TSource], ...]]:
+    """Partition by index.
+
+    Splits the source into `n` output observables using a single
+    subscription to the source. Each value is routed to the output at
+    the index returned by the `key` function.
+
+    The source is subscribed when every output has at least one
+    observer, so no output misses values because it was subscribed
+    later than the others. An output that is never subscribed to will
+    therefore block the source, i.e. no output receives any values
+    until all of them have been subscribed.
+
+    Values routed to an output whose observers have all been disposed
+    are dropped. When the observers of all outputs have been disposed,
+    the source is disposed and the outputs are reset, so subscribing
+    to every output again connects to the source again. Observers
+    subscribing to an output after the source has terminated, while
+    other observers are still subscribed, receive the completion or
+    error of the source. An index outside `range(n)` is an error that
+    is forwarded to all outputs.
+
+    Example:
+        >>> low, mid, high = pipe(xs, partition_by(lambda x: x // 10, 3))
+
+    Args:
+        key: A function that returns the output index for a value.
+        n: The number of outputs.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns a tuple of `n` output observables.
+    """
+    if n < 1:
+        raise ValueError("Number of outputs must be positive.")
+
+    def _partition_by(
+        source: AsyncObservable[_TSource],
+    ) -> Tuple[AsyncObservable[_TSource], ...]:
+        outputs: List[AsyncMultiSubject[_TSource]] = [
+            AsyncMultiSubject() for _ in range(n)
+        ]
+        counts = [0] * n  # Number of observers per output
+        waiting = n  # Number of outputs without observers
+        active = 0  # Total number of observers
+        subscription = AsyncDisposable.empty()
+        is_connected = False
+        is_stopped = False  # Source has terminated
+        error: Optional[Exception] = None
+
+        async def asend(value: _TSource) -> None:
+            try:
+                index = key(value)
+                if not 0 <= index < n:
+                    raise IndexError(f"Partition index {index} out of range.")
+            except Exception as err:
+                await athrow(err)
+                await subscription.dispose_async()
+                return
+
+            await outputs[index].asend(value)
+
+        async def athrow(err: Exception) -> None:
+            nonlocal is_stopped, error
+
+            is_stopped, error = True, err
+            for output in outputs:
+                await output.athrow(err)
+
+        async def aclose() -> None:
+            nonlocal is_stopped
+
+            is_stopped = True
+            for output in outputs:
+                await output.aclose()
+
+        obv = AsyncAnonymousObserver(asend, athrow, aclose)
+
+        def partition(index: int) -> AsyncObservable[_TSource]:
+            async def subscribe_async(
+                aobv: AsyncObserver[_TSource],
+            ) -> AsyncDisposable:
+                nonlocal waiting, active, subscription, is_connected
+
+                if is_stopped:
+                    # Replay the terminal notification to late observers
+                    if error is None:
+                        await aobv.aclose()
+                    else:
+                        await aobv.athrow(error)
+                    return AsyncDisposable.empty()
+
+                inner = await outputs[index].subscribe_async(aobv)
+                if counts[index] == 0:
+                    waiting -= 1
+                counts[index] += 1
+                active += 1
+
+                if waiting == 0 and not is_connected:
+                    is_connected = True
+                    subscription = await source.subscribe_async(obv)
+
+                is_disposed = False
+
+                async def dispose() -> None:
+                    nonlocal waiting, active, is_connected, is_stopped, error
+                    nonlocal is_disposed
+
+                    if is_disposed:
+                        return
+                    is_disposed = True
+
+                    await inner.dispose_async()
+                    counts[index] -= 1
+                    if counts[index] == 0:
+                        waiting += 1
+                    active -= 1
+                    if active == 0 and is_connected:
+                        # Reset so that the outputs can connect again
+                        is_connected, is_stopped, error = False, False, None
+                        waiting = n
+                        outputs[:] = [AsyncMultiSubject() for _ in range(n)]
+                        await subscription.dispose_async()
+
+                return AsyncDisposable.create(dispose)
+
+            return AsyncAnonymousObservable(subscribe_async)
+
+        return tuple(partition(index) for index in range(n))
+
+    return _partition_by
+
+
+def partition(
+    predicate: Callable[[_TSource], bool]
+) -> Callable[
+    [AsyncObservable[_TSource]],
+    Tuple[AsyncObservable[_TSource], AsyncObservable[_TSource]],
+]:
+    """Partition by predicate.
+
+    Splits the source into an observable of the values that satisfy
+    the predicate and an observable of the values that do not, using a
+    single subscription to the source. Both observables must be
+    subscribed before any values are emitted. See `partition_by` for
+    how the source subscription is shared.
+
+    Example:
+        >>> evens, odds = pipe(xs, partition(lambda x: x % 2 == 0))
+
+    Args:
+        predicate: A function to test each value.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns the matching and non-matching observables.
+    """
+
+    def key(value: _TSource) -> int:
+        return 0 if predicate(value) else 1
+
+    def _partition(
+        source: AsyncObservable[_TSource],
+    ) -> Tuple[AsyncObservable[_TSource], AsyncObservable[_TSource]]:
+        matching, rest = partition_by(key, 2)(source)
+        return matching, rest
+
+    return _partition
@@ -0,0 +1,296 @@
+"""Multicast operators.
+
+Operators for sharing a single subscription to a source between
+multiple observers using a subject.
+"""
+import logging
+from typing import Callable, Optional, TypeVar, Union
+
+from expression.core import compose
+from expression.system import AsyncDisposable
+
+from .observables import AsyncAnonymousObservable
+from .observers import AsyncAnonymousObserver
+from .subject import AsyncMultiSubject, AsyncReplaySubject
+from .types import AsyncObservable, AsyncObserver, CloseAsync, SendAsync, ThrowAsync
+
+_TSource = TypeVar("_TSource")
+
+log = logging.getLogger(__name__)
+
+
+class AsyncConnectableObservable(AsyncObservable[_TSource]):
+    """An observable that shares a single subscription to the source.
+
+    Observers subscribe to a subject, and the subject is subscribed to
+    the source when `connect()` is called. When the connection is
+    disposed, or the source terminates and `reset_on_termination` is
+    true, the subject is replaced so that the next connection starts
+    with a fresh subject.
+    """
+
+    def __init__(
+        self,
+        source: AsyncObservable[_TSource],
+        subject_factory: Callable[[], AsyncMultiSubject[_TSource]],
+        reset_on_termination: bool = True,
+    ) -> None:
+        self._source = source
+        self._subject_factory = subject_factory
+        self._reset_on_termination = reset_on_termination
+        self._subject: Optional[AsyncMultiSubject[_TSource]] = None
+        self._connection: Optional[AsyncDisposable] = None
+
+    def _get_subject(self) -> AsyncMultiSubject[_TSource]:
+        if self._subject is None:
+            self._subject = self._subject_factory()
+        return self._subject
+
+    def _reset(self, connection: AsyncDisposable) -> bool:
+        """Reset if the given connection is still the current one."""
+        if self._connection is not connection:
+            return False
+
+        self._connection, self._subject = None, None
+        return True
+
+    async def subscribe_async(
+        self,
+        send: Optional[Union[SendAsync[_TSource], AsyncObserver[_TSource]]] = None,
+        throw: Optional[ThrowAsync] = None,
+        close: Optional[CloseAsync] = None,
+    ) -> AsyncDisposable:
+        return await self._get_subject().subscribe_async(send, throw, close)
+
+    async def connect(self) -> AsyncDisposable:
+        """Connect the subject to the source.
+
+        Connecting an already connected observable is a no-op that
+        returns a disposable for the current connection.
+
+        Returns:
+            An async disposable that disconnects the subject from the
+            source.
+        """
+        log.debug("AsyncConnectableObservable:connect()")
+
+        connection = self._connection
+        if connection is None:
+            connection = await self._connect()
+
+        async def disconnect() -> None:
+            if self._reset(connection):
+                log.debug("AsyncConnectableObservable:disconnect()")
+                await connection.dispose_async()
+
+        return AsyncDisposable.create(disconnect)
+
+    async def _connect(self) -> AsyncDisposable:
+        subject = self._get_subject()
+        subscription = AsyncDisposable.empty()
+
+        async def dispose() -> None:
+            await subscription.dispose_async()
+
+        # Register the connection before subscribing, so a source that
+        # terminates during the subscribe resets the right connection.
+        connection = self._connection = AsyncDisposable.create(dispose)
+
+        async def athrow(error: Exception) -> None:
+            if self._reset_on_termination:
+                self._reset(connection)
+            await subject.athrow(error)
+
+        async def aclose() -> None:
+            if self._reset_on_termination:
+                self._reset(connection)
+            await subject.aclose()
+
+        obv = AsyncAnonymousObserver(subject.asend, athrow, aclose)
+        subscription = await self._source.subscribe_async(obv)
+        return connection
+
+
+def publish() -> Callable[
+    [AsyncObservable[_TSource]], AsyncConnectableObservable[_TSource]
+]:
+    """Publish the source.
+
+    Returns a connectable observable that shares a single subscription
+    to the source between all observers. The source is not subscribed
+    until `connect()` is called, so observers can subscribe before any
+    values are produced.
+
+    Example:
+        >>> ys = pipe(xs, publish())
+        >>> await ys.subscribe_async(obv1)
+        >>> await ys.subscribe_async(obv2)
+        >>> connection = await ys.connect()
+
+    Returns:
+        A partially applied publish function that takes the source
+        observable to publish.
+    """
+
+    def _publish(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncConnectableObservable[_TSource]:
+        return AsyncConnectableObservable(source, AsyncMultiSubject)
+
+    return _publish
+
+
+def ref_count() -> Callable[
+    [AsyncConnectableObservable[_TSource]], AsyncObservable[_TSource]
+]:
+    """Reference count the connection.
+
+    Returns an observable that connects the connectable observable
+    when the first observer subscribes, and disconnects it when the
+    last observer disposes its subscription.
+
+    Returns:
+        A partially applied function that takes the connectable
+        observable to reference count.
+    """
+
+    def _ref_count(
+        source: AsyncConnectableObservable[_TSource],
+    ) -> AsyncObservable[_TSource]:
+        count = 0
+        connection = AsyncDisposable.empty()
+
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            nonlocal count, connection
+
+            subscription = await source.subscribe_async(aobv)
+            count += 1
+
+            # Connect is a no-op if already connected, but the source
+            # may have terminated and reset the connection.
+            connection = await source.connect()
+            is_disposed = False
+
+            async def dispose() -> None:
+                nonlocal count, is_disposed
+
+                if is_disposed:
+                    return
+                is_disposed = True
+
+                await subscription.dispose_async()
+                count -= 1
+                if count == 0:
+                    log.debug("ref_count: last observer, disconnecting.")
+                    await connection.dispose_async()
+
+            return AsyncDisposable.create(dispose)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _ref_count
+
+
+def share() -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Share the source.
+
+    Returns an observable that shares a single subscription to the
+    source between all observers. The source is subscribed when the
+    first observer subscribes, and disposed when the last observer
+    disposes its subscription. Observers that subscribe later only
+    receive values produced after they subscribed.
+
+    Example:
+        >>> ys = pipe(xs, share())
+
+    Returns:
+        A partially applied share function that takes the source
+        observable to share.
+    """
+    return compose(publish(), ref_count())
+
+
+def replay(
+    buffer_size: Optional[int] = None, window: Optional[float] = None
+) -> Callable[[AsyncObservable[_TSource]], AsyncConnectableObservable[_TSource]]:
+    """Replay the source.
+
+    Returns a connectable observable that shares a single subscription
+    to the source through an `AsyncReplaySubject`. Observers that
+    subscribe late receive the buffered values, and the terminal
+    notification if the source has terminated. The buffer is kept when
+    the source terminates, and is only discarded when the connection
+    is disposed.
+
+    Example:
+        >>> ys = pipe(xs, replay(buffer_size=100))
+        >>> connection = await ys.connect()
+
+    Args:
+        buffer_size: Maximum number of values to replay. Defaults to
+            all values.
+        window: Maximum age in seconds of the values to replay.
+            Defaults to no limit.
+
+    Returns:
+        A partially applied replay function that takes the source
+        observable to replay.
+    """
+
+    def factory() -> AsyncMultiSubject[_TSource]:
+        return AsyncReplaySubject(buffer_size, window)
+
+    def _replay(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncConnectableObservable[_TSource]:
+        return AsyncConnectableObservable(source, factory, reset_on_termination=False)
+
+    return _replay
+
+
+def cache(
+    buffer_size: Optional[int] = None, window: Optional[float] = None
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Cache the source.
+
+    Subscribes to the source when the first observer subscribes, and
+    serves later observers from memory instead of subscribing to the
+    source again. The source subscription is kept when observers
+    dispose, so a cold and expensive source such as a query wrapped in
+    `of_async` or `defer` runs only once.
+
+    Example:
+        >>> ys = pipe(rx.of_async(query()), cache())
+
+    Args:
+        buffer_size: Maximum number of values to replay. Defaults to
+            all values.
+        window: Maximum age in seconds of the values to replay.
+            Defaults to no limit.
+
+    Returns:
+        A partially applied cache function that takes the source
+        observable to cache.
+    """
+
+    def _cache(source: AsyncObservable[_TSource]) -> AsyncObservable[_TSource]:
+        connectable = replay(buffer_size, window)(source)
+
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            subscription = await connectable.subscribe_async(aobv)
+            await connectable.connect()
+            return subscription
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _cache
+
+
+__all__ = [
+    "AsyncConnectableObservable",
+    "cache",
+    "publish",
+    "ref_count",
+    "replay",
+    "share",
+]
@@ -0,0 +1,859 @@
+"""Probabilistic sketches and operators.
+
+Sketches summarize a stream in a small, fixed amount of memory and
+answer approximate queries about it, e.g. the number of distinct
+values. Sketches of the same configuration are mergeable, so a stream
+can be sketched per window or per partition and the sketches combined
+afterwards.
+
+Values are hashed with a stable 64-bit hash that is consistent with
+equality, so sketches built in different processes can be merged.
+Numbers, including NumPy scalars, are hashed with SplitMix64 of their
+integer value or IEEE bits, which is vectorised for NumPy numeric
+arrays. Strings and bytes are hashed with BLAKE2b, and tuples by
+combining the hashes of their items. Other types raise `TypeError`, as
+they have no stable hash.
+"""
+import asyncio
+import bisect
+import builtins
+import hashlib
+import heapq
+import itertools
+import logging
+import math
+import numbers
+import random
+import struct
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from expression.core import aiotools
+
+from .observables import AsyncAnonymousObservable
+from .observers import AsyncAnonymousObserver, auto_detach_observer
+from .types import AsyncDisposable, AsyncObservable, AsyncObserver
+
+_TSource = TypeVar("_TSource")
+_TKey = TypeVar("_TKey", bound=Hashable)
+
+log = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+_INT64_LIMIT = float(1 << 63)
+
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _float_bits(value: float) -> int:
+    """Return the bits to hash for a float.
+
+    Integral floats hash as the equal integer, and other floats as
+    their IEEE 754 bits.
+    """
+    if value.is_integer() and abs(value) < _INT64_LIMIT:
+        return int(value) & _MASK64
+    (bits,) = struct.unpack("<Q", struct.pack("<d", value))
+    return bits
+
+
+def _hash64(value: Any) -> int:
+    """Return a stable 64-bit hash of the value.
+
+    Raises:
+        TypeError: If the type of the value has no stable hash.
+    """
+    if type(value).__module__ == "numpy" and hasattr(value, "item"):
+        value = value.item()  # NumPy scalar to the equal Python value
+
+    if isinstance(value, numbers.Integral):
+        return _splitmix64(int(value) & _MASK64)
+    if isinstance(value, float):
+        return _splitmix64(_float_bits(value))
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+    elif isinstance(value, tuple):
+        h = len(cast(Tuple[Any, ...], value))
+        for item in cast(Tuple[Any, ...], value):
+            h = _splitmix64(h ^ _hash64(item))
+        return h
+    else:
+        raise TypeError(f"Cannot hash values of type {type(value).__name__!r}.")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def _is_numeric_array(values: Any) -> bool:
+    """Return true if the values are a NumPy bool, int or float array."""
+    dtype = getattr(values, "dtype", None)
+    return (
+        dtype is not None and dtype.kind in "biuf" and getattr(values, "ndim", 0) == 1
+    )
+
+
+def _hash64_array(values: Any) -> Any:
+    """Vectorised `_hash64` of a NumPy numeric array."""
+    import numpy
+
+    if values.dtype.kind == "f":
+        f = values.astype(numpy.float64, copy=False)
+        with numpy.errstate(invalid="ignore"):
+            integral = (f == numpy.floor(f)) & (numpy.abs(f) < _INT64_LIMIT)
+        ints = numpy.where(integral, f, 0.0).astype(numpy.int64).view(numpy.uint64)
+        x = numpy.where(integral, ints, f.view(numpy.uint64))
+    else:
+        x = values.astype(numpy.int64, copy=False).view(numpy.uint64)
+
+    x = x + numpy.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> numpy.uint64(30))) * numpy.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> numpy.uint64(27))) * numpy.uint64(0x94D049BB133111EB)
+    return x ^ (x >> numpy.uint64(31))
+
+
+def _every(
+    loop: asyncio.AbstractEventLoop,
+    timers: List[asyncio.TimerHandle],
+    seconds: float,
+    action: Callable[[], None],
+) -> None:
+    """Call the action every `seconds`, keeping the pending timer in
+    `timers` so it can be cancelled."""
+
+    def on_timer() -> None:
+        timers.remove(handle)
+        _every(loop, timers, seconds, action)
+        action()
+
+    handle = loop.call_later(seconds, on_timer)
+    timers.append(handle)
+
+
+class HyperLogLog:
+    """HyperLogLog sketch for approximate distinct counting.
+
+    Uses 2^precision one-byte registers, and has a relative standard
+    error of about 1.04 / sqrt(2^precision), e.g. 0.8% in 16 KiB for
+    the default precision of 14.
+    """
+
+    __slots__ = ("precision", "_registers")
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("Precision must be between 4 and 18.")
+
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        """Add a value to the sketch."""
+        h = _hash64(value)
+        bits = 64 - self.precision
+        index = h >> bits
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, values: Iterable[Any]) -> None:
+        """Add the values to the sketch.
+
+        NumPy numeric arrays are hashed and added vectorised.
+        """
+        if not _is_numeric_array(values):
+            for value in values:
+                self.add(value)
+            return
+
+        import numpy
+
+        bits = 64 - self.precision
+        h = _hash64_array(values)
+        index = (h >> numpy.uint64(bits)).astype(numpy.intp)
+        w = h & numpy.uint64((1 << bits) - 1)
+
+        # Bit length in two halves, as float64 cannot hold 64-bit ints
+        hi = (w >> numpy.uint64(32)).astype(numpy.float64)
+        lo = (w & numpy.uint64(0xFFFFFFFF)).astype(numpy.float64)
+        length = numpy.where(hi > 0, numpy.frexp(hi)[1] + 32, numpy.frexp(lo)[1])
+        rank = (bits + 1 - length).astype(numpy.uint8)
+
+        registers = numpy.frombuffer(self._registers, dtype=numpy.uint8)
+        numpy.maximum.at(registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merge another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision.")
+
+        self._registers = bytearray(
+            a if a > b else b for a, b in zip(self._registers, other._registers)
+        )
+
+    def copy(self) -> "HyperLogLog":
+        """Return a copy of the sketch."""
+        sketch = HyperLogLog(self.precision)
+        sketch._registers[:] = self._registers
+        return sketch
+
+    def __or__(self, other: "HyperLogLog") -> "HyperLogLog":
+        sketch = self.copy()
+        sketch.merge(other)
+        return sketch
+
+    def estimate(self) -> float:
+        """Return the estimated number of distinct values."""
+        m = len(self._registers)
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+
+        estimate = alpha * m * m / sum(2.0**-r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return estimate
+
+    def __repr__(self) -> str:
+        return (
+            f"HyperLogLog(precision={self.precision}, estimate={self.estimate():.0f})"
+        )
+
+
+def count_distinct_approx(
+    precision: int = 14,
+    emit_every: Optional[float] = None,
+    key_selector: Optional[Callable[[_TSource], Any]] = None,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[float]]:
+    """Count distinct values approximately.
+
+    Counts the distinct values, or keys, of the source with a
+    `HyperLogLog` sketch, using a fixed amount of memory however many
+    distinct values there are. The estimate is emitted every
+    `emit_every` seconds if given, and when the source completes.
+    Values that are NumPy arrays, e.g. batches from `map_batch` with
+    `output="arrays"`, are added as batches of values, with vectorised
+    hashing for numeric arrays.
+
+    For windowed or partitioned counts, use `HyperLogLog` directly and
+    merge the sketches of the windows or partitions.
+
+    Example:
+        >>> ys = pipe(visitor_ids, count_distinct_approx(emit_every=60.0))
+
+    Args:
+        precision: Number of index bits of the sketch. The relative
+            error is about 1.04 / sqrt(2^precision).
+        emit_every: Optional interval in seconds between estimates.
+        key_selector: Optional function that returns the key to count
+            for each value.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of estimates.
+    """
+    if not 4 <= precision <= 18:
+        raise ValueError("Precision must be between 4 and 18.")
+
+    def _count_distinct_approx(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncObservable[float]:
+        async def subscribe_async(aobv: AsyncObserver[float]) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+            sketch = HyperLogLog(precision)
+            timers: List[asyncio.TimerHandle] = []
+
+            def emit() -> None:
+                aiotools.start(safe_obv.asend(sketch.estimate()))
+
+            def stop() -> None:
+                for handle in timers:
+                    handle.cancel()
+                timers.clear()
+
+            async def asend(value: _TSource) -> None:
+                try:
+                    key = value if key_selector is None else key_selector(value)
+                    if _is_numeric_array(key):
+                        sketch.update(cast(Iterable[Any], key))
+                    elif getattr(key, "ndim", 0) == 1:
+                        sketch.update(cast(Any, key).tolist())
+                    else:
+                        sketch.add(key)
+                except Exception as err:
+                    await athrow(err)
+
+            async def athrow(error: Exception) -> None:
+                stop()
+                await safe_obv.athrow(error)
+
+            async def aclose() -> None:
+                stop()
+                await safe_obv.asend(sketch.estimate())
+                await safe_obv.aclose()
+
+            if emit_every is not None:
+                _every(loop, timers, emit_every, emit)
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            dispose = await auto_detach(source.subscribe_async(obv))
+
+            async def cancel() -> None:
+                stop()
+                await dispose.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _count_distinct_approx
+
+
+class BloomFilter:
+    """Bloom filter for approximate set membership.
+
+    Sized for `capacity` keys at a false positive rate of
+    `error_rate`. Keys that were added are always reported as present,
+    while keys that were not are wrongly reported as present with
+    probability `error_rate`, rising once more than `capacity` keys
+    have been added.
+    """
+
+    __slots__ = ("capacity", "error_rate", "count", "_bits", "_num_bits", "_num_hashes")
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity must be positive.")
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError("Error rate must be between 0 and 1.")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count = 0
+        self._num_bits = builtins.max(
+            8, int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self._num_hashes = builtins.max(
+            1, round(self._num_bits / capacity * math.log(2))
+        )
+        self._bits = bytearray((self._num_bits + 7) // 8)
+
+    def _indexes(self, key: Any) -> Iterator[int]:
+        h = _hash64(key)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        for i in range(self._num_hashes):
+            yield (h1 + i * h2) % self._num_bits
+
+    def add(self, key: Any) -> bool:
+        """Add the key, and return true if it was possibly present."""
+        bits = self._bits
+        present = True
+        for index in self._indexes(key):
+            byte, mask = index >> 3, 1 << (index & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    def __contains__(self, key: Any) -> bool:
+        bits = self._bits
+        return all(
+            bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(key)
+        )
+
+    def merge(self, other: "BloomFilter") -> None:
+        """Merge another filter of the same size into this one."""
+        if (other._num_bits, other._num_hashes) != (self._num_bits, self._num_hashes):
+            raise ValueError("Cannot merge filters of different sizes.")
+
+        self._bits = bytearray(a | b for a, b in zip(self._bits, other._bits))
+        self.count += other.count
+
+    def clear(self) -> None:
+        """Remove all keys from the filter."""
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+    def __repr__(self) -> str:
+        return f"BloomFilter(capacity={self.capacity}, error_rate={self.error_rate}, count={self.count})"
+
+
+class CountMinSketch:
+    """Count-min sketch for approximate frequencies.
+
+    Keeps `depth` rows of `width` counters. Estimates never undercount,
+    and overcount by at most e / width of the total count with
+    probability 1 - exp(-depth).
+    """
+
+    __slots__ = ("width", "depth", "total", "_table")
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        if width < 1 or depth < 1:
+            raise ValueError("Width and depth must be positive.")
+
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._table = array("q", bytes(8 * width * depth))
+
+    def _indexes(self, key: Any) -> Iterator[int]:
+        # Double hashing derives the row hashes from one 64-bit hash
+        h = _hash64(key)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        for row in range(self.depth):
+            yield row * self.width + (h1 + row * h2) % self.width
+
+    def add(self, key: Any, count: int = 1) -> int:
+        """Add the count of the key and return its new estimate."""
+        table = self._table
+        estimate = None
+        for index in self._indexes(key):
+            table[index] += count
+            if estimate is None or table[index] < estimate:
+                estimate = table[index]
+        self.total += count
+        return cast(int, estimate)
+
+    def estimate(self, key: Any) -> int:
+        """Return the estimated count of the key."""
+        return builtins.min(self._table[index] for index in self._indexes(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """Merge another sketch of the same dimensions into this one."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge sketches of different dimensions.")
+
+        self._table = array("q", [a + b for a, b in zip(self._table, other._table)])
+        self.total += other.total
+
+    def clear(self) -> None:
+        """Reset all counts to zero."""
+        self._table = array("q", bytes(8 * self.width * self.depth))
+        self.total = 0
+
+    def __repr__(self) -> str:
+        return f"CountMinSketch(width={self.width}, depth={self.depth}, total={self.total})"
+
+
+class _TopK(Generic[_TKey]):
+    """The k keys with the highest estimated counts.
+
+    Holds a dict of the current top keys and a min-heap of (count,
+    sequence, key) entries. Entries are pushed when a count changes
+    instead of updating the heap in place, and stale entries are
+    skipped when popped and compacted when the heap grows too large.
+    """
+
+    __slots__ = ("k", "counts", "_heap", "_seq")
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self.counts: Dict[_TKey, int] = {}
+        self._heap: List[Tuple[int, int, _TKey]] = []
+        self._seq = itertools.count()
+
+    def _push(self, key: _TKey, count: int) -> None:
+        self.counts[key] = count
+        heapq.heappush(self._heap, (count, next(self._seq), key))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(c, next(self._seq), key) for key, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _min(self) -> Tuple[int, _TKey]:
+        heap, counts = self._heap, self.counts
+        while True:
+            count, _, key = heap[0]
+            if counts.get(key) == count:
+                return count, key
+            heapq.heappop(heap)
+
+    def offer(self, key: _TKey, count: int) -> None:
+        if key in self.counts or len(self.counts) < self.k:
+            self._push(key, count)
+            return
+
+        min_count, min_key = self._min()
+        if count > min_count:
+            heapq.heappop(self._heap)
+            del self.counts[min_key]
+            self._push(key, count)
+
+    def items(self) -> List[Tuple[_TKey, int]]:
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+
+    def clear(self) -> None:
+        self.counts.clear()
+        self._heap.clear()
+
+
+def top_k(
+    k: int,
+    key_selector: Optional[Callable[[_TSource], _TKey]] = None,
+    window: Optional[float] = None,
+    emit_every: Optional[float] = None,
+    width: int = 2048,
+    depth: int = 4,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[List[Tuple[_TKey, int]]]]:
+    """Top-k most frequent keys.
+
+    Estimates the frequency of each key of the source with a
+    `CountMinSketch`, and keeps the `k` keys with the highest estimates
+    in a heap, so memory stays constant however many distinct keys
+    there are. Emits a list of `(key, count)` tuples, most frequent
+    first.
+
+    Counts are kept over the whole source by default, or over tumbling
+    windows of `window` seconds where the counts are reset after the
+    top keys of each window are emitted. The current top keys are also
+    emitted every `emit_every` seconds if given, and when the source
+    completes.
+
+    Example:
+        >>> hot = pipe(requests, top_k(10, lambda r: r.path, window=60.0))
+
+    Args:
+        k: Number of keys to keep.
+        key_selector: Optional function that returns the key of each
+            value. Defaults to the value itself.
+        window: Optional duration in seconds of tumbling windows.
+        emit_every: Optional interval in seconds between updates.
+        width: Number of counters per row of the sketch.
+        depth: Number of rows of the sketch.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of top-k lists.
+    """
+    if k < 1:
+        raise ValueError("K must be positive.")
+    if width < 1 or depth < 1:
+        raise ValueError("Width and depth must be positive.")
+
+    def _top_k(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncObservable[List[Tuple[_TKey, int]]]:
+        async def subscribe_async(
+            aobv: AsyncObserver[List[Tuple[_TKey, int]]]
+        ) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+            sketch = CountMinSketch(width, depth)
+            top: _TopK[_TKey] = _TopK(k)
+            timers: List[asyncio.TimerHandle] = []
+
+            def emit() -> None:
+                aiotools.start(safe_obv.asend(top.items()))
+
+            def reset() -> None:
+                emit()
+                sketch.clear()
+                top.clear()
+
+            def stop() -> None:
+                for handle in timers:
+                    handle.cancel()
+                timers.clear()
+
+            async def asend(value: _TSource) -> None:
+                try:
+                    key = (
+                        cast(_TKey, value)
+                        if key_selector is None
+                        else key_selector(value)
+                    )
+                    top.offer(key, sketch.add(key))
+                except Exception as err:
+                    await athrow(err)
+
+            async def athrow(error: Exception) -> None:
+                stop()
+                await safe_obv.athrow(error)
+
+            async def aclose() -> None:
+                stop()
+                await safe_obv.asend(top.items())
+                await safe_obv.aclose()
+
+            if emit_every is not None:
+                _every(loop, timers, emit_every, emit)
+            if window is not None:
+                _every(loop, timers, window, reset)
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            dispose = await auto_detach(source.subscribe_async(obv))
+
+            async def cancel() -> None:
+                stop()
+                await dispose.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _top_k
+
+
+class KLL:
+    """KLL sketch for approximate quantiles.
+
+    Keeps a hierarchy of compactors, where the items of level h each
+    stand for 2^h values. When a level is full it is sorted and every
+    other item, starting at a random offset, is promoted to the next
+    level. Capacities shrink geometrically with depth, so the sketch
+    keeps O(k) items and has a rank error of about 1.7 / k.
+    """
+
+    __slots__ = ("k", "count", "_levels", "_size", "_max_size", "_random")
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError("K must be at least 8.")
+
+        self.k = k
+        self.count = 0
+        self._levels: List[List[float]] = []
+        self._size = 0
+        self._max_size = 0
+        self._random = random.Random(seed)
+        self._grow()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return int(math.ceil(self.k * (2.0 / 3.0) ** depth)) + 1
+
+    def _grow(self) -> None:
+        self._levels.append([])
+        self._max_size = sum(
+            self._capacity(level) for level in range(len(self._levels))
+        )
+
+    def _compress(self) -> None:
+        for level in range(len(self._levels)):
+            items = self._levels[level]
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self._levels):
+                self._grow()
+
+            items.sort()
+            # Keep the odd item out at this level
+            last = items.pop() if len(items) % 2 else None
+            offset = self._random.getrandbits(1)
+            self._levels[level + 1].extend(items[offset::2])
+            items.clear()
+            if last is not None:
+                items.append(last)
+
+            self._size = sum(len(items) for items in self._levels)
+            if self._size < self._max_size:
+                break
+
+    def add(self, value: float) -> None:
+        """Add a value to the sketch."""
+        self._levels[0].append(value)
+        self._size += 1
+        self.count += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        """Add a batch of values to the sketch.
+
+        The values are appended at once and the sketch is compacted
+        afterwards, which is cheaper than adding them one by one.
+        """
+        level = self._levels[0]
+        before = len(level)
+        level.extend(values)
+        added = len(level) - before
+        self._size += added
+        self.count += added
+        while self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLL") -> None:
+        """Merge another sketch into this one."""
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+
+        self.count += other.count
+        self._size = sum(len(items) for items in self._levels)
+        while self._size >= self._max_size:
+            self._compress()
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Return the estimated quantiles of the values.
+
+        Args:
+            qs: The quantiles to estimate, between 0 and 1.
+
+        Returns:
+            The estimated value of each quantile.
+        """
+        if not self.count:
+            raise ValueError("Cannot estimate quantiles of an empty sketch.")
+
+        weighted = sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self._levels)
+            for value in items
+        )
+        cumulative = list(itertools.accumulate(weight for _, weight in weighted))
+        total = cumulative[-1]
+
+        result: List[float] = []
+        for q in qs:
+            index = bisect.bisect_left(cumulative, q * total)
+            result.append(weighted[builtins.min(index, len(weighted) - 1)][0])
+        return result
+
+    def clear(self) -> None:
+        """Remove all values from the sketch."""
+        self.count = 0
+        self._levels = []
+        self._size = self._max_size = 0
+        self._grow()
+
+    def __repr__(self) -> str:
+        return f"KLL(k={self.k}, count={self.count})"
+
+
+def quantiles(
+    qs: Sequence[float] = (0.5, 0.95, 0.99),
+    window: Optional[float] = None,
+    emit_every: Optional[float] = None,
+    k: int = 200,
+) -> Callable[[AsyncObservable[Any]], AsyncObservable[Tuple[float, ...]]]:
+    """Streaming quantiles.
+
+    Estimates quantiles of a numeric source with a `KLL` sketch in
+    bounded memory. Emits a tuple with the estimate of each quantile
+    of `qs`, in order.
+
+    Quantiles are estimated over the whole source by default, or over
+    tumbling windows of `window` seconds where the sketch is reset
+    after the estimates of each window are emitted. Estimates are also
+    emitted every `emit_every` seconds if given, and when the source
+    completes, unless no values have been seen. Values that are NumPy
+    arrays, e.g. batches from `map_batch` with `output="arrays"`, are
+    added as a batch.
+
+    Example:
+        >>> ys = pipe(latencies, quantiles((0.5, 0.99), window=60.0))
+
+    Args:
+        qs: The quantiles to estimate, between 0 and 1.
+        window: Optional duration in seconds of tumbling windows.
+        emit_every: Optional interval in seconds between estimates.
+        k: Accuracy parameter of the sketch. The rank error is about
+            1.7 / k.
+
+    Returns:
+        A partially applied function that takes the source observable
+        and returns an observable of quantile estimates.
+    """
+    if k < 8:
+        raise ValueError("K must be at least 8.")
+    for q in qs:
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("Quantiles must be between 0 and 1.")
+
+    def _quantiles(source: AsyncObservable[Any]) -> AsyncObservable[Tuple[float, ...]]:
+        async def subscribe_async(
+            aobv: AsyncObserver[Tuple[float, ...]]
+        ) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+            sketch = KLL(k)
+            timers: List[asyncio.TimerHandle] = []
+
+            def estimates() -> Tuple[float, ...]:
+                return tuple(sketch.quantiles(qs))
+
+            def emit() -> None:
+                if sketch.count:
+                    aiotools.start(safe_obv.asend(estimates()))
+
+            def reset() -> None:
+                emit()
+                sketch.clear()
+
+            def stop() -> None:
+                for handle in timers:
+                    handle.cancel()
+                timers.clear()
+
+            async def asend(value: Any) -> None:
+                try:
+                    if getattr(value, "ndim", 0) == 1:
+                        sketch.update(value.tolist())
+                    else:
+                        sketch.add(float(value))
+                except Exception as err:
+                    await athrow(err)
+
+            async def athrow(error: Exception) -> None:
+                stop()
+                await safe_obv.athrow(error)
+
+            async def aclose() -> None:
+                stop()
+                if sketch.count:
+                    await safe_obv.asend(estimates())
+                await safe_obv.aclose()
+
+            if emit_every is not None:
+                _every(loop, timers, emit_every, emit)
+            if window is not None:
+                _every(loop, timers, window, reset)
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            dispose = await auto_detach(source.subscribe_async(obv))
+
+            async def cancel() -> None:
+                stop()
+                await dispose.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _quantiles
+
+
+__all__ = [
+    "BloomFilter",
+    "CountMinSketch",
+    "HyperLogLog",
+    "KLL",
+    "count_distinct_approx",
+    "quantiles",
+    "top_k",
+]
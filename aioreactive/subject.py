@@ -1,16 +1,25 @@
+import asyncio
+import itertools
 import logging
 from asyncio import Future
-from typing import List, Optional, TypeVar, Union
+from collections import deque
+from typing import Deque, Dict, Generic, List, Optional, Tuple, TypeVar, Union
 
 from expression.system import AsyncDisposable, ObjectDisposedException
 
-from .observables import AsyncAnonymousObserver, AsyncObservable
+from .observables import (
+    AsyncAnonymousObservable,
+    AsyncAnonymousObserver,
+    AsyncObservable,
+)
 from .types import AsyncObserver, CloseAsync, SendAsync, ThrowAsync
 
 log = logging.getLogger(__name__)
 
 _TSource = TypeVar("_TSource")
 
+_Snapshot = Tuple[Tuple[int, AsyncObserver[_TSource]], ...]
+
 
 class AsyncSingleSubject(
     AsyncObserver[_TSource], AsyncObservable[_TSource], AsyncDisposable
@@ -110,11 +119,30 @@ class AsyncMultiSubject(
 
     The AsyncMultiStream is "hot" in the sense that it will drop events
     if there are currently no subscribed observers.
+
+    By default events are forwarded to one observer at a time, so the
+    latency of a send is the sum of the latencies of the observers. With
+    `concurrent=True` the observers are awaited concurrently instead.
+    If a `timeout` (in seconds) is given, an observer that does not
+    process an event within the timeout is unsubscribed and receives
+    an `asyncio.TimeoutError`.
+
+    The observers are registered in an insertion ordered dict keyed by
+    a subscription token, so subscribing and disposing are O(1). Sends
+    iterate an immutable snapshot of the registry that is only rebuilt
+    after the registry has changed, which makes emission safe against
+    (un)subscriptions without copying the registry for every send.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self, concurrent: bool = False, timeout: Optional[float] = None
+    ) -> None:
         super().__init__()
-        self._observers: List[AsyncObserver[_TSource]] = []
+        self._observers: Dict[int, AsyncObserver[_TSource]] = {}
+        self._snapshot: Optional[_Snapshot[_TSource]] = None
+        self._tokens = itertools.count()
+        self._concurrent = concurrent
+        self._timeout = timeout
         self._is_disposed = False
         self._is_stopped = False
 
@@ -122,14 +150,41 @@ class AsyncMultiSubject(
         if self._is_disposed:
             raise ObjectDisposedException()
 
+    def _get_observers(self) -> _Snapshot[_TSource]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = tuple(self._observers.items())
+        return snapshot
+
+    def _remove(self, token: int) -> None:
+        if self._observers.pop(token, None) is not None:
+            self._snapshot = None
+
+    async def _send(
+        self, token: int, observer: AsyncObserver[_TSource], value: _TSource
+    ) -> None:
+        try:
+            await asyncio.wait_for(observer.asend(value), self._timeout)
+        except asyncio.TimeoutError as err:
+            log.warning("AsyncMultiStream:asend(), observer timed out.")
+            self._remove(token)
+            await observer.athrow(err)
+
     async def asend(self, value: _TSource) -> None:
         self.check_disposed()
 
         if self._is_stopped:
             return
 
-        for obv in list(self._observers):
-            await obv.asend(value)
+        observers = self._get_observers()
+        if self._concurrent:
+            await asyncio.gather(*[self._send(*item, value) for item in observers])
+        elif self._timeout is None:
+            for _, obv in observers:
+                await obv.asend(value)
+        else:
+            for token, obv in observers:
+                await self._send(token, obv, value)
 
     async def athrow(self, error: Exception) -> None:
         self.check_disposed()
@@ -138,8 +193,12 @@ class AsyncMultiSubject(
             return
         self._is_stopped = True
 
-        for obv in list(self._observers):
-            await obv.athrow(error)
+        observers = self._get_observers()
+        if self._concurrent:
+            await asyncio.gather(*[obv.athrow(error) for _, obv in observers])
+        else:
+            for _, obv in observers:
+                await obv.athrow(error)
 
     async def aclose(self) -> None:
         self.check_disposed()
@@ -148,8 +207,12 @@ class AsyncMultiSubject(
             return
         self._is_stopped = True
 
-        for obv in list(self._observers):
-            await obv.aclose()
+        observers = self._get_observers()
+        if self._concurrent:
+            await asyncio.gather(*[obv.aclose() for _, obv in observers])
+        else:
+            for _, obv in observers:
+                await obv.aclose()
 
     async def subscribe_async(
         self,
@@ -167,12 +230,13 @@ class AsyncMultiSubject(
             if isinstance(send, AsyncObserver)
             else AsyncAnonymousObserver(send, throw, close)
         )
-        self._observers.append(observer)
+        token = next(self._tokens)
+        self._observers[token] = observer
+        self._snapshot = None
 
         async def dispose() -> None:
             log.debug("AsyncMultiStream:dispose()")
-            if observer in self._observers:
-                self._observers.remove(observer)
+            self._remove(token)
 
         return AsyncDisposable.create(dispose)
 
@@ -180,5 +244,353 @@ class AsyncMultiSubject(
         self._is_disposed = True
 
 
+class AsyncBehaviorSubject(AsyncMultiSubject[_TSource]):
+    """A stream that holds a current value.
+
+    The subject starts with an initial value, and the value is updated
+    by every `asend`. New observers receive the current value as soon
+    as they subscribe, followed by any later values. The current value
+    can also be read without subscribing using the `value` property.
+
+    If the subject has stopped, new observers receive the error, or
+    just the completion, instead of the current value.
+    """
+
+    def __init__(
+        self,
+        initial: _TSource,
+        concurrent: bool = False,
+        timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(concurrent, timeout)
+        self._value = initial
+        self._version = 0
+        self._error: Optional[Exception] = None
+
+    @property
+    def value(self) -> _TSource:
+        """The current value.
+
+        Raises the error if the subject has stopped with an error.
+        """
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    async def asend(self, value: _TSource) -> None:
+        self.check_disposed()
+
+        if self._is_stopped:
+            return
+
+        self._value = value
+        self._version += 1
+        await super().asend(value)
+
+    async def athrow(self, error: Exception) -> None:
+        if not self._is_stopped:
+            self._error = error
+        await super().athrow(error)
+
+    async def subscribe_async(
+        self,
+        send: Optional[Union[SendAsync[_TSource], AsyncObserver[_TSource]]] = None,
+        throw: Optional[ThrowAsync] = None,
+        close: Optional[CloseAsync] = None,
+    ) -> AsyncDisposable:
+        """Subscribe and send the current value."""
+
+        log.debug("AsyncBehaviorSubject:subscribe_async()")
+        self.check_disposed()
+
+        observer = (
+            send
+            if isinstance(send, AsyncObserver)
+            else AsyncAnonymousObserver(send, throw, close)
+        )
+
+        # Resend if the value changed while the observer was busy
+        version = -1
+        while version != self._version and not self._is_stopped:
+            version = self._version
+            await observer.asend(self._value)
+
+        if self._is_stopped:
+            if self._error is not None:
+                await observer.athrow(self._error)
+            else:
+                await observer.aclose()
+            return AsyncDisposable.empty()
+
+        return await super().subscribe_async(observer)
+
+
+class AsyncReplaySubject(AsyncMultiSubject[_TSource]):
+    """A stream that replays recent values to new observers.
+
+    Values are kept in a ring buffer of at most `buffer_size` values,
+    and values older than `window` seconds are evicted from the front of
+    the buffer, so both appending and evicting are O(1). A new observer
+    first receives the buffered values, and then the terminal
+    notification if the subject has stopped.
+
+    Values sent while a new observer is being replayed to are replayed
+    as well before the observer is registered, so the observer neither
+    misses nor duplicates values.
+    """
+
+    def __init__(
+        self,
+        buffer_size: Optional[int] = None,
+        window: Optional[float] = None,
+        concurrent: bool = False,
+        timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(concurrent, timeout)
+        if buffer_size is not None and buffer_size < 0:
+            raise ValueError("Buffer size must not be negative.")
+
+        self._buffer: Deque[Tuple[float, _TSource]] = deque(maxlen=buffer_size)
+        self._window = window
+        self._sent = 0  # Total number of values added to the buffer
+        self._error: Optional[Exception] = None
+
+    def _now(self) -> float:
+        return asyncio.get_event_loop().time() if self._window is not None else 0.0
+
+    def _trim(self, now: float) -> None:
+        if self._window is None:
+            return
+
+        buffer, horizon = self._buffer, now - self._window
+        while buffer and buffer[0][0] < horizon:
+            buffer.popleft()
+
+    async def asend(self, value: _TSource) -> None:
+        self.check_disposed()
+
+        if self._is_stopped:
+            return
+
+        now = self._now()
+        self._buffer.append((now, value))
+        self._sent += 1
+        self._trim(now)
+
+        await super().asend(value)
+
+    async def athrow(self, error: Exception) -> None:
+        if not self._is_stopped:
+            self._error = error
+        await super().athrow(error)
+
+    async def subscribe_async(
+        self,
+        send: Optional[Union[SendAsync[_TSource], AsyncObserver[_TSource]]] = None,
+        throw: Optional[ThrowAsync] = None,
+        close: Optional[CloseAsync] = None,
+    ) -> AsyncDisposable:
+        """Subscribe and replay the buffered values."""
+
+        log.debug("AsyncReplaySubject:subscribe_async()")
+        self.check_disposed()
+
+        observer = (
+            send
+            if isinstance(send, AsyncObserver)
+            else AsyncAnonymousObserver(send, throw, close)
+        )
+
+        self._trim(self._now())
+        buffer = self._buffer
+        seq = self._sent - len(buffer)
+        while seq < self._sent:
+            # Copy the values not yet replayed once per round, as indexing
+            # a deque is O(n). Values sent while replaying are caught up
+            # in the next round, skipping any that were evicted.
+            first = self._sent - len(buffer)
+            seq = max(seq, first)
+            values = [value for _, value in itertools.islice(buffer, seq - first, None)]
+            for value in values:
+                seq += 1
+                await observer.asend(value)
+
+        if self._is_stopped:
+            if self._error is not None:
+                await observer.athrow(self._error)
+            else:
+                await observer.aclose()
+            return AsyncDisposable.empty()
+
+        # No awaits between catching up and registering the observer
+        return await super().subscribe_async(observer)
+
+
+class _TopicNode(Generic[_TSource]):
+    """Trie node holding the prefix subscriptions for the path leading
+    to the node."""
+
+    __slots__ = ("children", "observers")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TopicNode[_TSource]] = {}
+        self.observers: Dict[int, AsyncObserver[_TSource]] = {}
+
+
+class AsyncTopicSubject(AsyncObservable[_TSource], AsyncDisposable):
+    """A stream that routes values to observers by topic.
+
+    Observers subscribe to a single topic using
+    `subscribe_async(observer, topic="sensors/temp")`. A topic ending
+    with `*` is a prefix subscription, e.g `"sensors/*"` matches every
+    topic starting with `"sensors/"`, and `"*"` (the default) matches
+    all topics.
+
+    `asend(topic, value)` looks up the exact topic in a dict and walks a
+    trie of prefix subscriptions along the topic. The cost of a send
+    thus depends on the number of matching observers and the length of
+    the topic, not on the total number of observers. Errors and
+    completion are forwarded to all observers.
+
+    The AsyncTopicSubject is "hot" in the sense that values for topics
+    without any observers are dropped.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._exact: Dict[str, Dict[int, AsyncObserver[_TSource]]] = {}
+        self._prefixes: _TopicNode[_TSource] = _TopicNode()
+        self._tokens = itertools.count()
+        self._is_disposed = False
+        self._is_stopped = False
+
+    def check_disposed(self) -> None:
+        if self._is_disposed:
+            raise ObjectDisposedException()
+
+    def _match(self, topic: str) -> List[AsyncObserver[_TSource]]:
+        observers: List[AsyncObserver[_TSource]] = []
+
+        exact = self._exact.get(topic)
+        if exact:
+            observers.extend(exact.values())
+
+        node = self._prefixes
+        for char in topic:
+            if node.observers:
+                observers.extend(node.observers.values())
+            child = node.children.get(char)
+            if child is None:
+                break
+            node = child
+        else:
+            observers.extend(node.observers.values())
+
+        return observers
+
+    def _all(self) -> List[AsyncObserver[_TSource]]:
+        observers: List[AsyncObserver[_TSource]] = []
+        for bucket in self._exact.values():
+            observers.extend(bucket.values())
+
+        nodes = [self._prefixes]
+        while nodes:
+            node = nodes.pop()
+            observers.extend(node.observers.values())
+            nodes.extend(node.children.values())
+
+        return observers
+
+    async def asend(self, topic: str, value: _TSource) -> None:
+        self.check_disposed()
+
+        if self._is_stopped:
+            return
+
+        for obv in self._match(topic):
+            await obv.asend(value)
+
+    async def athrow(self, error: Exception) -> None:
+        self.check_disposed()
+
+        if self._is_stopped:
+            return
+        self._is_stopped = True
+
+        for obv in self._all():
+            await obv.athrow(error)
+
+    async def aclose(self) -> None:
+        self.check_disposed()
+
+        if self._is_stopped:
+            return
+        self._is_stopped = True
+
+        for obv in self._all():
+            await obv.aclose()
+
+    async def subscribe_async(
+        self,
+        send: Optional[Union[SendAsync[_TSource], AsyncObserver[_TSource]]] = None,
+        throw: Optional[ThrowAsync] = None,
+        close: Optional[CloseAsync] = None,
+        topic: str = "*",
+    ) -> AsyncDisposable:
+        """Subscribe to the given topic."""
+
+        log.debug("AsyncTopicSubject:subscribe_async(%s)", topic)
+        self.check_disposed()
+
+        observer = (
+            send
+            if isinstance(send, AsyncObserver)
+            else AsyncAnonymousObserver(send, throw, close)
+        )
+        token = next(self._tokens)
+
+        if not topic.endswith("*"):
+            self._exact.setdefault(topic, {})[token] = observer
+
+            async def dispose_exact() -> None:
+                bucket = self._exact.get(topic)
+                if bucket is not None and bucket.pop(token, None) is not None:
+                    if not bucket:
+                        del self._exact[topic]
+
+            return AsyncDisposable.create(dispose_exact)
+
+        prefix = topic[:-1]
+        path = [self._prefixes]
+        for char in prefix:
+            path.append(path[-1].children.setdefault(char, _TopicNode()))
+        path[-1].observers[token] = observer
+
+        async def dispose_prefix() -> None:
+            if path[-1].observers.pop(token, None) is None:
+                return
+
+            # Prune nodes that no longer lead to any subscriptions
+            for index in range(len(prefix), 0, -1):
+                node, parent = path[index], path[index - 1]
+                if node.observers or node.children:
+                    break
+                if parent.children.get(prefix[index - 1]) is node:
+                    del parent.children[prefix[index - 1]]
+
+        return AsyncDisposable.create(dispose_prefix)
+
+    def topic(self, topic: str) -> AsyncObservable[_TSource]:
+        """Returns an observable for the given topic."""
+
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            return await self.subscribe_async(aobv, topic=topic)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    async def dispose_async(self) -> None:
+        self._is_disposed = True
+
+
 # Alias
 AsyncSubject = AsyncMultiSubject
@@ -1,7 +1,19 @@
 import asyncio
+import heapq
+import itertools
 import logging
 from datetime import datetime, timedelta
-from typing import Callable, Iterable, NoReturn, Tuple, TypeVar
+from typing import (
+    Callable,
+    Iterable,
+    List,
+    Literal,
+    NoReturn,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 from expression import curry_flipped
 from expression.collections import seq
@@ -10,19 +22,19 @@ from expression.core import (
     TailCall,
     TailCallResult,
     aiotools,
-    fst,
     match,
     pipe,
     tailrec_async,
 )
 from expression.system import CancellationTokenSource
 
-from .combine import with_latest_from
-from .create import interval
 from .notification import Notification, OnCompleted, OnError, OnNext
 from .observables import AsyncAnonymousObservable
-from .observers import AsyncNotificationObserver, auto_detach_observer
-from .transform import map
+from .observers import (
+    AsyncAnonymousObserver,
+    AsyncNotificationObserver,
+    auto_detach_observer,
+)
 from .types import AsyncDisposable, AsyncObservable, AsyncObserver
 
 _TSource = TypeVar("_TSource")
@@ -169,17 +181,385 @@ def debounce(
 def sample(
     seconds: float,
 ) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Sample observable stream.
+
+    Emits the most recent value from the source stream at the end of
+    each sampling period. Periods where the source did not produce a new
+    value are skipped, so a stale value is never emitted twice.
+
+    Example:
+        >>> ys = pipe(xs, sample(0.1)) # At most 10 values per second
+
+    Args:
+        seconds: Length of the sampling period in seconds.
+
+    Returns:
+        A partially applied sample function that takes the source
+        observable to sample.
+    """
+
     def _sample(source: AsyncObservable[_TSource]) -> AsyncObservable[_TSource]:
-        timer = interval(seconds, seconds)
+        if seconds <= 0:
+            return source
+
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            cts = CancellationTokenSource()
+            loop = asyncio.get_event_loop()
+
+            latest: _TSource = cast(_TSource, None)
+            has_value = False
+
+            async def ticker() -> None:
+                nonlocal has_value
+
+                due = loop.time()
+                while True:
+                    # Schedule against the loop clock to avoid drift.
+                    due += seconds
+                    await asyncio.sleep(due - loop.time())
+                    if has_value:
+                        has_value = False
+                        await safe_obv.asend(latest)
+
+            async def asend(value: _TSource) -> None:
+                nonlocal latest, has_value
+                latest, has_value = value, True
+
+            async def athrow(error: Exception) -> None:
+                cts.cancel()
+                await safe_obv.athrow(error)
 
-        if seconds > 0:
-            ret = pipe(
-                source,
-                with_latest_from(timer),
-                map(fst),
-            )
-            return ret
+            async def aclose() -> None:
+                cts.cancel()
+                await safe_obv.aclose()
 
-        return source
+            aiotools.start(ticker(), cts.token)
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            dispose = await pipe(obv, source.subscribe_async, auto_detach)
+
+            async def cancel() -> None:
+                cts.cancel()
+                await dispose.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
 
     return _sample
+
+
+def throttle_first(
+    seconds: float,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Throttle first.
+
+    Emits a value from the source stream, then ignores subsequent values
+    for the given duration. The first value of every period is
+    forwarded immediately. No timer is needed since the period is
+    checked against the loop clock when a value arrives.
+
+    Example:
+        >>> ys = pipe(xs, throttle_first(0.5))
+
+    Args:
+        seconds: Duration of the throttle period in seconds.
+
+    Returns:
+        A partially applied throttle function that takes the source
+        observable to throttle.
+    """
+
+    def _throttle_first(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncObservable[_TSource]:
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+            period_end = float("-inf")
+
+            async def asend(value: _TSource) -> None:
+                nonlocal period_end
+
+                now = loop.time()
+                if now >= period_end:
+                    period_end = now + seconds
+                    await safe_obv.asend(value)
+
+            obv = AsyncAnonymousObserver(asend, safe_obv.athrow, safe_obv.aclose)
+            return await pipe(obv, source.subscribe_async, auto_detach)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _throttle_first
+
+
+def throttle_latest(
+    seconds: float,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Throttle latest.
+
+    Emits a value from the source stream immediately and then starts a
+    throttle period. The latest value received during the period is
+    emitted when the period ends, which starts a new period. A period
+    that ends without any new values makes the operator idle again.
+
+    A pending value is emitted before the stream completes.
+
+    Example:
+        >>> ys = pipe(xs, throttle_latest(0.5))
+
+    Args:
+        seconds: Duration of the throttle period in seconds.
+
+    Returns:
+        A partially applied throttle function that takes the source
+        observable to throttle.
+    """
+
+    def _throttle_latest(
+        source: AsyncObservable[_TSource],
+    ) -> AsyncObservable[_TSource]:
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+
+            timer: Optional[asyncio.TimerHandle] = None
+            latest: _TSource = cast(_TSource, None)
+            has_value = False
+            is_stopped = False
+
+            async def flush() -> None:
+                nonlocal timer, has_value
+
+                if is_stopped:
+                    return
+
+                if has_value:
+                    has_value = False
+                    timer = loop.call_later(seconds, on_timer)
+                    await safe_obv.asend(latest)
+                else:
+                    timer = None
+
+            def on_timer() -> None:
+                aiotools.start(flush())
+
+            def stop() -> None:
+                nonlocal is_stopped
+                is_stopped = True
+                if timer is not None:
+                    timer.cancel()
+
+            async def asend(value: _TSource) -> None:
+                nonlocal timer, latest, has_value
+
+                if timer is None:
+                    timer = loop.call_later(seconds, on_timer)
+                    await safe_obv.asend(value)
+                else:
+                    latest, has_value = value, True
+
+            async def athrow(error: Exception) -> None:
+                stop()
+                await safe_obv.athrow(error)
+
+            async def aclose() -> None:
+                stop()
+                if has_value:
+                    await safe_obv.asend(latest)
+                await safe_obv.aclose()
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            dispose = await pipe(obv, source.subscribe_async, auto_detach)
+
+            async def cancel() -> None:
+                stop()
+                await dispose.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _throttle_latest
+
+
+def audit(
+    seconds: float,
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Audit observable stream.
+
+    When the source produces a value and no audit period is running, a
+    new period is started. The latest value received is emitted when the
+    period ends. Unlike `throttle_latest` the first value is not emitted
+    immediately, and unlike `debounce` a busy source cannot postpone the
+    emit forever.
+
+    A pending value is emitted before the stream completes.
+
+    Example:
+        >>> ys = pipe(xs, audit(0.5))
+
+    Args:
+        seconds: Duration of the audit period in seconds.
+
+    Returns:
+        A partially applied audit function that takes the source
+        observable to audit.
+    """
+
+    def _audit(source: AsyncObservable[_TSource]) -> AsyncObservable[_TSource]:
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            loop = asyncio.get_event_loop()
+
+            timer: Optional[asyncio.TimerHandle] = None
+            latest: _TSource = cast(_TSource, None)
+            has_value = False
+            is_stopped = False
+
+            async def flush() -> None:
+                nonlocal timer, has_value
+
+                if is_stopped:
+                    return
+
+                timer = None
+                if has_value:
+                    has_value = False
+                    await safe_obv.asend(latest)
+
+            def on_timer() -> None:
+                aiotools.start(flush())
+
+            def stop() -> None:
+                nonlocal is_stopped
+                is_stopped = True
+                if timer is not None:
+                    timer.cancel()
+
+            async def asend(value: _TSource) -> None:
+                nonlocal timer, latest, has_value
+
+                latest, has_value = value, True
+                if timer is None:
+                    timer = loop.call_later(seconds, on_timer)
+
+            async def athrow(error: Exception) -> None:
+                stop()
+                await safe_obv.athrow(error)
+
+            async def aclose() -> None:
+                stop()
+                if has_value:
+                    await safe_obv.asend(latest)
+                await safe_obv.aclose()
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            dispose = await pipe(obv, source.subscribe_async, auto_detach)
+
+            async def cancel() -> None:
+                stop()
+                await dispose.dispose_async()
+
+            return AsyncDisposable.create(cancel)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _audit
+
+
+class LateEventError(Exception):
+    """Raised by `reorder` when a value arrives behind the watermark."""
+
+
+def reorder(
+    timestamp_selector: Callable[[_TSource], float],
+    max_lateness: float,
+    on_late: Literal["drop", "emit", "error"] = "drop",
+) -> Callable[[AsyncObservable[_TSource]], AsyncObservable[_TSource]]:
+    """Reorder by event time.
+
+    Emits the values of a slightly out of order source ordered by
+    their event time. Pending values are kept in a min-heap ordered by
+    timestamp. The watermark is the largest timestamp seen so far
+    minus `max_lateness`, and values are emitted as soon as the
+    watermark has passed their timestamp. Remaining values are emitted
+    in order when the source completes.
+
+    Values with a timestamp behind the watermark arrived too late to
+    be emitted in order. The `on_late` policy decides what happens to
+    them:
+
+    - `"drop"`: The value is dropped.
+    - `"emit"`: The value is emitted immediately, out of order.
+    - `"error"`: The stream fails with a `LateEventError`.
+
+    Example:
+        >>> ys = pipe(xs, reorder(lambda ev: ev.timestamp, 5.0))
+
+    Args:
+        timestamp_selector: A function that returns the event time of
+            a value.
+        max_lateness: How far behind the largest timestamp seen a
+            value may arrive and still be emitted in order.
+        on_late: What to do with values behind the watermark.
+
+    Returns:
+        A partially applied reorder function that takes the source
+        observable to reorder.
+    """
+    if max_lateness < 0:
+        raise ValueError("Max lateness must not be negative.")
+    if on_late not in ("drop", "emit", "error"):
+        raise ValueError(f"Unknown late policy {on_late!r}.")
+
+    def _reorder(source: AsyncObservable[_TSource]) -> AsyncObservable[_TSource]:
+        async def subscribe_async(aobv: AsyncObserver[_TSource]) -> AsyncDisposable:
+            safe_obv, auto_detach = auto_detach_observer(aobv)
+            heap: List[Tuple[float, int, _TSource]] = []
+            sequence = itertools.count()  # Keeps equal timestamps in order
+            watermark = float("-inf")
+
+            async def asend(value: _TSource) -> None:
+                nonlocal watermark
+
+                try:
+                    timestamp = timestamp_selector(value)
+                except Exception as err:
+                    await safe_obv.athrow(err)
+                    return
+
+                if timestamp < watermark:
+                    if on_late == "emit":
+                        await safe_obv.asend(value)
+                    elif on_late == "error":
+                        error = LateEventError(
+                            f"Timestamp {timestamp} is behind the watermark "
+                            f"{watermark}."
+                        )
+                        await safe_obv.athrow(error)
+                    return
+
+                heapq.heappush(heap, (timestamp, next(sequence), value))
+                watermark = max(watermark, timestamp - max_lateness)
+                while heap and heap[0][0] <= watermark:
+                    _, _, item = heapq.heappop(heap)
+                    await safe_obv.asend(item)
+
+            async def aclose() -> None:
+                while heap:
+                    _, _, item = heapq.heappop(heap)
+                    await safe_obv.asend(item)
+                await safe_obv.aclose()
+
+            async def athrow(error: Exception) -> None:
+                heap.clear()
+                await safe_obv.athrow(error)
+
+            obv = AsyncAnonymousObserver(asend, athrow, aclose)
+            return await pipe(obv, source.subscribe_async, auto_detach)
+
+        return AsyncAnonymousObservable(subscribe_async)
+
+    return _reorder
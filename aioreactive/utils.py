@@ -16,6 +16,16 @@ async def anoop(value: Optional[Any] = None) -> None:
     """Async no operation. Returns nothing"""
 
 
+def import_numpy() -> Any:
+    """Import NumPy, an optional dependency of the batch and columnar
+    operators, when first needed."""
+    try:
+        import numpy
+    except ImportError as err:  # pragma: no cover
+        raise ImportError("This operator requires NumPy to be installed.") from err
+    return numpy
+
+
 class NoopObserver(AsyncObserver[_TSource]):
     async def asend(self, value: _TSource) -> None:
         log.debug("NoopSink:asend(%s)", str(value))
@@ -0,0 +1,50 @@
+"""Benchmark map_batch against an element-wise map pipeline.
+
+Maps N floats with `rx.map` and with `rx.map_batch` and reports the
+time taken by each pipeline. Requires NumPy. Run with:
+
+    python examples/benchmarks/map_batch.py [N]
+"""
+import asyncio
+import math
+import sys
+import time
+from typing import Any
+
+import numpy as np
+from expression import pipe
+
+import aioreactive as rx
+
+
+async def run(name: str, source: rx.AsyncObservable[Any]) -> None:
+    count = 0
+
+    async def asend(value: Any) -> None:
+        nonlocal count
+        count += 1
+
+    start = time.perf_counter()
+    await rx.run(source, rx.AsyncAwaitableObserver(asend), timeout=3600)
+    print(f"{name:<24} {time.perf_counter() - start:8.3f}s ({count} emitted)")
+
+
+async def main(n: int) -> None:
+    data = np.random.random(n).tolist()
+
+    elementwise = pipe(
+        rx.from_iterable(data),
+        rx.map(lambda x: math.sqrt(x) * 2.0 + 1.0),
+    )
+    batched = pipe(
+        rx.from_iterable(data),
+        rx.map_batch(lambda a: np.sqrt(a) * 2.0 + 1.0, size=8192, output="arrays"),
+    )
+
+    print(f"n={n}")
+    await run("map", elementwise)
+    await run("map_batch (arrays)", batched)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000))
@@ -0,0 +1,60 @@
+"""Benchmark subscribe/unsubscribe churn on AsyncSubject.
+
+Subscribes N observers, sends a value, churns subscriptions while N
+observers are subscribed and finally disposes all subscriptions in
+random order. Run with:
+
+    python examples/benchmarks/subject_churn.py
+"""
+import asyncio
+import random
+import time
+from typing import List
+
+from expression.system import AsyncDisposable
+
+import aioreactive as rx
+
+
+async def asend(value: int) -> None:
+    pass
+
+
+async def run(n: int, churn: int = 10_000) -> None:
+    subject: rx.AsyncSubject[int] = rx.AsyncSubject()
+
+    start = time.perf_counter()
+    subscriptions: List[AsyncDisposable] = [
+        await subject.subscribe_async(asend) for _ in range(n)
+    ]
+    subscribed = time.perf_counter()
+
+    await subject.asend(42)
+    sent = time.perf_counter()
+
+    for _ in range(churn):
+        index = random.randrange(len(subscriptions))
+        await subscriptions[index].dispose_async()
+        subscriptions[index] = await subject.subscribe_async(asend)
+    churned = time.perf_counter()
+
+    random.shuffle(subscriptions)
+    for subscription in subscriptions:
+        await subscription.dispose_async()
+    disposed = time.perf_counter()
+
+    print(
+        f"n={n:>7}: subscribe {subscribed - start:.3f}s, "
+        f"send {sent - subscribed:.3f}s, "
+        f"churn({churn}) {churned - sent:.3f}s, "
+        f"dispose {disposed - churned:.3f}s"
+    )
+
+
+async def main() -> None:
+    for n in (10_000, 100_000):
+        await run(n)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,9 +9,9 @@ import aioreactive as rx
 async def main():
     xs = rx.from_iterable(range(10))
 
-    # Split into odds and evens
-    evens = pipe(xs, rx.filter(lambda x: x % 2 == 0))
-    odds = pipe(xs, rx.filter(lambda x: x % 2 == 1))
+    # Split into evens and odds using a single subscription to xs. The
+    # source is subscribed when both substreams have been subscribed.
+    evens, odds = pipe(xs, rx.partition(lambda x: x % 2 == 0))
 
     async def mysink(value: int):
         print(value)
@@ -19,6 +19,8 @@ async def main():
     await odds.subscribe_async(rx.AsyncAnonymousObserver(mysink))
     await evens.subscribe_async(rx.AsyncAnonymousObserver(mysink))
 
+    await asyncio.sleep(1)
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import BackpressureMetrics, BufferOverflowError
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import (
+    AsyncTestObserver,
+    AsyncTestSubject,
+    VirtualTimeEventLoop,
+    ca,
+)
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+async def slow(value: int) -> int:
+    await asyncio.sleep(1.0)
+    return value
+
+
+@pytest.mark.asyncio
+async def test_on_backpressure_drop():
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+    metrics = BackpressureMetrics()
+
+    ys = pipe(xs, rx.on_backpressure_drop(metrics=metrics), rx.map_async(slow))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(1)
+        await asyncio.sleep(0.1)
+        for x in range(2, 6):
+            await xs.asend(x)
+        assert metrics.pending == 1
+
+        await xs.aclose()
+        await obv
+
+    assert obv.values == [
+        (ca(1), OnNext(1)),
+        (ca(2), OnNext(2)),
+        (ca(2), OnCompleted),
+    ]
+    assert metrics == BackpressureMetrics(received=5, delivered=2, dropped=3, pending=0)
+
+
+@pytest.mark.asyncio
+async def test_on_backpressure_latest():
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+    metrics = BackpressureMetrics()
+
+    ys = pipe(xs, rx.on_backpressure_latest(metrics), rx.map_async(slow))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(1)
+        await asyncio.sleep(0.1)
+        for x in range(2, 6):
+            await xs.asend(x)
+        await xs.aclose()
+        await obv
+
+    assert obv.values == [
+        (ca(1), OnNext(1)),
+        (ca(2), OnNext(5)),
+        (ca(2), OnCompleted),
+    ]
+    assert metrics == BackpressureMetrics(received=5, delivered=2, dropped=3, pending=0)
+
+
+@pytest.mark.asyncio
+async def test_on_backpressure_drop_idle_observer():
+    metrics = BackpressureMetrics()
+    xs = rx.from_iterable(range(10))
+
+    ys = pipe(xs, rx.on_backpressure_drop(metrics=metrics))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(x) for x in range(10)] + [OnCompleted]
+    assert metrics.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_on_backpressure_latest_idle_observer():
+    xs = rx.from_iterable(range(10))
+
+    ys = pipe(xs, rx.on_backpressure_latest())
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(x) for x in range(10)] + [OnCompleted]
+
+
+@pytest.mark.asyncio
+async def test_on_backpressure_buffer_overflow():
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+
+    ys = pipe(xs, rx.on_backpressure_buffer(2), rx.map_async(slow))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(1)
+        await asyncio.sleep(0.1)
+        for x in range(2, 5):
+            await xs.asend(x)
+
+        with pytest.raises(BufferOverflowError):
+            await obv
+
+    assert obv.values[0] == (ca(1), OnNext(1))
+    assert len(obv.values) == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_does_not_delay_fan_out():
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+
+    fast: AsyncTestObserver[int] = AsyncTestObserver()
+    slow_obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await xs.subscribe_async(fast)
+    ys = pipe(xs, rx.on_backpressure_buffer(10), rx.map_async(slow))
+    await ys.subscribe_async(slow_obv)
+
+    for x in range(3):
+        await xs.asend(x)
+    await xs.aclose()
+    await fast
+    await slow_obv
+
+    assert fast.values == [
+        (0, OnNext(0)),
+        (0, OnNext(1)),
+        (0, OnNext(2)),
+        (0, OnCompleted),
+    ]
+    assert slow_obv.values == [
+        (ca(1), OnNext(0)),
+        (ca(2), OnNext(1)),
+        (ca(3), OnNext(2)),
+        (ca(3), OnCompleted),
+    ]
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import AsyncSubject
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_map_batch_elements() -> None:
+    xs = rx.from_iterable([1.0, 2.0, 3.0, 4.0, 5.0])
+    ys = pipe(xs, rx.map_batch(lambda a: a * 10.0, size=2))
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [
+        OnNext(x) for x in [10.0, 20.0, 30.0, 40.0, 50.0]
+    ] + [OnCompleted]
+
+
+@pytest.mark.asyncio
+async def test_map_batch_arrays_are_not_views() -> None:
+    xs = rx.from_iterable([1.0, 2.0, 3.0, 4.0])
+    ys = pipe(xs, rx.map_batch(lambda a: a, size=2, output="arrays"))
+
+    result = []
+
+    async def asend(value: "np.ndarray") -> None:
+        result.append(value)
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver(asend)
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [a.tolist() for a in result[::2]] == [[1.0, 2.0], [3.0, 4.0]]
+
+
+@pytest.mark.asyncio
+async def test_filter_batch_time_bound() -> None:
+    xs: AsyncSubject[float] = AsyncSubject()
+    ys = pipe(xs, rx.filter_batch(lambda a: a > 0.0, size=100, seconds=1.0))
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs.asend(-1.0)
+    await xs.asend(2.0)
+    await asyncio.sleep(2)
+    await xs.asend(3.0)
+    await xs.aclose()
+    await obv
+
+    assert obv.values == [(1, OnNext(2.0)), (2, OnNext(3.0)), (2, OnCompleted)]
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from aioreactive import AsyncBehaviorSubject
+from aioreactive.notification import OnCompleted, OnError, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+class MyException(Exception):
+    pass
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_behavior_subject_initial_value() -> None:
+    xs = AsyncBehaviorSubject(0)
+    assert xs.value == 0
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await xs.subscribe_async(obv)
+    await xs.asend(1)
+
+    assert xs.value == 1
+    assert obv.values == [(0, OnNext(0)), (0, OnNext(1))]
+
+
+@pytest.mark.asyncio
+async def test_behavior_subject_late_subscriber() -> None:
+    xs = AsyncBehaviorSubject(0)
+    await xs.asend(1)
+    await asyncio.sleep(1)
+    await xs.asend(2)
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await xs.subscribe_async(obv)
+    await xs.asend(3)
+    await xs.aclose()
+    await obv
+
+    assert obv.values == [(1, OnNext(2)), (1, OnNext(3)), (1, OnCompleted)]
+
+
+@pytest.mark.asyncio
+async def test_behavior_subject_send_during_subscribe() -> None:
+    xs = AsyncBehaviorSubject(0)
+
+    async def asend(value: int) -> None:
+        await asyncio.sleep(0.5)
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver(asend)
+    subscribing = asyncio.ensure_future(xs.subscribe_async(obv))
+    await asyncio.sleep(0.5)
+    await xs.asend(1)
+    await subscribing
+
+    assert [n for _, n in obv.values] == [OnNext(0), OnNext(1)]
+
+
+@pytest.mark.asyncio
+async def test_behavior_subject_after_error() -> None:
+    error = MyException("ex")
+    xs = AsyncBehaviorSubject(0)
+    await xs.athrow(error)
+
+    with pytest.raises(MyException):
+        xs.value
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await xs.subscribe_async(obv)
+
+    with pytest.raises(MyException):
+        await obv
+
+    assert obv.values == [(0, OnError(error))]
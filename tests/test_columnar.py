@@ -0,0 +1,77 @@
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import columnar as col
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+def test_column_batch_from_rows() -> None:
+    rows = [{"id": 1, "price": 2.5}, {"id": 2, "price": 4.0}]
+    batch = col.ColumnBatch.from_rows(rows)
+
+    assert len(batch) == 2
+    assert batch.names == ["id", "price"]
+    assert batch["price"].tolist() == [2.5, 4.0]
+    assert batch.to_rows() == rows
+
+
+def test_column_batch_wrong_length() -> None:
+    with pytest.raises(ValueError):
+        col.ColumnBatch({"a": [1, 2], "b": [1]})
+
+
+def test_column_batch_explode() -> None:
+    batch = col.ColumnBatch.from_rows(
+        [
+            {"id": 1, "tags": ["a", "b"]},
+            {"id": 2, "tags": []},
+            {"id": 3, "tags": ["c"]},
+        ]
+    )
+
+    exploded = batch.explode("tags")
+    assert exploded.to_rows() == [
+        {"id": 1, "tags": "a"},
+        {"id": 1, "tags": "b"},
+        {"id": 3, "tags": "c"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_columnar_pipeline() -> None:
+    pages = [
+        [{"id": 1, "price": 2.0, "qty": 3}, {"id": 2, "price": -1.0, "qty": 1}],
+        [{"id": 3, "price": -5.0, "qty": 2}],
+        [{"id": 4, "price": 1.5, "qty": 2}],
+    ]
+    xs = rx.from_iterable(pages)
+    ys = pipe(
+        xs,
+        rx.to_columns(),
+        col.where(lambda b: b["price"] > 0),
+        col.with_column("total", lambda b: b["price"] * b["qty"]),
+        col.select("id", "total"),
+        rx.to_rows(),
+    )
+
+    obv: AsyncTestObserver[list] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    # The second page has no rows left and is dropped
+    assert [n for _, n in obv.values] == [
+        OnNext([{"id": 1, "total": 6.0}]),
+        OnNext([{"id": 4, "total": 3.0}]),
+        OnCompleted,
+    ]
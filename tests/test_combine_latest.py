@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+import aioreactive as rx
+from aioreactive import AsyncSubject
+from aioreactive.notification import OnCompleted, OnError, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+class MyException(Exception):
+    pass
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_combine_latest_seq() -> None:
+    xs = [AsyncSubject() for _ in range(3)]
+    ys = rx.combine_latest_seq(xs)
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs[0].asend(1)
+    await xs[1].asend(2)
+    await xs[0].asend(3)
+    await xs[2].asend(4)
+    await xs[1].asend(5)
+    for x in xs:
+        await x.aclose()
+    await obv
+
+    assert obv.values == [
+        (0, OnNext((3, 2, 4))),
+        (0, OnNext((3, 5, 4))),
+        (0, OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_combine_latest_seq_completes_on_empty_source() -> None:
+    xs = [AsyncSubject() for _ in range(2)]
+    ys = rx.combine_latest_seq(xs)
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs[0].asend(1)
+    await xs[1].aclose()
+
+    with pytest.raises(asyncio.CancelledError):
+        await obv
+
+    assert obv.values == [(0, OnCompleted)]
+
+
+@pytest.mark.asyncio
+async def test_combine_latest_seq_error() -> None:
+    error = MyException("ex")
+    xs = [AsyncSubject() for _ in range(2)]
+    ys = rx.combine_latest_seq(xs)
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs[0].asend(1)
+    await xs[1].asend(2)
+    await xs[1].athrow(error)
+
+    with pytest.raises(MyException):
+        await obv
+
+    assert obv.values == [(0, OnNext((1, 2))), (0, OnError(error))]
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Tuple
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive.notification import OnCompleted, OnError, OnNext
+from aioreactive.testing import (
+    AsyncTestObserver,
+    AsyncTestSubject,
+    VirtualTimeEventLoop,
+    ca,
+)
+
+
+class MyException(Exception):
+    pass
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+async def slow(value: Tuple[str, int]) -> Tuple[str, int]:
+    await asyncio.sleep(1.0)
+    return value
+
+
+@pytest.mark.asyncio
+async def test_conflate_keeps_latest_per_key():
+    xs: AsyncTestSubject[Tuple[str, int]] = AsyncTestSubject()
+
+    ys = pipe(xs, rx.conflate(lambda x: x[0]), rx.map_async(slow))
+    obv: AsyncTestObserver[Tuple[str, int]] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(("a", 1))
+        await asyncio.sleep(0.1)
+        await xs.asend(("b", 1))
+        await xs.asend(("a", 2))
+        await xs.asend(("b", 2))
+        await xs.asend(("a", 3))
+        await xs.aclose()
+        await obv
+
+    assert obv.values == [
+        (ca(1), OnNext(("a", 1))),
+        (ca(2), OnNext(("b", 2))),
+        (ca(3), OnNext(("a", 3))),
+        (ca(3), OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_conflate_idle_observer():
+    xs = rx.from_iterable(range(10))
+
+    ys = pipe(xs, rx.conflate(lambda x: x % 2))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(x) for x in range(10)] + [OnCompleted]
+
+
+@pytest.mark.asyncio
+async def test_conflate_does_not_block_producer():
+    xs: AsyncTestSubject[Tuple[str, int]] = AsyncTestSubject()
+
+    ys = pipe(xs, rx.conflate(lambda x: x[0]), rx.map_async(slow))
+    obv: AsyncTestObserver[Tuple[str, int]] = AsyncTestObserver()
+    loop = asyncio.get_event_loop()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(("a", -1))
+        await asyncio.sleep(0.1)
+        for i in range(1000):
+            await xs.asend(("a", i))
+        assert loop.time() == ca(0.1)
+
+        await xs.aclose()
+        await obv
+
+    assert obv.values == [
+        (ca(1), OnNext(("a", -1))),
+        (ca(2), OnNext(("a", 999))),
+        (ca(2), OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_conflate_error_drops_pending():
+    error = MyException("ex")
+    xs: AsyncTestSubject[Tuple[str, int]] = AsyncTestSubject()
+
+    ys = pipe(xs, rx.conflate(lambda x: x[0]), rx.map_async(slow))
+    obv: AsyncTestObserver[Tuple[str, int]] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(("a", 1))
+        await asyncio.sleep(0.1)
+        await xs.asend(("b", 1))
+        await xs.athrow(error)
+
+        with pytest.raises(MyException):
+            await obv
+
+    assert obv.values == [
+        (ca(1), OnNext(("a", 1))),
+        (ca(1), OnError(error)),
+    ]
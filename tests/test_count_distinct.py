@@ -0,0 +1,106 @@
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import HyperLogLog
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import (
+    AsyncTestObserver,
+    AsyncTestSubject,
+    VirtualTimeEventLoop,
+)
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+def test_hyperloglog_estimate() -> None:
+    sketch = HyperLogLog(12)
+    for i in range(50_000):
+        sketch.add(f"user-{i % 20_000}")
+
+    assert sketch.estimate() == pytest.approx(20_000, rel=0.05)
+
+
+def test_hyperloglog_small_cardinality() -> None:
+    sketch = HyperLogLog()
+    sketch.update([1, 2, 3, 2, 1])
+
+    assert round(sketch.estimate()) == 3
+
+
+def test_hyperloglog_merge() -> None:
+    a, b = HyperLogLog(12), HyperLogLog(12)
+    a.update(range(0, 6000))
+    b.update(range(4000, 10000))
+
+    assert (a | b).estimate() == pytest.approx(10_000, rel=0.05)
+    with pytest.raises(ValueError):
+        a.merge(HyperLogLog(10))
+
+
+def test_hyperloglog_vectorised_matches_scalar() -> None:
+    np = pytest.importorskip("numpy")
+
+    values = np.arange(-5000, 5000, dtype=np.int64)
+    vectorised, scalar = HyperLogLog(10), HyperLogLog(10)
+    vectorised.update(values)
+    scalar.update(values.tolist())
+
+    assert vectorised.estimate() == scalar.estimate()
+
+
+@pytest.mark.asyncio
+async def test_count_distinct_approx_emit_every() -> None:
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+    ys = pipe(xs, rx.count_distinct_approx(emit_every=10))
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs.asend_later(1, 1)
+    await xs.asend_later(1, 2)
+    await xs.asend_later(1, 1)
+    await xs.asend_later(10, 3)
+    await xs.aclose_later(1)
+    await obv
+
+    assert [(t, round(n.value)) for t, n in obv.values if isinstance(n, OnNext)] == [
+        (10, 2),
+        (14, 3),
+    ]
+    assert obv.values[-1] == (14, OnCompleted)
+
+
+def test_hyperloglog_hash_is_consistent_with_equality() -> None:
+    np = pytest.importorskip("numpy")
+
+    sketch = HyperLogLog(10)
+    sketch.update(np.array([1.5, 2.5, 3.0]))
+    sketch.update([1.5, 2.5, 3, np.float64(1.5), np.int32(3), (1, "a")])
+    sketch.add((1, "a"))
+
+    assert round(sketch.estimate()) == 4
+
+
+def test_hyperloglog_unsupported_type() -> None:
+    with pytest.raises(TypeError):
+        HyperLogLog().add(object())
+
+
+@pytest.mark.asyncio
+async def test_count_distinct_approx_float_batches() -> None:
+    np = pytest.importorskip("numpy")
+
+    xs = rx.from_iterable([np.array([0.5, 1.5]), np.array([1.5, 2.5]), 2.5])
+    ys = pipe(xs, rx.count_distinct_approx())
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [round(n.value) for _, n in obv.values if isinstance(n, OnNext)] == [3]
@@ -0,0 +1,103 @@
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import BloomFilter
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import (
+    AsyncTestObserver,
+    AsyncTestSubject,
+    VirtualTimeEventLoop,
+)
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_distinct() -> None:
+    xs = rx.from_iterable([1, 2, 1, 3, 2, 4])
+    ys = pipe(xs, rx.distinct())
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [
+        OnNext(1),
+        OnNext(2),
+        OnNext(3),
+        OnNext(4),
+        OnCompleted,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_distinct_max_keys_forgets_least_recent() -> None:
+    xs = rx.from_iterable(["a", "b", "a", "c", "b", "a"])
+    ys = pipe(xs, rx.distinct(str.upper, max_keys=2))
+
+    obv: AsyncTestObserver[str] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    # "c" evicts "b", since "a" was seen more recently, and "b" then
+    # evicts "a"
+    assert [n for _, n in obv.values] == [
+        OnNext("a"),
+        OnNext("b"),
+        OnNext("c"),
+        OnNext("b"),
+        OnNext("a"),
+        OnCompleted,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_distinct_ttl() -> None:
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+    ys = pipe(xs, rx.distinct(ttl=5))
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs.asend_later(1, 1)
+    await xs.asend_later(2, 1)
+    await xs.asend_later(4, 1)
+    await xs.aclose_later(1)
+    await obv
+
+    assert obv.values == [(1, OnNext(1)), (7, OnNext(1)), (8, OnCompleted)]
+
+
+@pytest.mark.asyncio
+async def test_distinct_bloom() -> None:
+    values = list(range(1000)) * 2
+    xs = rx.from_iterable(values)
+    ys = pipe(xs, rx.distinct(max_keys=5000, bloom=True, error_rate=0.0001))
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    emitted = [n.value for _, n in obv.values if isinstance(n, OnNext)]
+    assert emitted == list(range(1000))
+
+
+def test_bloom_filter() -> None:
+    bloom = BloomFilter(100, 0.01)
+
+    assert not bloom.add("a")
+    assert bloom.add("a")
+    assert "a" in bloom
+    assert "b" not in bloom
+    assert bloom.count == 1
+
+
+def test_distinct_bloom_requires_max_keys() -> None:
+    with pytest.raises(ValueError):
+        rx.distinct(bloom=True)
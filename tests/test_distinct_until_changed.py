@@ -51,3 +51,54 @@ async def test_distinct_until_changed_changed():
         (0, OnNext(2)),
         (0, OnCompleted),
     ]
+
+
+@pytest.mark.asyncio
+async def test_distinct_until_changed_key_selector():
+    xs = rx.from_iterable(["a", "A", "b", "B", "a"])
+
+    obv: AsyncTestObserver[str] = AsyncTestObserver()
+    ys = pipe(xs, rx.distinct_until_changed(str.lower))
+
+    await rx.run(ys, obv)
+    assert obv.values == [
+        (0, OnNext("a")),
+        (0, OnNext("b")),
+        (0, OnNext("a")),
+        (0, OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_distinct_until_changed_comparer():
+    xs = AsyncRx.from_iterable([1.0, 1.05, 1.5, 1.52, 1.0])
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    ys = xs.distinct_until_changed(comparer=lambda a, b: abs(a - b) < 0.1)
+
+    await rx.run(ys, obv)
+    assert obv.values == [
+        (0, OnNext(1.0)),
+        (0, OnNext(1.5)),
+        (0, OnNext(1.0)),
+        (0, OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_distinct_until_changed_key_selector_throws():
+    error = MyException("ex")
+
+    def key_selector(x: int) -> int:
+        if x == 2:
+            raise error
+        return x
+
+    xs = rx.from_iterable([1, 2, 3])
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    ys = pipe(xs, rx.distinct_until_changed(key_selector))
+
+    with pytest.raises(MyException):
+        await rx.run(ys, obv)
+    assert obv.values[0] == (0, OnNext(1))
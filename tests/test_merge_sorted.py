@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+import aioreactive as rx
+from aioreactive import AsyncSubject
+from aioreactive.notification import OnCompleted, OnError, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+class MyException(Exception):
+    pass
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_merge_sorted() -> None:
+    xs = rx.from_iterable([1, 4, 7, 10])
+    ys = rx.from_iterable([2, 5, 8])
+    zs = rx.from_iterable([3, 6, 9, 11, 12])
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await rx.merge_sorted([xs, ys, zs]).subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(x) for x in range(1, 13)] + [
+        OnCompleted
+    ]
+
+
+@pytest.mark.asyncio
+async def test_merge_sorted_waits_for_all_sources() -> None:
+    xs: AsyncSubject[dict] = AsyncSubject()
+    ys: AsyncSubject[dict] = AsyncSubject()
+
+    obv: AsyncTestObserver[dict] = AsyncTestObserver()
+    ys_sorted = rx.merge_sorted([xs, ys], key=lambda ev: ev["ts"])
+    await ys_sorted.subscribe_async(obv)
+
+    await xs.asend({"ts": 2})
+    await xs.asend({"ts": 3})
+    await asyncio.sleep(1)
+    assert obv.values == []
+
+    await ys.asend({"ts": 1})
+    await asyncio.sleep(1)
+    await ys.aclose()
+    await xs.aclose()
+    await obv
+
+    assert obv.values == [
+        (1, OnNext({"ts": 1})),
+        (2, OnNext({"ts": 2})),
+        (2, OnNext({"ts": 3})),
+        (2, OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_merge_sorted_error() -> None:
+    error = MyException("ex")
+    xs: AsyncSubject[int] = AsyncSubject()
+    ys: AsyncSubject[int] = AsyncSubject()
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await rx.merge_sorted([xs, ys]).subscribe_async(obv)
+
+    await xs.asend(1)
+    await ys.athrow(error)
+
+    with pytest.raises(MyException):
+        await obv
+
+    assert obv.values == [(0, OnError(error))]
+
+
+@pytest.mark.asyncio
+async def test_merge_sorted_key_error_on_queued_value() -> None:
+    error = MyException("ex")
+    xs: AsyncSubject[int] = AsyncSubject()
+    ys: AsyncSubject[int] = AsyncSubject()
+
+    def key(value: int) -> int:
+        if value == 2:
+            raise error
+        return value
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await rx.merge_sorted([xs, ys], key=key).subscribe_async(obv)
+
+    await xs.asend(1)
+    await xs.asend(2)  # Queued behind 1 until ys has a value
+    await ys.asend(3)
+
+    with pytest.raises(MyException):
+        await obv
+
+    assert obv.values == [(0, OnError(error))]
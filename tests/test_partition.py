@@ -0,0 +1,127 @@
+from typing import List
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import AsyncObservable, AsyncSubject
+from aioreactive.notification import OnCompleted, OnError, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_partition_subscribes_once() -> None:
+    subscriptions: List[int] = []
+
+    def factory() -> AsyncObservable[int]:
+        subscriptions.append(1)
+        return rx.from_iterable(range(6))
+
+    evens, odds = pipe(rx.defer(factory), rx.partition(lambda x: x % 2 == 0))
+
+    obv1: AsyncTestObserver[int] = AsyncTestObserver()
+    obv2: AsyncTestObserver[int] = AsyncTestObserver()
+    await evens.subscribe_async(obv1)
+    assert subscriptions == []
+
+    await odds.subscribe_async(obv2)
+    await obv1
+    await obv2
+
+    assert subscriptions == [1]
+    assert [n for _, n in obv1.values] == [OnNext(0), OnNext(2), OnNext(4), OnCompleted]
+    assert [n for _, n in obv2.values] == [OnNext(1), OnNext(3), OnNext(5), OnCompleted]
+
+
+@pytest.mark.asyncio
+async def test_partition_by_drops_disposed_output() -> None:
+    xs: AsyncSubject[int] = AsyncSubject()
+    low, mid, high = pipe(xs, rx.partition_by(lambda x: x // 10, 3))
+
+    obvs = [AsyncTestObserver() for _ in range(3)]
+    subs = [await ys.subscribe_async(obv) for ys, obv in zip([low, mid, high], obvs)]
+
+    await xs.asend(1)
+    await subs[1].dispose_async()
+    await xs.asend(15)
+    await xs.asend(25)
+
+    assert obvs[0].values == [(0, OnNext(1))]
+    assert obvs[1].values == []
+    assert obvs[2].values == [(0, OnNext(25))]
+
+    await subs[0].dispose_async()
+    assert xs._observers
+    await subs[2].dispose_async()
+    assert not xs._observers
+
+
+@pytest.mark.asyncio
+async def test_partition_by_index_out_of_range() -> None:
+    xs: AsyncSubject[int] = AsyncSubject()
+    first, second = pipe(xs, rx.partition_by(lambda x: x, 2))
+
+    obv1: AsyncTestObserver[int] = AsyncTestObserver()
+    obv2: AsyncTestObserver[int] = AsyncTestObserver()
+    await first.subscribe_async(obv1)
+    await second.subscribe_async(obv2)
+
+    await xs.asend(1)
+    await xs.asend(2)
+
+    with pytest.raises(IndexError):
+        await obv1
+    with pytest.raises(IndexError):
+        await obv2
+
+    assert obv2.values[0] == (0, OnNext(1))
+    assert isinstance(obv2.values[1][1], OnError)
+    assert not xs._observers
+
+
+@pytest.mark.asyncio
+async def test_partition_reconnects_after_dispose() -> None:
+    subscriptions: List[int] = []
+
+    def factory() -> AsyncObservable[int]:
+        subscriptions.append(1)
+        return rx.from_iterable(range(4))
+
+    evens, odds = pipe(rx.defer(factory), rx.partition(lambda x: x % 2 == 0))
+
+    for _ in range(2):
+        obv1: AsyncTestObserver[int] = AsyncTestObserver()
+        obv2: AsyncTestObserver[int] = AsyncTestObserver()
+        async with await evens.subscribe_async(obv1):
+            async with await odds.subscribe_async(obv2):
+                await obv1
+                await obv2
+
+        assert [n for _, n in obv1.values] == [OnNext(0), OnNext(2), OnCompleted]
+        assert [n for _, n in obv2.values] == [OnNext(1), OnNext(3), OnCompleted]
+
+    assert subscriptions == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_partition_late_observer_gets_completion() -> None:
+    evens, odds = pipe(rx.from_iterable(range(4)), rx.partition(lambda x: x % 2 == 0))
+
+    obv1: AsyncTestObserver[int] = AsyncTestObserver()
+    obv2: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await evens.subscribe_async(obv1):
+        async with await odds.subscribe_async(obv2):
+            await obv1
+            await obv2
+
+            late: AsyncTestObserver[int] = AsyncTestObserver()
+            await evens.subscribe_async(late)
+
+    assert late.values == [(0, OnCompleted)]
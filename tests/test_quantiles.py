@@ -0,0 +1,84 @@
+import random
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import KLL
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import (
+    AsyncTestObserver,
+    AsyncTestSubject,
+    VirtualTimeEventLoop,
+)
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+def test_kll_quantiles() -> None:
+    values = list(range(100_000))
+    random.Random(1).shuffle(values)
+
+    sketch = KLL(200, seed=1)
+    for value in values:
+        sketch.add(value)
+
+    assert sketch.count == 100_000
+    for q, estimate in zip((0.5, 0.95, 0.99), sketch.quantiles((0.5, 0.95, 0.99))):
+        assert abs(estimate - q * 100_000) < 2_000
+
+
+def test_kll_merge_and_update() -> None:
+    a, b = KLL(100, seed=1), KLL(100, seed=2)
+    a.update(range(0, 50_000))
+    b.update(range(50_000, 100_000))
+    a.merge(b)
+
+    assert a.count == 100_000
+    (median,) = a.quantiles([0.5])
+    assert abs(median - 50_000) < 3_000
+
+
+def test_kll_empty() -> None:
+    with pytest.raises(ValueError):
+        KLL().quantiles([0.5])
+
+
+@pytest.mark.asyncio
+async def test_quantiles_exact_for_small_input() -> None:
+    xs = rx.from_iterable([5, 1, 4, 2, 3])
+    ys = pipe(xs, rx.quantiles((0.0, 0.5, 1.0)))
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext((1.0, 3.0, 5.0)), OnCompleted]
+
+
+@pytest.mark.asyncio
+async def test_quantiles_window() -> None:
+    xs: AsyncTestSubject[float] = AsyncTestSubject()
+    ys = pipe(xs, rx.quantiles((0.5,), window=10))
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs.asend_later(1, 1)
+    await xs.asend_later(1, 2)
+    await xs.asend_later(1, 3)
+    await xs.asend_later(20, 10)
+    await xs.aclose_later(1)
+    await obv
+
+    # The empty window ending at 20 emits nothing
+    assert obv.values == [
+        (10, OnNext((2.0,))),
+        (24, OnNext((10.0,))),
+        (24, OnCompleted),
+    ]
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import AsyncSubject
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+from aioreactive.timeshift import LateEventError
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+def timestamp(value: float) -> float:
+    return value
+
+
+@pytest.mark.asyncio
+async def test_reorder() -> None:
+    xs: AsyncSubject[float] = AsyncSubject()
+    ys = pipe(xs, rx.reorder(timestamp, 2))
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    for x in [1, 3, 2, 5, 4, 6]:
+        await xs.asend(x)
+    await asyncio.sleep(1)
+
+    # Watermark is now 4
+    assert [n for _, n in obv.values] == [OnNext(x) for x in [1, 2, 3, 4]]
+
+    await xs.aclose()
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(x) for x in [1, 2, 3, 4, 5, 6]] + [
+        OnCompleted
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reorder_late_drop() -> None:
+    xs = rx.from_iterable([1, 5, 2, 4, 3, 6])
+    ys = pipe(xs, rx.reorder(timestamp, 1))
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(x) for x in [1, 4, 5, 6]] + [
+        OnCompleted
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reorder_late_emit() -> None:
+    xs = rx.from_iterable([1, 5, 2, 6])
+    ys = pipe(xs, rx.reorder(timestamp, 1, on_late="emit"))
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(x) for x in [1, 2, 5, 6]] + [
+        OnCompleted
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reorder_late_error() -> None:
+    xs = rx.from_iterable([1, 5, 2, 6])
+    ys = pipe(xs, rx.reorder(timestamp, 1, on_late="error"))
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    with pytest.raises(LateEventError):
+        await obv
+
+    assert obv.values[0] == (0, OnNext(1))
@@ -0,0 +1,133 @@
+import asyncio
+from typing import List
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import AsyncObservable, AsyncReplaySubject
+from aioreactive.notification import OnCompleted, OnError, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+class MyException(Exception):
+    pass
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_subject_buffer_size() -> None:
+    xs: AsyncReplaySubject[int] = AsyncReplaySubject(buffer_size=3)
+    for value in range(1, 6):
+        await xs.asend(value)
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await xs.subscribe_async(obv)
+    await xs.asend(6)
+    await xs.aclose()
+    await obv
+
+    assert [n for _, n in obv.values] == [
+        OnNext(3),
+        OnNext(4),
+        OnNext(5),
+        OnNext(6),
+        OnCompleted,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replay_subject_window() -> None:
+    xs: AsyncReplaySubject[int] = AsyncReplaySubject(window=1.5)
+    await xs.asend(1)
+    await asyncio.sleep(1)
+    await xs.asend(2)
+    await asyncio.sleep(1)
+    await xs.asend(3)
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await xs.subscribe_async(obv)
+
+    assert obv.values == [(2, OnNext(2)), (2, OnNext(3))]
+
+
+@pytest.mark.asyncio
+async def test_replay_subject_replays_error() -> None:
+    error = MyException("ex")
+    xs: AsyncReplaySubject[int] = AsyncReplaySubject()
+    await xs.asend(1)
+    await xs.athrow(error)
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await xs.subscribe_async(obv)
+
+    with pytest.raises(MyException):
+        await obv
+
+    assert obv.values == [(0, OnNext(1)), (0, OnError(error))]
+
+
+@pytest.mark.asyncio
+async def test_replay_subject_send_during_replay() -> None:
+    xs: AsyncReplaySubject[int] = AsyncReplaySubject()
+    await xs.asend(1)
+    await xs.asend(2)
+
+    async def asend(value: int) -> None:
+        await asyncio.sleep(0.5)
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver(asend)
+    subscribing = asyncio.ensure_future(xs.subscribe_async(obv))
+    await asyncio.sleep(0.5)
+    await xs.asend(3)
+    await subscribing
+    await xs.asend(4)
+
+    assert [n for _, n in obv.values] == [OnNext(1), OnNext(2), OnNext(3), OnNext(4)]
+
+
+@pytest.mark.asyncio
+async def test_cache_runs_source_once() -> None:
+    calls: List[int] = []
+
+    async def query() -> int:
+        calls.append(1)
+        await asyncio.sleep(1)
+        return 42
+
+    def factory() -> AsyncObservable[int]:
+        return rx.of_async(query())
+
+    ys = pipe(rx.defer(factory), rx.cache())
+
+    obv1: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv1)
+    await obv1
+
+    obv2: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv2)
+    await obv2
+
+    assert calls == [1]
+    assert obv1.values == [(1, OnNext(42)), (1, OnCompleted)]
+    assert obv2.values == [(1, OnNext(42)), (1, OnCompleted)]
+
+
+@pytest.mark.asyncio
+async def test_replay_connect() -> None:
+    ys = pipe(rx.from_iterable([1, 2, 3]), rx.replay(buffer_size=2))
+    connection = await ys.connect()
+    await asyncio.sleep(1)
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(2), OnNext(3), OnCompleted]
+    await connection.dispose_async()
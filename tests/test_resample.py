@@ -0,0 +1,72 @@
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import (
+    AsyncTestObserver,
+    AsyncTestSubject,
+    VirtualTimeEventLoop,
+)
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_resample_loop_clock() -> None:
+    xs: AsyncTestSubject[float] = AsyncTestSubject()
+    ys = pipe(xs, rx.resample(10, ("open", "high", "low", "close", "count")))
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs.asend_later(1, 5)
+    await xs.asend_later(2, 7)
+    await xs.asend_later(2, 3)
+    await xs.asend_later(2, 4)
+    await xs.asend_later(20, 8)
+    await xs.aclose_later(1)
+    await obv
+
+    assert obv.values == [
+        (10, OnNext((0.0, (5.0, 7.0, 3.0, 4.0, 4.0)))),
+        (28, OnNext((20.0, (8.0, 8.0, 8.0, 8.0, 1.0)))),
+        (28, OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_resample_event_time() -> None:
+    events = [(0.5, 1.0), (1.2, 2.0), (1.9, 4.0), (5.1, 3.0), (0.7, 9.0), (5.5, 1.0)]
+    xs = rx.from_iterable(events)
+    ys = pipe(
+        xs,
+        rx.resample(
+            1.0,
+            ("sum", "last", "count"),
+            timestamp_selector=lambda e: e[0],
+            value_selector=lambda e: e[1],
+        ),
+    )
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    # The late event at 0.7 is dropped, and empty buckets are skipped
+    assert [n for _, n in obv.values] == [
+        OnNext((0.0, (1.0, 1.0, 1.0))),
+        OnNext((1.0, (6.0, 4.0, 2.0))),
+        OnNext((5.0, (4.0, 1.0, 2.0))),
+        OnCompleted,
+    ]
+
+
+def test_resample_unknown_field() -> None:
+    with pytest.raises(ValueError):
+        rx.resample(1.0, ("median",))
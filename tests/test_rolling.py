@@ -0,0 +1,85 @@
+import random
+import statistics
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_rolling_min_max() -> None:
+    xs = rx.from_iterable([3, 1, 4, 1, 5, 9, 2, 6])
+    ys = pipe(xs, rx.rolling(3, ("min", "max")))
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [
+        OnNext((3.0, 3.0)),
+        OnNext((1.0, 3.0)),
+        OnNext((1.0, 4.0)),
+        OnNext((1.0, 4.0)),
+        OnNext((1.0, 5.0)),
+        OnNext((1.0, 9.0)),
+        OnNext((2.0, 9.0)),
+        OnNext((2.0, 9.0)),
+        OnCompleted,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rolling_matches_statistics() -> None:
+    rnd = random.Random(42)
+    values = [rnd.uniform(-100.0, 100.0) for _ in range(200)]
+    window = 7
+
+    xs = rx.from_iterable(values)
+    ys = pipe(xs, rx.rolling(window, ("count", "sum", "mean", "var", "std")))
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    emitted = [n.value for _, n in obv.values if isinstance(n, OnNext)]
+    assert len(emitted) == len(values)
+    assert emitted[0][:3] == (1.0, values[0], values[0])
+    for i, (count, sum_, mean, var, std) in enumerate(emitted[1:], 1):
+        chunk = values[max(0, i + 1 - window) : i + 1]
+        assert count == len(chunk)
+        assert sum_ == pytest.approx(sum(chunk))
+        assert mean == pytest.approx(statistics.mean(chunk))
+        assert var == pytest.approx(statistics.variance(chunk))
+        assert std == pytest.approx(statistics.stdev(chunk))
+
+
+@pytest.mark.asyncio
+async def test_rolling_min_periods() -> None:
+    xs = rx.from_iterable([1, 2, 3, 4])
+    ys = pipe(xs, rx.rolling(2, ("mean",), min_periods=2))
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [
+        OnNext((1.5,)),
+        OnNext((2.5,)),
+        OnNext((3.5,)),
+        OnCompleted,
+    ]
+
+
+def test_rolling_unknown_statistic() -> None:
+    with pytest.raises(ValueError):
+        rx.rolling(3, ("median",))
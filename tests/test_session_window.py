@@ -0,0 +1,84 @@
+import asyncio
+from typing import Tuple
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import Aggregator, AsyncSubject
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+def user(event: Tuple[str, int]) -> str:
+    return event[0]
+
+
+@pytest.mark.asyncio
+async def test_session_window() -> None:
+    xs: AsyncSubject[Tuple[str, int]] = AsyncSubject()
+    ys = pipe(xs, rx.session_window(user, 2.0))
+
+    obv: AsyncTestObserver[Tuple[str, int]] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs.asend(("a", 1))
+    await xs.asend(("b", 1))
+    await asyncio.sleep(1)
+    await xs.asend(("a", 1))  # Keeps session a open
+    await asyncio.sleep(1.5)  # b closes at 2
+    await xs.asend(("a", 1))
+    await asyncio.sleep(3)  # a closes at 4.5
+    await xs.asend(("b", 1))
+    await xs.aclose()
+    await obv
+
+    assert obv.values == [
+        (2, OnNext(("b", 1))),
+        (4.5, OnNext(("a", 3))),
+        (5.5, OnNext(("b", 1))),
+        (5.5, OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_session_window_aggregator() -> None:
+    xs: AsyncSubject[Tuple[str, int]] = AsyncSubject()
+    total = Aggregator(0, lambda ev: ev[1], lambda a, b: a + b, lambda acc: acc)
+    ys = pipe(xs, rx.session_window(user, 1.0, total))
+
+    obv: AsyncTestObserver[Tuple[str, int]] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    for value in range(5):
+        await xs.asend(("a", value))
+        await asyncio.sleep(0.5)
+    await asyncio.sleep(1)
+    await xs.aclose()
+    await obv
+
+    assert obv.values == [(3, OnNext(("a", 10))), (3.5, OnCompleted)]
+
+
+@pytest.mark.asyncio
+async def test_session_window_many_keys_single_timer() -> None:
+    xs: AsyncSubject[Tuple[str, int]] = AsyncSubject()
+    ys = pipe(xs, rx.session_window(user, 1.0))
+
+    obv: AsyncTestObserver[Tuple[str, int]] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    loop = asyncio.get_event_loop()
+    for index in range(1000):
+        await xs.asend((str(index), 1))
+    assert len(loop._scheduled) <= 2
+
+    await asyncio.sleep(2)
+    assert len(obv.values) == 1000
@@ -0,0 +1,127 @@
+import asyncio
+from typing import List
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import AsyncObservable, AsyncSubject
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+def counting(
+    source: AsyncObservable[int], subscriptions: List[int]
+) -> AsyncObservable[int]:
+    def factory() -> AsyncObservable[int]:
+        subscriptions.append(1)
+        return source
+
+    return rx.defer(factory)
+
+
+@pytest.mark.asyncio
+async def test_publish_connect() -> None:
+    subscriptions: List[int] = []
+    xs = pipe(counting(rx.from_iterable([1, 2, 3]), subscriptions), rx.publish())
+
+    evens = pipe(xs, rx.filter(lambda x: x % 2 == 0))
+    odds = pipe(xs, rx.filter(lambda x: x % 2 == 1))
+
+    obv1: AsyncTestObserver[int] = AsyncTestObserver()
+    obv2: AsyncTestObserver[int] = AsyncTestObserver()
+    await evens.subscribe_async(obv1)
+    await odds.subscribe_async(obv2)
+    assert subscriptions == []
+
+    await xs.connect()
+    await obv1
+    await obv2
+
+    assert subscriptions == [1]
+    assert obv1.values == [(0, OnNext(2)), (0, OnCompleted)]
+    assert obv2.values == [(0, OnNext(1)), (0, OnNext(3)), (0, OnCompleted)]
+
+
+@pytest.mark.asyncio
+async def test_publish_disconnect() -> None:
+    xs: AsyncSubject[int] = AsyncSubject()
+    ys = pipe(xs, rx.publish())
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    connection = await ys.connect()
+    assert await ys.connect() is not connection  # Idempotent, new handle
+
+    await xs.asend(1)
+    await connection.dispose_async()
+    await xs.asend(2)
+
+    assert obv.values == [(0, OnNext(1))]
+    assert not xs._observers
+
+
+@pytest.mark.asyncio
+async def test_share_subscribes_once() -> None:
+    subscriptions: List[int] = []
+    xs: AsyncSubject[int] = AsyncSubject()
+    ys = pipe(counting(xs, subscriptions), rx.map(lambda x: x * 10), rx.share())
+
+    obv1: AsyncTestObserver[int] = AsyncTestObserver()
+    obv2: AsyncTestObserver[int] = AsyncTestObserver()
+    sub1 = await ys.subscribe_async(obv1)
+    sub2 = await ys.subscribe_async(obv2)
+
+    await xs.asend(1)
+    await sub1.dispose_async()
+    await xs.asend(2)
+
+    assert subscriptions == [1]
+    assert len(xs._observers) == 1
+
+    await sub2.dispose_async()
+    await sub2.dispose_async()
+    await xs.asend(3)
+
+    assert not xs._observers
+    assert obv1.values == [(0, OnNext(10))]
+    assert obv2.values == [(0, OnNext(10)), (0, OnNext(20))]
+
+
+@pytest.mark.asyncio
+async def test_share_resubscribes_after_completion() -> None:
+    subscriptions: List[int] = []
+    ys = pipe(counting(rx.from_iterable([1, 2]), subscriptions), rx.share())
+
+    obv1: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv1)
+    await obv1
+
+    obv2: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv2)
+    await obv2
+
+    assert subscriptions == [1, 1]
+    assert obv1.values == [(0, OnNext(1)), (0, OnNext(2)), (0, OnCompleted)]
+    assert obv2.values == obv1.values
+
+
+@pytest.mark.asyncio
+async def test_share_async_rx() -> None:
+    xs: AsyncSubject[int] = AsyncSubject()
+    ys = rx.AsyncRx(xs).share()
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(1)
+        await asyncio.sleep(1)
+
+    assert obv.values == [(0, OnNext(1))]
+    assert not xs._observers
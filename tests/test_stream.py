@@ -1,12 +1,13 @@
 import asyncio
 import logging
-from typing import Optional
+from typing import List, Optional
 
 import pytest
 from expression.core import pipe
 from expression.system.disposable import AsyncDisposable
 
 import aioreactive as rx
+from aioreactive import AsyncSubject
 from aioreactive.notification import OnCompleted, OnError, OnNext
 from aioreactive.testing import (
     AsyncTestObserver,
@@ -169,3 +170,96 @@ async def test_stream_cancel_context():
     await xs.asend_later(1, 20)
 
     assert obv.values == []
+
+
+@pytest.mark.asyncio
+async def test_stream_concurrent_fan_out() -> None:
+    xs: AsyncSubject[int] = AsyncSubject(concurrent=True)
+    loop = asyncio.get_event_loop()
+
+    async def asend(value: int) -> None:
+        await asyncio.sleep(1)
+
+    obv1 = AsyncTestObserver(asend)
+    obv2 = AsyncTestObserver(asend)
+    await xs.subscribe_async(obv1)
+    await xs.subscribe_async(obv2)
+
+    await xs.asend(10)
+    await xs.asend(20)
+
+    # Each observer takes 2 seconds per value (see AsyncTestObserver)
+    assert loop.time() == 4
+    assert obv1.values == [(0, OnNext(10)), (2, OnNext(20))]
+    assert obv2.values == [(0, OnNext(10)), (2, OnNext(20))]
+
+
+@pytest.mark.asyncio
+async def test_stream_timeout_unsubscribes_slow_observer() -> None:
+    xs: AsyncSubject[int] = AsyncSubject(timeout=0.5)
+
+    async def asend(value: int) -> None:
+        if value == 20:
+            await asyncio.sleep(1)
+
+    fast = AsyncTestObserver()
+    slow = AsyncTestObserver(asend)
+    await xs.subscribe_async(slow)
+    await xs.subscribe_async(fast)
+
+    await xs.asend(10)
+    await xs.asend(20)
+    await xs.asend(30)
+    await xs.aclose()
+
+    assert fast.values == [
+        (0, OnNext(10)),
+        (0.5, OnNext(20)),
+        (0.5, OnNext(30)),
+        (0.5, OnCompleted),
+    ]
+    assert slow.values[:2] == [(0, OnNext(10)), (0, OnNext(20))]
+    with pytest.raises(asyncio.TimeoutError):
+        await slow
+
+
+@pytest.mark.asyncio
+async def test_stream_dispose_during_send() -> None:
+    xs: AsyncSubject[int] = AsyncSubject()
+    subscription: Optional[AsyncDisposable] = None
+
+    async def asend(value: int) -> None:
+        assert subscription
+        await subscription.dispose_async()
+
+    obv1 = AsyncTestObserver(asend)
+    obv2 = AsyncTestObserver()
+    subscription = await xs.subscribe_async(obv1)
+    await xs.subscribe_async(obv2)
+
+    await xs.asend(10)
+    await xs.asend(20)
+
+    assert obv1.values == [(0, OnNext(10))]
+    assert obv2.values == [(0, OnNext(10)), (0, OnNext(20))]
+
+
+@pytest.mark.asyncio
+async def test_stream_subscribe_during_send() -> None:
+    xs: AsyncSubject[int] = AsyncSubject()
+    obv2 = AsyncTestObserver()
+
+    subscriptions: List[AsyncDisposable] = []
+
+    async def asend(value: int) -> None:
+        if not subscriptions:
+            subscriptions.append(await xs.subscribe_async(obv2))
+
+    obv1 = AsyncTestObserver(asend)
+    await xs.subscribe_async(obv1)
+
+    await xs.asend(10)
+    await xs.asend(20)
+
+    assert obv1.values == [(0, OnNext(10)), (0, OnNext(20))]
+    assert obv2.values == [(0, OnNext(20))]
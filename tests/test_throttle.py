@@ -0,0 +1,134 @@
+import asyncio
+import logging
+
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive.notification import OnCompleted, OnError, OnNext
+from aioreactive.testing import (
+    AsyncTestObserver,
+    AsyncTestSubject,
+    VirtualTimeEventLoop,
+    ca,
+)
+
+log = logging.getLogger(__name__)
+logging.basicConfig(level=logging.DEBUG)
+
+
+class MyException(Exception):
+    pass
+
+
+@pytest.fixture()  # type:ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_sample_skips_empty_periods():
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+
+    ys = pipe(xs, rx.sample(1.0))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(1)  # 0
+        await xs.asend_later(0.5, 2)  # 0.5
+        await xs.asend_later(2.0, 3)  # 2.5
+        await xs.aclose_later(0.7)  # 3.2
+        await obv
+
+    assert obv.values == [
+        (ca(1), OnNext(2)),
+        (ca(3), OnNext(3)),
+        (ca(3.2), OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_throttle_first():
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+
+    ys = pipe(xs, rx.throttle_first(1.0))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(1)  # 0
+        await xs.asend_later(0.4, 2)  # 0.4
+        await xs.asend_later(0.8, 3)  # 1.2
+        await xs.asend_later(0.3, 4)  # 1.5
+        await xs.aclose_later(0.5)  # 2.0
+        await obv
+
+    assert obv.values == [
+        (0, OnNext(1)),
+        (ca(1.2), OnNext(3)),
+        (ca(2.0), OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_throttle_latest():
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+
+    ys = rx.AsyncRx.create(xs).throttle_latest(1.0)
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(1)  # 0
+        await xs.asend_later(0.3, 2)  # 0.3
+        await xs.asend_later(0.3, 3)  # 0.6
+        await xs.asend_later(1.9, 4)  # 2.5
+        await xs.asend_later(0.3, 5)  # 2.8
+        await xs.aclose_later(0.2)  # 3.0
+        await obv
+
+    assert obv.values == [
+        (0, OnNext(1)),
+        (ca(1.0), OnNext(3)),
+        (ca(2.5), OnNext(4)),
+        (ca(3.0), OnNext(5)),
+        (ca(3.0), OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_audit():
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+
+    ys = pipe(xs, rx.audit(1.0))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(1)  # 0
+        await xs.asend_later(0.3, 2)  # 0.3
+        await xs.asend_later(1.2, 3)  # 1.5
+        await xs.asend_later(1.5, 4)  # 3.0
+        await xs.aclose_later(0.2)  # 3.2
+        await obv
+
+    assert obv.values == [
+        (ca(1.0), OnNext(2)),
+        (ca(2.5), OnNext(3)),
+        (ca(3.2), OnNext(4)),
+        (ca(3.2), OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_audit_error_drops_pending():
+    error = MyException("ex")
+    xs: AsyncTestSubject[int] = AsyncTestSubject()
+
+    ys = pipe(xs, rx.audit(1.0))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    async with await ys.subscribe_async(obv):
+        await xs.asend(1)
+        await xs.athrow_later(0.5, error)
+
+        with pytest.raises(MyException):
+            await obv
+
+        await asyncio.sleep(1.0)
+
+    assert obv.values == [(ca(0.5), OnError(error))]
@@ -0,0 +1,77 @@
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import CountMinSketch
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import (
+    AsyncTestObserver,
+    AsyncTestSubject,
+    VirtualTimeEventLoop,
+)
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+def test_count_min_sketch_never_undercounts() -> None:
+    sketch = CountMinSketch(width=64, depth=4)
+    for i in range(1000):
+        sketch.add(i % 100)
+
+    assert sketch.total == 1000
+    assert all(sketch.estimate(key) >= 10 for key in range(100))
+    assert sketch.estimate("missing") <= 1000
+
+
+def test_count_min_sketch_merge() -> None:
+    a, b = CountMinSketch(), CountMinSketch()
+    a.add("x", 3)
+    b.add("x", 4)
+    a.merge(b)
+
+    assert a.estimate("x") == 7
+    with pytest.raises(ValueError):
+        a.merge(CountMinSketch(width=16))
+
+
+@pytest.mark.asyncio
+async def test_top_k_heavy_hitters() -> None:
+    keys = ["a"] * 50 + ["b"] * 30 + ["c"] * 20 + [f"k{i}" for i in range(500)]
+    xs = rx.from_iterable(keys)
+    ys = pipe(xs, rx.top_k(3))
+
+    obv: AsyncTestObserver[list] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [
+        OnNext([("a", 50), ("b", 30), ("c", 20)]),
+        OnCompleted,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_top_k_window() -> None:
+    xs: AsyncTestSubject[str] = AsyncTestSubject()
+    ys = pipe(xs, rx.top_k(1, str.lower, window=10))
+
+    obv: AsyncTestObserver[list] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs.asend_later(1, "A")
+    await xs.asend_later(1, "a")
+    await xs.asend_later(1, "B")
+    await xs.asend_later(10, "B")
+    await xs.aclose_later(1)
+    await obv
+
+    assert obv.values == [
+        (10, OnNext([("a", 2)])),
+        (14, OnNext([("b", 1)])),
+        (14, OnCompleted),
+    ]
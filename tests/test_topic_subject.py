@@ -0,0 +1,105 @@
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import AsyncTopicSubject
+from aioreactive.notification import OnCompleted, OnError, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+class MyException(Exception):
+    pass
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_topic_subject_routes_exact_topics():
+    xs: AsyncTopicSubject[int] = AsyncTopicSubject()
+
+    obv_a: AsyncTestObserver[int] = AsyncTestObserver()
+    obv_b: AsyncTestObserver[int] = AsyncTestObserver()
+    await xs.subscribe_async(obv_a, topic="a")
+    await xs.subscribe_async(obv_b, topic="b")
+
+    await xs.asend("a", 1)
+    await xs.asend("b", 2)
+    await xs.asend("c", 3)
+    await xs.asend("ab", 4)
+    await xs.aclose()
+
+    assert obv_a.values == [(0, OnNext(1)), (0, OnCompleted)]
+    assert obv_b.values == [(0, OnNext(2)), (0, OnCompleted)]
+
+
+@pytest.mark.asyncio
+async def test_topic_subject_prefix_topics():
+    xs: AsyncTopicSubject[int] = AsyncTopicSubject()
+
+    everything: AsyncTestObserver[int] = AsyncTestObserver()
+    sensors: AsyncTestObserver[int] = AsyncTestObserver()
+    temp: AsyncTestObserver[int] = AsyncTestObserver()
+    await xs.subscribe_async(everything)
+    await xs.subscribe_async(sensors, topic="sensors/*")
+    await xs.subscribe_async(temp, topic="sensors/temp")
+
+    await xs.asend("sensors/temp", 1)
+    await xs.asend("sensors/wind", 2)
+    await xs.asend("sensors", 3)
+    await xs.asend("sensors/", 4)
+    error = MyException("ex")
+    await xs.athrow(error)
+
+    assert everything.values == [
+        (0, OnNext(1)),
+        (0, OnNext(2)),
+        (0, OnNext(3)),
+        (0, OnNext(4)),
+        (0, OnError(error)),
+    ]
+    assert sensors.values == [
+        (0, OnNext(1)),
+        (0, OnNext(2)),
+        (0, OnNext(4)),
+        (0, OnError(error)),
+    ]
+    assert temp.values == [(0, OnNext(1)), (0, OnError(error))]
+
+
+@pytest.mark.asyncio
+async def test_topic_subject_dispose():
+    xs: AsyncTopicSubject[int] = AsyncTopicSubject()
+
+    obv1: AsyncTestObserver[int] = AsyncTestObserver()
+    obv2: AsyncTestObserver[int] = AsyncTestObserver()
+    subscription1 = await xs.subscribe_async(obv1, topic="a/*")
+    subscription2 = await xs.subscribe_async(obv2, topic="a/b")
+
+    await xs.asend("a/b", 1)
+    await subscription1.dispose_async()
+    await subscription2.dispose_async()
+    await xs.asend("a/b", 2)
+
+    assert obv1.values == [(0, OnNext(1))]
+    assert obv2.values == [(0, OnNext(1))]
+    assert not xs._exact  # type: ignore
+    assert not xs._prefixes.children  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_topic_subject_topic_observable():
+    xs: AsyncTopicSubject[int] = AsyncTopicSubject()
+
+    ys = pipe(xs.topic("a"), rx.map(lambda x: x * 10))
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+
+    await xs.asend("a", 1)
+    await xs.asend("b", 2)
+
+    assert obv.values == [(0, OnNext(10))]
@@ -0,0 +1,97 @@
+import pytest
+from expression.core import pipe
+
+import aioreactive as rx
+from aioreactive import Aggregator
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_window_aggregate_tumbling_count() -> None:
+    xs = rx.from_iterable(range(1, 8))
+    ys = pipe(xs, rx.window_aggregate(3, None, Aggregator.sum()))
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(6), OnNext(15), OnNext(7), OnCompleted]
+
+
+@pytest.mark.asyncio
+async def test_window_aggregate_sliding_count() -> None:
+    xs = rx.from_iterable([3, 1, 4, 1, 5, 9, 2, 6])
+    ys = pipe(xs, rx.window_aggregate(3, 1, Aggregator.max()))
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [
+        OnNext(x) for x in [4, 4, 5, 9, 9, 9, 6, 6]
+    ] + [OnCompleted]
+
+
+@pytest.mark.asyncio
+async def test_window_aggregate_custom_monoid() -> None:
+    # String concatenation is associative but not commutative
+    concat = Aggregator("", str, lambda a, b: a + b, lambda acc: acc)
+    xs = rx.from_iterable("abcdef")
+    ys = pipe(xs, rx.window_aggregate(4, 2, concat))
+
+    obv: AsyncTestObserver[str] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [
+        OnNext("abcd"),
+        OnNext("cdef"),
+        OnNext("ef"),
+        OnCompleted,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_window_aggregate_sliding_time() -> None:
+    # (timestamp, value)
+    events = [(0.5, 1), (1.5, 2), (2.5, 3), (7.0, 4)]
+    xs = rx.from_iterable(events)
+    mean = Aggregator.mean()
+    by_value = Aggregator(
+        mean.identity, lambda ev: (ev[1], 1), mean.combine, mean.lower
+    )
+    ys = pipe(xs, rx.window_aggregate(2.0, 1.0, by_value, lambda ev: ev[0]))
+
+    obv: AsyncTestObserver[float] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [
+        OnNext(1.0),  # [-1, 1)
+        OnNext(1.5),  # [0, 2)
+        OnNext(2.5),  # [1, 3)
+        OnNext(3.0),  # [2, 4)
+        OnNext(4.0),  # [6, 8)
+        OnNext(4.0),  # [7, 9)
+        OnCompleted,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_window_aggregate_count_aggregator() -> None:
+    xs = rx.from_iterable([1.0, 2.0, 2.5, 10.0])
+    ys = pipe(xs, rx.window_aggregate(5.0, None, Aggregator.count(), lambda x: x))
+
+    obv: AsyncTestObserver[int] = AsyncTestObserver()
+    await ys.subscribe_async(obv)
+    await obv
+
+    assert [n for _, n in obv.values] == [OnNext(3), OnNext(1), OnCompleted]
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+import aioreactive as rx
+from aioreactive import AsyncSubject
+from aioreactive.backpressure import BufferOverflowError
+from aioreactive.notification import OnCompleted, OnNext
+from aioreactive.testing import AsyncTestObserver, VirtualTimeEventLoop
+
+
+@pytest.fixture()  # type: ignore
+def event_loop():
+    loop = VirtualTimeEventLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_zip() -> None:
+    xs = rx.from_iterable([1, 2, 3])
+    ys = rx.from_iterable("abcd")
+    zs = rx.from_iterable([True, False, True])
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await rx.zip(xs, ys, zs).subscribe_async(obv)
+    await obv
+
+    assert obv.values == [
+        (0, OnNext((1, "a", True))),
+        (0, OnNext((2, "b", False))),
+        (0, OnNext((3, "c", True))),
+        (0, OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_zip_overflow_error() -> None:
+    xs: AsyncSubject[int] = AsyncSubject()
+    ys: AsyncSubject[int] = AsyncSubject()
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await rx.zip(xs, ys, capacity=2).subscribe_async(obv)
+
+    await xs.asend(1)
+    await ys.asend(10)
+    await xs.asend(2)
+    await xs.asend(3)
+    await xs.asend(4)
+
+    with pytest.raises(BufferOverflowError):
+        await obv
+
+    assert obv.values[0] == (0, OnNext((1, 10)))
+
+
+@pytest.mark.asyncio
+async def test_zip_overflow_drop_oldest() -> None:
+    xs: AsyncSubject[int] = AsyncSubject()
+    ys: AsyncSubject[int] = AsyncSubject()
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await rx.zip(xs, ys, capacity=2, on_overflow="drop_oldest").subscribe_async(obv)
+
+    for x in range(1, 5):
+        await xs.asend(x)
+    await ys.asend(10)
+    await ys.asend(20)
+    await ys.aclose()
+    await obv
+
+    assert obv.values == [
+        (0, OnNext((3, 10))),
+        (0, OnNext((4, 20))),
+        (0, OnCompleted),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_zip_overflow_wait() -> None:
+    xs: AsyncSubject[int] = AsyncSubject()
+    ys: AsyncSubject[int] = AsyncSubject()
+
+    obv: AsyncTestObserver[tuple] = AsyncTestObserver()
+    await rx.zip(xs, ys, capacity=1, on_overflow="wait").subscribe_async(obv)
+
+    async def producer() -> None:
+        for x in range(1, 4):
+            await xs.asend(x)
+
+    task = asyncio.ensure_future(producer())
+    await asyncio.sleep(1)
+    assert not task.done()
+
+    for y in range(10, 40, 10):
+        await asyncio.sleep(1)
+        await ys.asend(y)
+    await task
+    await xs.aclose()
+    await obv
+
+    assert obv.values == [
+        (2, OnNext((1, 10))),
+        (3, OnNext((2, 20))),
+        (4, OnNext((3, 30))),
+        (4, OnCompleted),
+    ]